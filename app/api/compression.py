@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import zlib
+from typing import Optional
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional dependency: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Compress large bodies off the event loop.
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+# Streams that must reach the client as they are written.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Return the codings an ``Accept-Encoding`` header allows (q > 0)."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, body: bytes, final: bool) -> bytes:
+        data = self._compressor.compress(body)
+        return data + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def encode(self, body: bytes, final: bool) -> bytes:
+        data = self._compressor.process(body)
+        return data + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class CompressionMiddleware:
+    """
+    Compress responses above ``minimum_size`` with the best coding the client
+    accepts: brotli (when the ``brotli`` package is installed), then gzip.
+
+    Plain ASGI middleware on public Starlette APIs only. Responses that
+    already carry a ``Content-Encoding`` and event streams pass through;
+    streamed bodies are flushed chunk by chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("Accept-Encoding", ""))
+        if brotli is not None and "br" in accepted:
+            encoder = BrotliEncoder(self.brotli_quality)
+        elif "gzip" in accepted:
+            encoder = GzipEncoder(self.compresslevel)
+        else:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self.app, encoder, self.minimum_size)(scope, receive, send)
+
+
+class _Responder:
+    """Holds back ``http.response.start`` until the first body tells whether to compress."""
+
+    def __init__(self, app: ASGIApp, encoder, minimum_size: int) -> None:
+        self.app = app
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.send: Send
+        self.start: Optional[Message] = None
+        self.compressing: Optional[bool] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_message)
+
+    async def send_message(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressing is None:
+            headers = Headers(raw=self.start["headers"])
+            self.compressing = (
+                "content-encoding" not in headers
+                and not headers.get("content-type", "").startswith(UNCOMPRESSED_TYPES)
+                and (more_body or len(body) >= self.minimum_size)
+            )
+            if not self.compressing:
+                await self.send(self.start)
+                await self.send(message)
+                return
+            body = await self._encode(body, final=not more_body)
+            headers = MutableHeaders(raw=list(self.start["headers"]))
+            headers["Content-Encoding"] = self.encoder.name
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send({**self.start, "headers": headers.raw})
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        if self.compressing:
+            body = await self._encode(body, final=not more_body)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def _encode(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self.encoder.encode, body, final)
+        return self.encoder.encode(body, final)
@@ -1,11 +1,50 @@
+from __future__ import annotations
+
+from dataclasses import replace
 from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator
 
 from app.core.config import get_settings
+from app.core.database import get_database
+from app.models.tenant import TenantConfig
 from app.services.billing_reminder import BillingReminderService
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.delivery_events import DeliveryEventWriter
 from app.services.email_client import EmailClient
+from app.services.number_cache import WhatsAppNumberCache
+from app.services.rate_limit import SendRateLimiter
+from app.services.runtime_config import ReminderConfig, RuntimeConfig
+from app.services.send_window import SendWindow
 from app.services.service_manager import ServiceManager
+from app.services.sheet_uploads import SheetUploadStore
+from app.services.single_flight import SingleFlight
+from app.services.tenants import TenantRegistry, default_sheet_path, load_tenants
 from app.services.waha_client import WahaClient
 
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+    from app.services.receivables_aggregates import AggregatesCache, AggregatesRefresher
+    from app.services.receivables_archive import ArchiveScheduler
+
+
+def get_db_session() -> Iterator[Session]:
+    """Yield a session from the worker pool, closed after the request."""
+    session = get_database().session()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_read_db_session() -> Iterator[Session]:
+    """Yield a session for heavy reads (read replica when configured)."""
+    session = get_database().read_session()
+    try:
+        yield session
+    finally:
+        session.close()
+
 
 @lru_cache
 def get_service_manager() -> ServiceManager:
@@ -13,6 +52,24 @@ def get_service_manager() -> ServiceManager:
     return ServiceManager()
 
 
+def _send_window() -> SendWindow | None:
+    settings = get_settings()
+    if settings.reminder_send_window_start is None or settings.reminder_send_window_end is None:
+        return None
+    return SendWindow(settings.reminder_send_window_start, settings.reminder_send_window_end)
+
+
+def _circuit_breaker(name: str) -> CircuitBreaker:
+    settings = get_settings()
+    return CircuitBreaker(
+        name,
+        failure_rate=settings.circuit_failure_rate,
+        window=settings.circuit_window,
+        min_calls=settings.circuit_min_calls,
+        open_seconds=settings.circuit_open_seconds,
+    )
+
+
 @lru_cache
 def get_waha_client() -> WahaClient:
     """Create a singleton WAHA HTTP client."""
@@ -21,7 +78,9 @@ def get_waha_client() -> WahaClient:
         base_url=settings.waha_base_url,
         api_token=settings.waha_api_token,
         default_sender=settings.waha_default_sender,
+        session=settings.waha_session,
         timeout_seconds=settings.waha_timeout_seconds,
+        breaker=_circuit_breaker("WAHA"),
     )
 
 
@@ -43,9 +102,130 @@ def get_email_client() -> EmailClient | None:
         api_base_url=settings.email_api_base_url,
         default_from_email=settings.email_from,
         default_from_name=settings.email_from_name,
+        breaker=_circuit_breaker("Email"),
+    )
+
+
+@lru_cache
+def get_number_cache() -> WhatsAppNumberCache | None:
+    """Create the shared cache of WhatsApp number checks, if enabled."""
+    settings = get_settings()
+    if not settings.waha_number_check_enabled:
+        return None
+    return WhatsAppNumberCache(
+        path=settings.waha_number_cache_path,
+        ttl_seconds=settings.waha_number_cache_ttl_hours * 3600,
+    )
+
+
+@lru_cache
+def get_aggregates_cache() -> AggregatesCache:
+    """Create the worker-wide cache of receivables aggregates."""
+    from app.services.receivables_aggregates import AggregatesCache  # imports SQLAlchemy
+
+    settings = get_settings()
+    return AggregatesCache(
+        version_check_seconds=settings.aggregates_version_check_seconds
+    )
+
+
+@lru_cache
+def get_aggregates_refresher() -> AggregatesRefresher | None:
+    """Background refresh of the summaries after runs; ``None`` when disabled."""
+    settings = get_settings()
+    if not settings.aggregates_auto_refresh:
+        return None
+    from app.services.receivables_aggregates import AggregatesRefresher
+
+    return AggregatesRefresher(
+        session_factory=lambda: get_database().session(),
+        cache=get_aggregates_cache(),
+        delay_seconds=settings.aggregates_refresh_delay_seconds,
+    )
+
+
+@lru_cache
+def get_archive_scheduler() -> ArchiveScheduler | None:
+    """Periodic retention job of this worker; ``None`` when not scheduled."""
+    settings = get_settings()
+    if not settings.archive_interval_hours:
+        return None
+    from app.services.receivables_archive import ArchiveScheduler  # imports SQLAlchemy
+
+    return ArchiveScheduler(
+        session_factory=lambda: get_database().session(),
+        interval_seconds=settings.archive_interval_hours * 3600,
+        settled_after_days=settings.archive_settled_after_days,
+        history_after_days=settings.archive_history_after_days,
+        batch_size=settings.archive_batch_size,
+        max_batches=settings.archive_max_batches,
+    )
+
+
+@lru_cache
+def get_delivery_event_writer() -> DeliveryEventWriter:
+    """Create the worker-wide buffer of WAHA delivery events."""
+    settings = get_settings()
+    return DeliveryEventWriter(
+        session_factory=lambda: get_database().session(),
+        batch_size=settings.delivery_events_batch_size,
+        flush_interval_seconds=settings.delivery_events_flush_seconds,
+        max_pending=settings.delivery_events_max_pending,
+    )
+
+
+@lru_cache
+def get_runtime_config() -> RuntimeConfig | None:
+    """Create the cached view of configuracao_sistema, if enabled."""
+    settings = get_settings()
+    if not settings.runtime_config_enabled:
+        return None
+    return RuntimeConfig(
+        session_factory=lambda: get_database().session(),
+        defaults=ReminderConfig(
+            reminder_days=tuple(sorted(set(settings.reminder_days_before_due))),
+            email_enabled=settings.email_enabled,
+        ),
+        ttl_seconds=settings.runtime_config_ttl_seconds,
     )
 
 
+def warm_up_dependencies() -> None:
+    """Build the singleton clients, caches and services before the first request."""
+    get_service_manager()
+    get_waha_client().warm_up()
+    get_email_client()
+    number_cache = get_number_cache()
+    if number_cache is not None:
+        number_cache.warm_up()
+    get_aggregates_cache()
+    runtime_config = get_runtime_config()
+    if runtime_config is not None:
+        runtime_config.current()
+    get_billing_reminder_service()
+    get_tenant_registry()
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight | None:
+    """Coalesces identical reminder runs across workers; ``None`` when disabled."""
+    settings = get_settings()
+    if not settings.reminder_flight_dir:
+        return None
+    return SingleFlight(
+        settings.reminder_flight_dir,
+        wait_seconds=settings.reminder_flight_wait_seconds,
+        replay_seconds=settings.reminder_idempotency_ttl_seconds,
+    )
+
+
+@lru_cache
+def get_sheet_upload_store() -> SheetUploadStore:
+    """Where uploaded sheets and XML exports are kept, named by content hash."""
+    settings = get_settings()
+    return SheetUploadStore(settings.billing_upload_dir, settings.billing_upload_max_bytes)
+
+
 @lru_cache
 def get_billing_reminder_service() -> BillingReminderService:
     """Create a singleton reminder service configured with defaults."""
@@ -57,4 +237,84 @@ def get_billing_reminder_service() -> BillingReminderService:
         waha_client=get_waha_client(),
         email_client=email_client,
         email_enabled=settings.email_enabled,
+        fast_xlsx_reader=settings.billing_fast_xlsx_reader,
+        ingest_workers=settings.billing_ingest_workers,
+        number_cache=get_number_cache(),
+        number_check_workers=settings.waha_number_check_workers,
+        coalesce=settings.reminder_coalesce_by_client,
+        snapshot_cache=settings.billing_snapshot_cache,
+        runtime_config=get_runtime_config(),
+        checkpoint_dir=settings.reminder_checkpoint_dir,
+        checkpoint_sync_every=settings.reminder_checkpoint_sync_every,
+        send_window=_send_window(),
+        critical_days=settings.reminder_critical_days,
+        whatsapp_workers=settings.reminder_whatsapp_workers,
+        email_workers=settings.reminder_email_workers,
+        stage_queue_depth=settings.reminder_stage_queue_depth,
+        delivery_events=get_delivery_event_writer(),
+    )
+
+
+def _build_tenant_service(tenant: TenantConfig) -> BillingReminderService:
+    """Reminder service with the tenant's data source, WAHA session and sender."""
+    settings = get_settings()
+    waha_client = WahaClient(
+        base_url=tenant.waha_base_url or settings.waha_base_url,
+        api_token=tenant.waha_api_token or settings.waha_api_token,
+        default_sender=tenant.waha_sender or settings.waha_default_sender,
+        session=tenant.waha_session or settings.waha_session,
+        timeout_seconds=settings.waha_timeout_seconds,
+        breaker=_circuit_breaker(f"WAHA:{tenant.tenant_id}"),
+    )
+    email_enabled = (
+        settings.email_enabled if tenant.email_enabled is None else tenant.email_enabled
+    )
+    email_client = get_email_client() if email_enabled else None
+    if email_client is not None:
+        email_client = replace(
+            email_client,
+            default_from_email=tenant.email_from or email_client.default_from_email,
+            default_from_name=tenant.email_from_name or email_client.default_from_name,
+            # Own circuit: one tenant's bad sender must not defer everyone's email.
+            breaker=_circuit_breaker(f"Email:{tenant.tenant_id}"),
+        )
+    checkpoint_dir = settings.reminder_checkpoint_dir
+    return BillingReminderService(
+        default_sheet_path=tenant.sheet_path
+        or default_sheet_path(tenant.tenant_id, settings.billing_sheet_path),
+        reminder_days=tenant.reminder_days or settings.reminder_days_before_due,
+        waha_client=waha_client,
+        email_client=email_client,
+        email_enabled=email_enabled,
+        fast_xlsx_reader=settings.billing_fast_xlsx_reader,
+        ingest_workers=settings.billing_ingest_workers,
+        number_cache=get_number_cache(),
+        number_check_workers=settings.waha_number_check_workers,
+        coalesce=settings.reminder_coalesce_by_client,
+        snapshot_cache=settings.billing_snapshot_cache,
+        # Days set for the tenant win over the shared configuracao_sistema.
+        runtime_config=None if tenant.reminder_days else get_runtime_config(),
+        checkpoint_dir=f"{checkpoint_dir}/{tenant.tenant_id}" if checkpoint_dir else None,
+        checkpoint_sync_every=settings.reminder_checkpoint_sync_every,
+        send_rate_limiter=(
+            SendRateLimiter(tenant.sends_per_minute) if tenant.sends_per_minute else None
+        ),
+        send_window=_send_window(),
+        critical_days=settings.reminder_critical_days,
+        whatsapp_workers=settings.reminder_whatsapp_workers,
+        email_workers=settings.reminder_email_workers,
+        stage_queue_depth=settings.reminder_stage_queue_depth,
+        delivery_events=get_delivery_event_writer(),
+    )
+
+
+@lru_cache
+def get_tenant_registry() -> TenantRegistry:
+    """Create the registry of companies configured in API_TENANTS_FILE."""
+    settings = get_settings()
+    tenants = load_tenants(settings.tenants_file) if settings.tenants_file else []
+    return TenantRegistry(
+        tenants,
+        factory=_build_tenant_service,
+        timeout_seconds=settings.tenant_run_timeout_seconds,
     )
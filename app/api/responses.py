@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    Serialize already-validated Pydantic models straight to JSON bytes.
+
+    Returning a model from a route makes FastAPI dump it to a dict, validate
+    that dict against ``response_model`` again and encode it with the stdlib
+    encoder. Routes that build trusted models themselves can return this
+    response instead; ``response_model`` still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
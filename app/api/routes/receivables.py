@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.dependencies import (
+    get_aggregates_cache,
+    get_db_session,
+    get_read_db_session,
+)
+from app.api.responses import ModelJSONResponse
+from app.core.config import get_settings
+from app.core.database import get_database
+from app.models.aggregates import (
+    AggregateDimension,
+    AggregatesRefreshResult,
+    ReceivablesAggregates,
+)
+from app.models.receivable import ArchiveRunResult, ReceivablePage
+
+if TYPE_CHECKING:
+    from sqlalchemy.exc import SQLAlchemyError
+    from sqlalchemy.orm import Session
+
+    from app.services.receivables_aggregates import AggregatesCache
+    from app.services.receivables_repository import ReceivableFilters
+
+# The handlers import SQLAlchemy and the repositories on first use, so
+# loading the app does not pay for them.
+
+router = APIRouter()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Tipo nao serializavel: {type(value)!r}")
+
+
+def _stream_page(
+    filters: ReceivableFilters, cursor: Optional[str], limit: int
+) -> Iterator[bytes]:
+    from app.services.receivables_repository import ReceivablesRepository
+
+    # The session lives inside the generator so it stays open while streaming.
+    session = get_database().read_session()
+    try:
+        rows = ReceivablesRepository(session).iter_page(filters, cursor, limit)
+        yield b'{"items":['
+        last = None
+        for count, row in enumerate(rows):
+            if count == limit:
+                break
+            prefix = b"," if count else b""
+            yield prefix + json.dumps(row, default=_json_default).encode()
+            last = row
+        else:
+            last = None  # no extra row: this was the final page
+        next_cursor = (
+            ReceivablesRepository.encode_cursor(last["datavencimento"], last["id"])
+            if last is not None
+            else None
+        )
+        yield b'],"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
+    finally:
+        session.close()
+
+
+@router.get(
+    "",
+    response_model=ReceivablePage,
+    summary="Lista titulos com paginacao por cursor (datavencimento, id).",
+)
+# Same handler with the slash: a 307 would not be followed for streamed bodies.
+@router.get("/", response_model=ReceivablePage, include_in_schema=False)
+def list_receivables(
+    due_from: Optional[date] = Query(None, description="Vencimento inicial (inclusivo)."),
+    due_to: Optional[date] = Query(None, description="Vencimento final (inclusivo)."),
+    statusdoc: Optional[str] = Query(None, description="Ex.: 0-ABERTO."),
+    codcliente: Optional[int] = Query(None),
+    cpf: Optional[str] = Query(None, description="CPF/CNPJ formatado como no ERP."),
+    uf: Optional[str] = Query(
+        None,
+        min_length=2,
+        max_length=2,
+        description="Exige codcliente, cpf ou due_from + due_to.",
+    ),
+    cursor: Optional[str] = Query(None, description="`next_cursor` da pagina anterior."),
+    limit: int = Query(500, ge=1, le=5000),
+) -> StreamingResponse:
+    """Stream one page of receivables ordered by due date."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.services.receivables_repository import (
+        ReceivableFilters,
+        ReceivablesQueryError,
+        ReceivablesRepository,
+    )
+
+    filters = ReceivableFilters(
+        due_from=due_from,
+        due_to=due_to,
+        statusdoc=statusdoc,
+        codcliente=codcliente,
+        cpf=cpf,
+        uf=uf.upper() if uf else None,
+    )
+    try:
+        ReceivablesRepository.validate_filters(filters)
+        if cursor:
+            ReceivablesRepository.decode_cursor(cursor)
+    except ReceivablesQueryError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+    stream = _stream_page(filters, cursor, limit)
+    try:
+        first_chunk = next(stream)
+    except SQLAlchemyError as exc:
+        raise _database_unavailable(exc) from exc
+
+    def body() -> Iterator[bytes]:
+        yield first_chunk
+        yield from stream
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _database_unavailable(exc: SQLAlchemyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Banco de dados indisponivel: {exc.__class__.__name__}",
+    )
+
+
+@router.get(
+    "/aggregates",
+    response_model=ReceivablesAggregates,
+    summary="Totais por dimensao e conversao dos lembretes (tabelas de resumo).",
+)
+def get_receivables_aggregates(
+    group_by: AggregateDimension = Query(AggregateDimension.DUE_DATE),
+    due_from: Optional[date] = Query(None, description="Vencimento inicial (inclusivo)."),
+    due_to: Optional[date] = Query(None, description="Vencimento final (inclusivo)."),
+    session: Session = Depends(get_read_db_session),
+    cache: AggregatesCache = Depends(get_aggregates_cache),
+) -> ModelJSONResponse:
+    """Serve dashboard totals from the summary tables, cached per import version."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.services.receivables_aggregates import load_aggregates
+
+    if due_from and due_to and due_from > due_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="due_from deve ser anterior ou igual a due_to.",
+        )
+    try:
+        aggregates = cache.get(
+            session,
+            (group_by, due_from, due_to),
+            lambda version: load_aggregates(session, version, group_by, due_from, due_to),
+        )
+    except SQLAlchemyError as exc:
+        raise _database_unavailable(exc) from exc
+    return ModelJSONResponse(aggregates)
+
+
+@router.post(
+    "/aggregates/refresh",
+    response_model=AggregatesRefreshResult,
+    summary="Atualiza as tabelas de resumo apos uma importacao.",
+)
+def refresh_receivables_aggregates(
+    full: bool = Query(False, description="Recalcula tudo em vez de so os dias alterados."),
+    session: Session = Depends(get_db_session),
+    cache: AggregatesCache = Depends(get_aggregates_cache),
+) -> AggregatesRefreshResult:
+    """Recompute the summaries touched since the last refresh."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.services.receivables_aggregates import ReceivablesAggregator
+
+    try:
+        result = ReceivablesAggregator(session).refresh(full=full)
+    except SQLAlchemyError as exc:
+        raise _database_unavailable(exc) from exc
+    cache.invalidate()
+    return result
+
+
+@router.post(
+    "/archive",
+    response_model=ArchiveRunResult,
+    summary="Job de retencao: move titulos baixados e historico antigos para o arquivo.",
+)
+def archive_receivables(
+    dry_run: bool = Query(False, description="Apenas conta o que seria arquivado."),
+    session: Session = Depends(get_db_session),
+) -> ArchiveRunResult:
+    """Move old settled titles and send history out of the main tables in batches."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.services.receivables_archive import ReceivablesArchiver
+
+    settings = get_settings()
+    archiver = ReceivablesArchiver(
+        session,
+        batch_size=settings.archive_batch_size,
+        max_batches=settings.archive_max_batches,
+    )
+    try:
+        return archiver.run_retention(
+            settings.archive_settled_after_days,
+            settings.archive_history_after_days,
+            dry_run=dry_run,
+        )
+    except SQLAlchemyError as exc:
+        raise _database_unavailable(exc) from exc
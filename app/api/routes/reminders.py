@@ -1,16 +1,122 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from datetime import date
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
-from app.api.dependencies import get_billing_reminder_service
-from app.models.reminder import BillingReminderRequest, BillingReminderResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic_core import to_json
+
+from app.api.dependencies import (
+    get_aggregates_refresher,
+    get_billing_reminder_service,
+    get_sheet_upload_store,
+    get_single_flight,
+    get_tenant_registry,
+)
+from app.api.responses import ModelJSONResponse
+from app.core.config import get_settings
+from app.models.reminder import (
+    BillingReminderRequest,
+    BillingReminderResponse,
+    ReminderSchedule,
+    SheetUpload,
+)
+from app.models.tenant import TenantInfo, TenantRunRequest, TenantRunResponse
 from app.services.billing_reminder import (
     BillingReminderError,
     BillingReminderService,
 )
+from app.services.sheet_uploads import SheetUploadStore, UploadError, UploadTooLargeError
+from app.services.single_flight import (
+    FlightError,
+    FlightResult,
+    IdempotencyKeyReusedError,
+    SingleFlight,
+    flight_key,
+)
+from app.services.tenants import TenantBusyError, TenantNotFoundError, TenantRegistry
+
+if TYPE_CHECKING:
+    from app.services.receivables_aggregates import AggregatesRefresher
 
 router = APIRouter()
 
+_IDEMPOTENCY_KEY = Header(
+    None,
+    alias="Idempotency-Key",
+    max_length=255,
+    description="Repetir a chamada com a mesma chave devolve o resultado da primeira.",
+)
+
+
+def _run_once(
+    flights: Optional[SingleFlight],
+    scope: str,
+    service: BillingReminderService,
+    payload: BillingReminderRequest,
+    idempotency_key: Optional[str],
+    run: Callable[[], BillingReminderResponse],
+    refresher: Optional[AggregatesRefresher] = None,
+) -> FlightResult:
+    """
+    Run the job once for concurrent identical requests, in any worker.
+
+    Errors are part of the shared result, so every request attached to a
+    run gets the same status and body. The run that actually sent schedules
+    the refresh of the dashboard summaries.
+    """
+
+    def call() -> Tuple[int, bytes]:
+        try:
+            # Built and validated by the service; skip FastAPI's second pass.
+            body = to_json(run())
+            if refresher is not None and not payload.dry_run:
+                refresher.request()
+            return status.HTTP_200_OK, body
+        except TenantBusyError as exc:
+            return status.HTTP_409_CONFLICT, to_json({"detail": str(exc)})
+        except BillingReminderError as exc:
+            return status.HTTP_400_BAD_REQUEST, to_json({"detail": str(exc)})
+
+    if flights is None:
+        return FlightResult(*call(), shared=False)
+    identity = service.run_identity(payload)
+    return flights.run(
+        flight_key(scope, identity),
+        flight_key(scope, identity, payload.resume),
+        call,
+        idempotency_key=idempotency_key,
+    )
+
+
+def _coalesced_run(
+    flights: Optional[SingleFlight],
+    scope: str,
+    service: BillingReminderService,
+    payload: BillingReminderRequest,
+    idempotency_key: Optional[str],
+    run: Callable[[], BillingReminderResponse],
+    refresher: Optional[AggregatesRefresher] = None,
+) -> Response:
+    """:func:`_run_once` as the HTTP response of a single run."""
+    try:
+        result = _run_once(
+            flights, scope, service, payload, idempotency_key, run, refresher
+        )
+    except IdempotencyKeyReusedError as exc:
+        # 422 Unprocessable Content; its constant was renamed in Starlette
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except FlightError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return Response(
+        result.body,
+        status_code=result.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if result.shared else None,
+    )
+
 
 @router.post(
     "/billing/run",
@@ -20,15 +126,203 @@ router = APIRouter()
 )
 def run_billing_reminders(
     payload: BillingReminderRequest,
+    idempotency_key: Optional[str] = _IDEMPOTENCY_KEY,
     reminder_service: BillingReminderService = Depends(
         get_billing_reminder_service
     ),
-) -> BillingReminderResponse:
+    flights: Optional[SingleFlight] = Depends(get_single_flight),
+    refresher: Optional[AggregatesRefresher] = Depends(get_aggregates_refresher),
+) -> Response:
     """Trigger the reminder workflow for the configured XLSX file."""
+    return _coalesced_run(
+        flights,
+        "default",
+        reminder_service,
+        payload,
+        idempotency_key,
+        lambda: reminder_service.run(payload),
+        refresher,
+    )
+
+
+_UPLOAD_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["file"],
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        }
+    },
+}
+
+
+@router.post(
+    "/uploads",
+    response_model=SheetUpload,
+    status_code=status.HTTP_201_CREATED,
+    summary="Envia uma planilha XLSX ou exportacao XML (multipart, campo file).",
+    openapi_extra={"requestBody": _UPLOAD_BODY},
+)
+async def upload_billing_sheet(
+    request: Request,
+    response: Response,
+    store: SheetUploadStore = Depends(get_sheet_upload_store),
+    reminder_service: BillingReminderService = Depends(get_billing_reminder_service),
+    refresher: Optional[AggregatesRefresher] = Depends(get_aggregates_refresher),
+) -> SheetUpload:
+    """Stream the file to disk while hashing it (and parsing an XML), then snapshot it."""
+    try:
+        stored = await store.save(request.headers.get("content-type", ""), request.stream())
+    except UploadTooLargeError as exc:
+        # 413 Content Too Large; its constant was renamed in Starlette
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        total_rows = await run_in_threadpool(
+            reminder_service.preload, stored.path, rows=stored.rows
+        )
+    except BillingReminderError as exc:
+        if not stored.deduplicated:
+            stored.path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{stored.filename}: {exc}",
+        ) from exc
+
+    if stored.deduplicated:
+        response.status_code = status.HTTP_200_OK
+    if refresher is not None:
+        refresher.request()
+    return SheetUpload(
+        filename=stored.filename,
+        sheet_path=str(stored.path),
+        sha256=stored.sha256,
+        size_bytes=stored.size_bytes,
+        deduplicated=stored.deduplicated,
+        total_rows=total_rows,
+    )
+
+
+@router.get(
+    "/schedule",
+    response_model=ReminderSchedule,
+    summary="Agenda dos lembretes dos proximos dias, por data e canal.",
+)
+def get_reminder_schedule(
+    days: int = Query(7, ge=1, le=90, description="Quantidade de datas a partir de start."),
+    start: Optional[date] = Query(None, description="Primeira data; default = hoje."),
+    sheet_path: Optional[str] = Query(None, description="Arquivo, diretorio ou glob."),
+    all_sheets: bool = Query(False),
+    reminder_service: BillingReminderService = Depends(
+        get_billing_reminder_service
+    ),
+) -> ModelJSONResponse:
+    """Preview what each of the next days would send, without dispatching."""
     try:
-        return reminder_service.run(payload)
+        return ModelJSONResponse(
+            reminder_service.schedule(
+                days, start_date=start, sheet_path=sheet_path, all_sheets=all_sheets
+            )
+        )
     except BillingReminderError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(exc),
         ) from exc
+
+
+@router.get(
+    "/tenants",
+    response_model=list[TenantInfo],
+    summary="Empresas configuradas (API_TENANTS_FILE) e a origem dos seus dados.",
+)
+def list_tenants(
+    registry: TenantRegistry = Depends(get_tenant_registry),
+) -> list[TenantInfo]:
+    """Return the configured tenants."""
+    return registry.describe(get_settings().billing_sheet_path)
+
+
+@router.post(
+    "/tenants/run",
+    response_model=TenantRunResponse,
+    summary="Executa o job de varias empresas em paralelo, isoladas entre si.",
+)
+def run_tenants(
+    payload: TenantRunRequest,
+    registry: TenantRegistry = Depends(get_tenant_registry),
+    flights: Optional[SingleFlight] = Depends(get_single_flight),
+    refresher: Optional[AggregatesRefresher] = Depends(get_aggregates_refresher),
+) -> ModelJSONResponse:
+    """Run the reminder job of each tenant with its own sources, clients and limits."""
+    request = BillingReminderRequest(
+        reference_date=payload.reference_date,
+        dry_run=payload.dry_run,
+        resume=payload.resume,
+    )
+
+    def run_tenant(tenant_id: str, request: BillingReminderRequest) -> BillingReminderResponse:
+        # Same flight as /tenants/{id}/billing/run, so a tenant never runs
+        # twice at once even when the calls land on different workers.
+        result = _run_once(
+            flights,
+            f"tenant:{tenant_id}",
+            registry.service(tenant_id),
+            request,
+            None,
+            lambda: registry.run(tenant_id, request),
+        )
+        if result.status_code == status.HTTP_200_OK:
+            return BillingReminderResponse.model_validate_json(result.body)
+        detail = json.loads(result.body).get("detail", "")
+        if result.status_code == status.HTTP_409_CONFLICT:
+            raise TenantBusyError(detail)
+        raise BillingReminderError(detail)
+
+    try:
+        results = registry.run_many(payload.tenants or registry.ids(), request, run=run_tenant)
+    except TenantNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    if refresher is not None and not payload.dry_run:
+        refresher.request()
+    return ModelJSONResponse(TenantRunResponse(results=results))
+
+
+@router.post(
+    "/tenants/{tenant_id}/billing/run",
+    response_model=BillingReminderResponse,
+    summary="Executa o job de uma empresa.",
+)
+def run_tenant_billing_reminders(
+    tenant_id: str,
+    payload: BillingReminderRequest,
+    idempotency_key: Optional[str] = _IDEMPOTENCY_KEY,
+    registry: TenantRegistry = Depends(get_tenant_registry),
+    flights: Optional[SingleFlight] = Depends(get_single_flight),
+    refresher: Optional[AggregatesRefresher] = Depends(get_aggregates_refresher),
+) -> Response:
+    """Trigger the reminder workflow with the tenant's configuration."""
+    try:
+        service = registry.service(tenant_id)
+    except TenantNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+    return _coalesced_run(
+        flights,
+        f"tenant:{tenant_id}",
+        service,
+        payload,
+        idempotency_key,
+        lambda: registry.run(tenant_id, payload),
+        refresher,
+    )
@@ -1,12 +1,23 @@
 from __future__ import annotations
 
-from typing import Iterable
+from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
 
 from app.api.dependencies import get_service_manager
-from app.models.service import Service, ServiceCreate, ServiceUpdate
+from app.api.responses import ModelJSONResponse
+from app.core.config import get_settings
+from app.models.service import (
+    BulkItem,
+    BulkItemStatus,
+    Service,
+    ServiceBulkItemResult,
+    ServiceBulkResult,
+    ServiceBulkUpdate,
+    ServiceCreate,
+    ServiceUpdate,
+)
 from app.services.service_manager import ServiceManager, ServiceNotFoundError
 
 router = APIRouter()
@@ -15,9 +26,9 @@ router = APIRouter()
 @router.get("/", response_model=list[Service])
 def list_services(
     service_manager: ServiceManager = Depends(get_service_manager),
-) -> Iterable[Service]:
+) -> ModelJSONResponse:
     """Return all registered services."""
-    return service_manager.list_services()
+    return ModelJSONResponse(list(service_manager.list_services()))
 
 
 @router.post(
@@ -33,6 +44,79 @@ def create_service(
     return service_manager.create_service(payload)
 
 
+_ATOMIC = Query(False, description="Quando verdadeiro, nada e aplicado se algum item falhar.")
+
+
+def _check_bulk_size(items: List[BulkItem]) -> None:
+    limit = get_settings().services_bulk_max_items
+    if len(items) > limit:
+        raise HTTPException(
+            status_code=413,  # Content Too Large; its constant was renamed in Starlette
+            detail=f"Maximo de {limit} itens por requisicao.",
+        )
+
+
+def _bulk_response(results: List[ServiceBulkItemResult]) -> ModelJSONResponse:
+    applied = sum(
+        1
+        for result in results
+        if result.status
+        in {BulkItemStatus.CREATED, BulkItemStatus.UPDATED, BulkItemStatus.DELETED}
+    )
+    return ModelJSONResponse(
+        ServiceBulkResult(applied=applied, failed=len(results) - applied, results=results)
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=ServiceBulkResult,
+    summary="Cadastra varios servicos em uma unica requisicao.",
+)
+def bulk_create_services(
+    items: List[BulkItem[ServiceCreate]] = Body(
+        ..., description="Lista de servicos (mesmo formato do POST /)."
+    ),
+    atomic: bool = _ATOMIC,
+    service_manager: ServiceManager = Depends(get_service_manager),
+) -> ModelJSONResponse:
+    """Validate every item and register the valid ones in one pass."""
+    _check_bulk_size(items)
+    return _bulk_response(service_manager.bulk_create(items, atomic=atomic))
+
+
+@router.put(
+    "/bulk",
+    response_model=ServiceBulkResult,
+    summary="Atualiza varios servicos em uma unica requisicao.",
+)
+def bulk_update_services(
+    items: List[BulkItem[ServiceBulkUpdate]] = Body(
+        ..., description="Lista de {id, campos a alterar}."
+    ),
+    atomic: bool = _ATOMIC,
+    service_manager: ServiceManager = Depends(get_service_manager),
+) -> ModelJSONResponse:
+    """Apply partial updates to many services under one lock acquisition."""
+    _check_bulk_size(items)
+    return _bulk_response(service_manager.bulk_update(items, atomic=atomic))
+
+
+@router.delete(
+    "/bulk",
+    response_model=ServiceBulkResult,
+    summary="Remove varios servicos em uma unica requisicao.",
+)
+def bulk_delete_services(
+    items: List[BulkItem[UUID]] = Body(..., description="Lista de ids."),
+    atomic: bool = _ATOMIC,
+    service_manager: ServiceManager = Depends(get_service_manager),
+) -> ModelJSONResponse:
+    """Remove many services under one lock acquisition."""
+    _check_bulk_size(items)
+    return _bulk_response(service_manager.bulk_delete(items, atomic=atomic))
+
+
 @router.get(
     "/{service_id}",
     response_model=Service,
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.dependencies import get_delivery_event_writer, get_runtime_config
+from app.core.database import DatabaseNotInitializedError, get_database
+from app.models.system import (
+    CircuitBreakerStatus,
+    DatabasePoolStatus,
+    ReminderRuntimeConfig,
+    ReminderRuntimeConfigUpdate,
+)
+from app.models.webhook import DeliveryEventsStatus
+from app.services.circuit_breaker import circuit_breakers
+from app.services.delivery_events import DeliveryEventWriter
+from app.services.runtime_config import (
+    DAYS_KEY,
+    EMAIL_KEY,
+    WHATSAPP_KEY,
+    ReminderConfig,
+    RuntimeConfig,
+    RuntimeConfigError,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/database/pool",
+    response_model=DatabasePoolStatus,
+    summary="Metricas do pool de conexoes MySQL deste worker.",
+)
+def get_database_pool_status() -> DatabasePoolStatus:
+    """Return connection pool counters for the primary and replica engines."""
+    try:
+        return DatabasePoolStatus(**get_database().pool_status())
+    except DatabaseNotInitializedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+
+def _config_response(config: ReminderConfig) -> ReminderRuntimeConfig:
+    return ReminderRuntimeConfig(
+        reminder_days=list(config.reminder_days),
+        email_enabled=config.email_enabled,
+        whatsapp_enabled=config.whatsapp_enabled,
+        version=config.version,
+        source=config.source,
+    )
+
+
+def _require_runtime_config(
+    runtime_config: RuntimeConfig | None = Depends(get_runtime_config),
+) -> RuntimeConfig:
+    if runtime_config is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Configuracao em banco desabilitada (API_RUNTIME_CONFIG_ENABLED).",
+        )
+    return runtime_config
+
+
+@router.get(
+    "/config",
+    response_model=ReminderRuntimeConfig,
+    summary="Configuracao de lembretes em uso (configuracao_sistema, em cache).",
+)
+def get_runtime_settings(
+    runtime_config: RuntimeConfig = Depends(_require_runtime_config),
+) -> ReminderRuntimeConfig:
+    """Return the cached reminder configuration of this worker."""
+    return _config_response(runtime_config.current())
+
+
+@router.put(
+    "/config",
+    response_model=ReminderRuntimeConfig,
+    summary="Altera a configuracao de lembretes e publica uma nova versao.",
+)
+def update_runtime_settings(
+    payload: ReminderRuntimeConfigUpdate,
+    runtime_config: RuntimeConfig = Depends(_require_runtime_config),
+) -> ReminderRuntimeConfig:
+    """Store the given keys; other workers reload them within one TTL."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    values = {}
+    if payload.reminder_days is not None:
+        values[DAYS_KEY] = ",".join(str(day) for day in payload.reminder_days)
+    if payload.email_enabled is not None:
+        values[EMAIL_KEY] = "true" if payload.email_enabled else "false"
+    if payload.whatsapp_enabled is not None:
+        values[WHATSAPP_KEY] = "true" if payload.whatsapp_enabled else "false"
+    try:
+        return _config_response(runtime_config.update(values))
+    except RuntimeConfigError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+    except (DatabaseNotInitializedError, SQLAlchemyError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get(
+    "/delivery-events",
+    response_model=DeliveryEventsStatus,
+    summary="Buffer de eventos de entrega do WAHA deste worker.",
+)
+def get_delivery_events_status(
+    writer: DeliveryEventWriter = Depends(get_delivery_event_writer),
+) -> DeliveryEventsStatus:
+    """Return queue depth and write counters of the delivery-event writer."""
+    return DeliveryEventsStatus(
+        pending=writer.pending(),
+        received=writer.received,
+        written=writer.written,
+        dropped=writer.dropped,
+        unmatched=writer.unmatched,
+        failed_batches=writer.failed_batches,
+    )
+
+
+@router.get(
+    "/circuit-breakers",
+    response_model=list[CircuitBreakerStatus],
+    summary="Circuit breakers dos provedores (WAHA, email) deste worker.",
+)
+def get_circuit_breakers() -> list[CircuitBreakerStatus]:
+    """Return state and recent failure rate of every provider breaker."""
+    return [CircuitBreakerStatus(**breaker.status()) for breaker in circuit_breakers()]
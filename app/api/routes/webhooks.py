@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.api.dependencies import get_delivery_event_writer
+from app.core.config import get_settings
+from app.models.webhook import WebhookAccepted
+from app.services.delivery_events import (
+    DeliveryEventWriter,
+    parse_waha_event,
+    verify_signature,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/waha",
+    response_model=WebhookAccepted,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Recebe eventos message/message.ack do WAHA e grava em lote.",
+)
+async def receive_waha_events(
+    request: Request,
+    writer: DeliveryEventWriter = Depends(get_delivery_event_writer),
+) -> WebhookAccepted:
+    """Queue delivery updates in memory; a background thread writes them."""
+    body = await request.body()
+    hmac_key = get_settings().waha_webhook_hmac_key
+    if hmac_key and not verify_signature(body, request.headers.get("X-Webhook-Hmac"), hmac_key):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Assinatura HMAC invalida.",
+        )
+    try:
+        payload = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Corpo JSON invalido.",
+        ) from exc
+
+    events = payload if isinstance(payload, list) else [payload]
+    updates = [update for update in map(parse_waha_event, events) if update is not None]
+    queued = writer.submit(updates)
+    return WebhookAccepted(received=len(events), queued=queued)
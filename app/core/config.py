@@ -1,3 +1,4 @@
+from datetime import time
 from functools import lru_cache
 
 from pydantic import Field
@@ -17,12 +18,45 @@ class Settings(BaseSettings):
     debug: bool = True
     api_prefix: str = "/api"
     cors_allow_origins: list[str] = ["*"]
+    services_bulk_max_items: int = Field(5000, ge=1)
     billing_sheet_path: str = "data/clientes.xlsx"
     reminder_days_before_due: list[int] = [3, 1]
+    billing_fast_xlsx_reader: bool = True
+    billing_ingest_workers: int | None = Field(None, ge=1)
+    billing_snapshot_cache: bool = True
+    billing_upload_dir: str = "data/uploads"
+    billing_upload_max_bytes: int = Field(100 * 1024 * 1024, ge=1)
+    reminder_checkpoint_dir: str | None = "data/checkpoints"
+    reminder_checkpoint_sync_every: int = Field(20, ge=1)
+    reminder_flight_dir: str | None = "data/flights"
+    reminder_flight_wait_seconds: float = Field(900.0, gt=0)
+    reminder_idempotency_ttl_seconds: float = Field(86400.0, ge=0)
+    tenants_file: str | None = None
+    tenant_run_timeout_seconds: float = Field(600.0, gt=0)
+    reminder_coalesce_by_client: bool = True
+    reminder_send_window_start: time | None = None
+    reminder_send_window_end: time | None = None
+    reminder_critical_days: int = Field(1, ge=0)
+    reminder_whatsapp_workers: int = Field(1, ge=1, le=32)
+    reminder_email_workers: int = Field(1, ge=1, le=32)
+    reminder_stage_queue_depth: int = Field(100, ge=1)
     waha_base_url: str = "http://localhost:3000"
     waha_api_token: str | None = None
     waha_default_sender: str | None = None
+    waha_session: str = "default"
     waha_timeout_seconds: float = Field(10.0, ge=1.0, le=60.0)
+    waha_number_check_enabled: bool = True
+    waha_number_cache_path: str = "data/whatsapp_numbers.sqlite3"
+    waha_number_cache_ttl_hours: float = Field(168.0, gt=0)
+    waha_number_check_workers: int = Field(8, ge=1, le=64)
+    waha_webhook_hmac_key: str | None = None
+    circuit_failure_rate: float = Field(0.5, gt=0, le=1)
+    circuit_window: int = Field(20, ge=1)
+    circuit_min_calls: int = Field(5, ge=1)
+    circuit_open_seconds: float = Field(30.0, gt=0)
+    delivery_events_batch_size: int = Field(1000, ge=1, le=10_000)
+    delivery_events_flush_seconds: float = Field(0.5, gt=0)
+    delivery_events_max_pending: int = Field(100_000, ge=1)
 
     # Email settings
     email_enabled: bool = False
@@ -45,6 +79,27 @@ class Settings(BaseSettings):
     mysql_database: str = "contas_receber"
     mysql_user: str = "apiuser"
     mysql_password: str = "apipassword"
+    mysql_pool_size: int = Field(5, ge=1)
+    mysql_max_overflow: int = Field(10, ge=0)
+    mysql_pool_recycle_seconds: int = Field(1800, ge=-1)
+    mysql_pool_timeout_seconds: float = Field(30.0, gt=0)
+    mysql_pool_pre_ping: bool = True
+    mysql_replica_url: str | None = None
+    mysql_warmup_connections: int = Field(1, ge=0)
+    warmup_enabled: bool = True
+    response_compression_min_bytes: int = Field(1024, ge=0)
+    response_gzip_level: int = Field(6, ge=1, le=9)
+    response_brotli_quality: int = Field(4, ge=0, le=11)
+    aggregates_version_check_seconds: float = Field(5.0, ge=0)
+    aggregates_auto_refresh: bool = True
+    aggregates_refresh_delay_seconds: float = Field(5.0, ge=0)
+    runtime_config_enabled: bool = True
+    runtime_config_ttl_seconds: float = Field(30.0, ge=0)
+    archive_settled_after_days: int = Field(180, ge=1)
+    archive_history_after_days: int = Field(365, ge=1)
+    archive_batch_size: int = Field(1000, ge=1, le=50_000)
+    archive_max_batches: int = Field(100, ge=1)
+    archive_interval_hours: float = Field(0.0, ge=0)
 
     model_config = SettingsConfigDict(
         env_prefix="API_",
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.core.config import Settings
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.engine import URL
+    from sqlalchemy.orm import Session
+
+
+class DatabaseNotInitializedError(RuntimeError):
+    """Raised when the engine is requested outside the application lifespan."""
+
+    pass
+
+
+class Database:
+    """Pooled engines (primary and optional read replica) shared by one worker."""
+
+    def __init__(self, settings: Settings) -> None:
+        from sqlalchemy.orm import sessionmaker  # slow import, only once the app starts
+
+        self.engine = self._create_engine(self.primary_url(settings), settings)
+        self.replica_engine: Optional[Engine] = None
+        if settings.mysql_replica_url:
+            self.replica_engine = self._create_engine(settings.mysql_replica_url, settings)
+
+        self._sessions = sessionmaker(bind=self.engine, expire_on_commit=False)
+        self._read_sessions = sessionmaker(
+            bind=self.replica_engine or self.engine, expire_on_commit=False
+        )
+
+    @staticmethod
+    def primary_url(settings: Settings) -> URL:
+        from sqlalchemy.engine import URL
+
+        return URL.create(
+            "mysql+pymysql",
+            username=settings.mysql_user,
+            password=settings.mysql_password,
+            host=settings.mysql_host,
+            port=settings.mysql_port,
+            database=settings.mysql_database,
+            query={"charset": "utf8mb4"},
+        )
+
+    @staticmethod
+    def _create_engine(url: URL | str, settings: Settings) -> Engine:
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import QueuePool
+
+        return create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=settings.mysql_pool_size,
+            max_overflow=settings.mysql_max_overflow,
+            pool_recycle=settings.mysql_pool_recycle_seconds,
+            pool_pre_ping=settings.mysql_pool_pre_ping,
+            pool_timeout=settings.mysql_pool_timeout_seconds,
+        )
+
+    def session(self) -> Session:
+        """Open a session on the primary (read/write) engine."""
+        return self._sessions()
+
+    def read_session(self) -> Session:
+        """Open a session on the read replica, or the primary when none is set."""
+        return self._read_sessions()
+
+    def warm_up(self, connections: int = 1) -> int:
+        """Open up to ``connections`` pooled connections ahead of the first request."""
+        opened = []
+        try:
+            for _ in range(min(connections, self.engine.pool.size())):
+                opened.append(self.engine.connect())
+        finally:
+            for connection in opened:
+                connection.close()  # back to the pool, still open
+        return len(opened)
+
+    def pool_status(self) -> Dict[str, Any]:
+        """Return connection pool counters for the primary and replica engines."""
+        status = {"primary": self._pool_metrics(self.engine)}
+        if self.replica_engine is not None:
+            status["replica"] = self._pool_metrics(self.replica_engine)
+        return status
+
+    @staticmethod
+    def _pool_metrics(engine: Engine) -> Dict[str, Any]:
+        from sqlalchemy.pool import QueuePool
+
+        pool = engine.pool
+        metrics: Dict[str, Any] = {"url": engine.url.render_as_string(hide_password=True)}
+        if isinstance(pool, QueuePool):
+            metrics.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return metrics
+
+    def dispose(self) -> None:
+        self.engine.dispose()
+        if self.replica_engine is not None:
+            self.replica_engine.dispose()
+
+
+_database: Optional[Database] = None
+
+
+def init_database(settings: Settings) -> Database:
+    """Create the worker-wide engines; connections are opened on first use."""
+    global _database
+    if _database is None:
+        _database = Database(settings)
+    return _database
+
+
+def get_database() -> Database:
+    """Return the engines created by the application lifespan."""
+    if _database is None:
+        raise DatabaseNotInitializedError(
+            "Banco de dados nao inicializado; use init_database no startup."
+        )
+    return _database
+
+
+def close_database() -> None:
+    """Dispose pooled connections (called on application shutdown)."""
+    global _database
+    if _database is not None:
+        _database.dispose()
+        _database = None
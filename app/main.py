@@ -1,8 +1,28 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
+from app.api.compression import CompressionMiddleware
+from app.api.dependencies import (
+    get_aggregates_refresher,
+    get_archive_scheduler,
+    get_delivery_event_writer,
+    get_tenant_registry,
+    get_waha_client,
+    warm_up_dependencies,
+)
+from app.api.routes.receivables import router as receivables_router
 from app.api.routes.reminders import router as reminders_router
 from app.api.routes.services import router as services_router
-from app.core.config import get_settings
+from app.api.routes.system import router as system_router
+from app.api.routes.webhooks import router as webhooks_router
+from app.core.config import Settings, get_settings
+from app.core.database import Database, close_database, init_database
+
+logger = logging.getLogger(__name__)
 
 tags_metadata = [
     {
@@ -19,9 +39,66 @@ tags_metadata = [
             "via WhatsApp (WAHA)."
         ),
     },
+    {
+        "name": "receivables",
+        "description": (
+            "Consulta paginada dos titulos de contas a receber importados "
+            "no MySQL."
+        ),
+    },
+    {
+        "name": "system",
+        "description": "Estado interno do worker (pools de conexao, etc).",
+    },
+    {
+        "name": "webhooks",
+        "description": "Eventos recebidos do WAHA (confirmacoes de entrega e leitura).",
+    },
 ]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Create worker-wide resources on startup and release them on shutdown."""
+    settings = get_settings()
+    database = init_database(settings)
+    if settings.warmup_enabled:
+        warm_up(database, settings)
+    delivery_events = get_delivery_event_writer()
+    delivery_events.start()
+    archive_scheduler = get_archive_scheduler()
+    if archive_scheduler is not None:
+        archive_scheduler.start()
+    try:
+        yield
+    finally:
+        if archive_scheduler is not None:
+            archive_scheduler.close()
+        delivery_events.stop()
+        if get_aggregates_refresher.cache_info().currsize:
+            refresher = get_aggregates_refresher()
+            if refresher is not None:
+                refresher.close()
+        get_waha_client().close()
+        if get_tenant_registry.cache_info().currsize:
+            get_tenant_registry().close()
+        close_database()
+
+
+def warm_up(database: Database, settings: Settings) -> None:
+    """Pay one-time costs (clients, caches, pooled connections) before serving."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    started = time.perf_counter()
+    warm_up_dependencies()
+    try:
+        database.warm_up(settings.mysql_warmup_connections)
+    except SQLAlchemyError as exc:
+        # The API still serves non-database routes; the pool retries on demand.
+        logger.warning("Warm-up do MySQL falhou: %s", exc)
+    logger.info("Warm-up concluido em %.0f ms", (time.perf_counter() - started) * 1000)
+
+
 def create_app() -> FastAPI:
     """Initialize FastAPI application with configured routes and metadata."""
     settings = get_settings()
@@ -36,8 +113,15 @@ def create_app() -> FastAPI:
         redoc_url=f"{settings.api_prefix}/redoc",
         openapi_tags=tags_metadata,
         swagger_ui_parameters={"defaultModelsExpandDepth": -1},
+        lifespan=lifespan,
     )
 
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.response_compression_min_bytes,
+        compresslevel=settings.response_gzip_level,
+        brotli_quality=settings.response_brotli_quality,
+    )
     register_routers(app)
     register_root_route(app)
 
@@ -57,6 +141,21 @@ def register_routers(app: FastAPI) -> None:
         prefix=f"{settings.api_prefix}/reminders",
         tags=["reminders"],
     )
+    app.include_router(
+        receivables_router,
+        prefix=f"{settings.api_prefix}/receivables",
+        tags=["receivables"],
+    )
+    app.include_router(
+        system_router,
+        prefix=f"{settings.api_prefix}/system",
+        tags=["system"],
+    )
+    app.include_router(
+        webhooks_router,
+        prefix=f"{settings.api_prefix}/webhooks",
+        tags=["webhooks"],
+    )
 
 
 def register_root_route(app: FastAPI) -> None:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AggregateDimension(str, Enum):
+    """Dimensoes disponiveis para agrupar os totais."""
+
+    DUE_DATE = "datavencimento"
+    UF = "uf"
+    CITY = "descmuni"
+    PAYMENT_METHOD = "descricaoformapagto"
+    STATUS = "statusdoc"
+
+
+class AggregateBucket(BaseModel):
+    """Total de titulos e valor para um valor da dimensao."""
+
+    key: str
+    quantidade: int
+    valor_total: Decimal
+
+
+class ReminderConversion(BaseModel):
+    """Titulos lembrados por canal e quantos ja foram baixados."""
+
+    tipo_envio: str
+    enviados: int
+    liquidados: int
+    taxa_conversao: float
+
+
+class ReceivablesAggregates(BaseModel):
+    """Resposta do endpoint de agregados."""
+
+    version: int
+    group_by: AggregateDimension
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    buckets: list[AggregateBucket]
+    conversion: list[ReminderConversion]
+
+
+class AggregatesRefreshResult(BaseModel):
+    """Resumo de uma atualizacao incremental."""
+
+    version: int
+    due_days_refreshed: int
+    send_days_refreshed: int
+    full: bool
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Receivable(BaseModel):
+    """Titulo de contas a receber importado do ERP."""
+
+    id: int
+    codcliente: int
+    cpf: Optional[str] = None
+    nome: str
+    uf: Optional[str] = None
+    descmuni: Optional[str] = None
+    numerocontrato: Optional[str] = None
+    numeroparcela: Optional[int] = None
+    nossonumero: Optional[str] = None
+    datavencimento: date
+    valordocumento: Decimal
+    descricaoformapagto: Optional[str] = None
+    statusdoc: Optional[str] = None
+    fone: Optional[str] = None
+    email: Optional[str] = None
+
+
+class ReceivablePage(BaseModel):
+    """Pagina de titulos; envie `next_cursor` como `cursor` para continuar."""
+
+    items: list[Receivable]
+    next_cursor: Optional[str] = None
+
+
+class ArchiveRunResult(BaseModel):
+    """Resumo de uma execucao do job de retencao."""
+
+    settled_before: date
+    history_before: date
+    dry_run: bool
+    titles_archived: int
+    history_archived: int
+    batches: int
+    complete: bool
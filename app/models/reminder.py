@@ -14,6 +14,15 @@ class ReminderStatus(str, Enum):
     DRY_RUN = "dry-run"
     SKIPPED = "skipped"
     FAILED = "failed"
+    INVALID_NUMBER = "invalid-number"
+    DEFERRED = "deferred"
+
+
+class ReminderChannel(str, Enum):
+    """Canais usados para os lembretes."""
+
+    WHATSAPP = "whatsapp"
+    EMAIL = "email"
 
 
 class BillingReminderRequest(BaseModel):
@@ -21,7 +30,14 @@ class BillingReminderRequest(BaseModel):
 
     sheet_path: Optional[str] = Field(
         default=None,
-        description="Caminho do XLSX; usa configuracao padrao quando omitido.",
+        description=(
+            "Caminho do XLSX, diretorio ou glob (ex.: data/*.xlsx); usa "
+            "configuracao padrao quando omitido."
+        ),
+    )
+    all_sheets: bool = Field(
+        default=False,
+        description="Quando verdadeiro, le todas as abas; caso contrario so a aba ativa.",
     )
     reference_date: Optional[date] = Field(
         default=None,
@@ -35,6 +51,13 @@ class BillingReminderRequest(BaseModel):
         default=None,
         description="Numero/instancia do WAHA utilizado para o envio.",
     )
+    resume: bool = Field(
+        default=False,
+        description=(
+            "Continua a execucao interrompida com os mesmos arquivos, data e "
+            "remetente, sem repetir os envios ja feitos."
+        ),
+    )
 
 
 class ReminderDispatchResult(BaseModel):
@@ -49,6 +72,37 @@ class ReminderDispatchResult(BaseModel):
     detail: Optional[str] = None
 
 
+class SheetUpload(BaseModel):
+    """Planilha ou exportacao XML recebida por upload."""
+
+    filename: str
+    sheet_path: str = Field(description="Use como sheet_path em /billing/run.")
+    sha256: str
+    size_bytes: int
+    deduplicated: bool = Field(description="Mesmo conteudo ja enviado antes; nada foi gravado.")
+    total_rows: int
+
+
+class DeadlineReport(BaseModel):
+    """Situacao dos titulos criticos (vencimento mais proximo) na execucao."""
+
+    critical_days: int = Field(description="Titulos que vencem em ate N dias sao criticos.")
+    send_window: Optional[str] = Field(None, description="Janela de envio (HH:MM-HH:MM).")
+    critical_titles: int = 0
+    critical_dispatched: int = 0
+    critical_pending: int = Field(0, description="Titulos criticos adiados ou com falha.")
+    yielded: int = Field(
+        0, description="Envios nao criticos adiados para liberar tempo aos criticos."
+    )
+    at_risk: bool = Field(
+        False,
+        description=(
+            "Criticos ficaram pendentes ou nao cabiam no que restava da janela "
+            "de envio; repita com resume para concluir."
+        ),
+    )
+
+
 class BillingReminderResponse(BaseModel):
     """Resumo da execucao do job."""
 
@@ -59,4 +113,33 @@ class BillingReminderResponse(BaseModel):
     total_rows: int
     eligible_rows: int
     dispatched: int
+    resumed: bool = False
+    deadline: Optional[DeadlineReport] = None
     results: list[ReminderDispatchResult]
+
+
+class ScheduleChannelSummary(BaseModel):
+    """Lembretes de um canal em uma data."""
+
+    channel: ReminderChannel
+    titles: int
+    messages: int = Field(description="Envios apos o agrupamento por destinatario.")
+    total_amount: float
+
+
+class ScheduleDay(BaseModel):
+    """Lembretes que disparam em uma data de referencia."""
+
+    reference_date: date
+    channels: list[ScheduleChannelSummary]
+
+
+class ReminderSchedule(BaseModel):
+    """Agenda dos proximos disparos calculada sem enviar nada."""
+
+    sheet_path: str
+    start_date: date
+    days: int
+    days_watched: list[int]
+    total_rows: int
+    schedule: list[ScheduleDay]
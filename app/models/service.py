@@ -2,10 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Generic, Optional, TypeVar
 from uuid import UUID
 
-from pydantic import AnyHttpUrl, BaseModel, Field
+from pydantic import (
+    AnyHttpUrl,
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationError,
+    model_validator,
+)
+
+T = TypeVar("T")
 
 
 class ServiceStatus(str, Enum):
@@ -46,3 +55,73 @@ class Service(ServiceBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
+
+
+class ServiceBulkUpdate(ServiceUpdate):
+    """Item of a bulk update: the service id plus the fields to change."""
+
+    id: UUID
+
+
+def validation_detail(exc: ValidationError, skip: int = 0) -> str:
+    """One-line summary of a pydantic validation error, minus ``skip`` loc parts."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'][skip:]) or 'item'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class BulkItem(BaseModel, Generic[T]):
+    """
+    One item of a bulk request body: the validated payload, or why it failed.
+
+    An invalid item keeps its validation error in ``error`` instead of
+    rejecting the whole request, so it gets its own result. Clients send the
+    bare payload, so the JSON schema is the payload's.
+    """
+
+    value: T
+    error: Optional[str] = None
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _keep_error(cls, data: Any, handler):
+        if isinstance(data, BulkItem):
+            return data
+        try:
+            return handler({"value": data})
+        except ValidationError as exc:
+            return cls.model_construct(value=None, error=validation_detail(exc, skip=1))
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, core_schema, handler):
+        return handler(TypeAdapter(cls.model_fields["value"].annotation).core_schema)
+
+
+class BulkItemStatus(str, Enum):
+    """Result of one item of a bulk request."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    INVALID = "invalid"
+    NOT_FOUND = "not_found"
+    NOT_APPLIED = "not_applied"
+
+
+class ServiceBulkItemResult(BaseModel):
+    """Outcome of one item, in the order it was sent."""
+
+    index: int
+    status: BulkItemStatus
+    id: Optional[UUID] = None
+    service: Optional[Service] = None
+    detail: Optional[str] = None
+
+
+class ServiceBulkResult(BaseModel):
+    """Per-item results of a bulk create/update/delete."""
+
+    applied: int
+    failed: int
+    results: list[ServiceBulkItemResult]
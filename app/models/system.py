@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PoolMetrics(BaseModel):
+    """Contadores do pool de conexoes de um engine."""
+
+    url: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+
+
+class DatabasePoolStatus(BaseModel):
+    """Estado dos pools do worker que atendeu a requisicao."""
+
+    primary: PoolMetrics
+    replica: Optional[PoolMetrics] = None
+
+
+class ReminderRuntimeConfig(BaseModel):
+    """Configuracao de lembretes em uso por este worker."""
+
+    reminder_days: list[int]
+    email_enabled: bool
+    whatsapp_enabled: bool
+    version: int
+    source: str
+
+
+class ReminderRuntimeConfigUpdate(BaseModel):
+    """Campos de configuracao_sistema a alterar; os omitidos ficam como estao."""
+
+    reminder_days: Optional[list[int]] = Field(None, min_length=1)
+    email_enabled: Optional[bool] = None
+    whatsapp_enabled: Optional[bool] = None
+
+
+class CircuitBreakerStatus(BaseModel):
+    """Estado do circuit breaker de um provedor (WAHA, email)."""
+
+    name: str
+    state: str
+    calls: int
+    failures: int
+    failure_rate: float
+    retry_in_seconds: Optional[float] = None
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from app.models.reminder import BillingReminderResponse
+
+
+class TenantConfig(BaseModel):
+    """Empresa atendida pela API, identificada pelo CNPJ."""
+
+    tenant_id: str = Field(pattern=r"^\d{14}$", description="CNPJ, somente digitos.")
+    name: Optional[str] = None
+    sheet_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Arquivo, diretorio ou glob da empresa; default = exportacoes com o "
+            "CNPJ no nome, no diretorio de API_BILLING_SHEET_PATH."
+        ),
+    )
+    reminder_days: Optional[list[int]] = Field(default=None, min_length=1)
+    waha_base_url: Optional[str] = None
+    waha_api_token: Optional[str] = None
+    waha_session: Optional[str] = None
+    waha_sender: Optional[str] = None
+    email_enabled: Optional[bool] = None
+    email_from: Optional[str] = None
+    email_from_name: Optional[str] = None
+    max_concurrent_runs: int = Field(default=1, ge=1)
+    sends_per_minute: Optional[float] = Field(
+        default=None, gt=0, description="Limite de envios (WhatsApp + email) por minuto."
+    )
+
+
+class TenantInfo(BaseModel):
+    """Empresa configurada e a origem dos seus dados."""
+
+    tenant_id: str
+    name: Optional[str] = None
+    sheet_path: str
+
+
+class TenantRunRequest(BaseModel):
+    """Execucao do job para varias empresas em paralelo."""
+
+    tenants: Optional[list[str]] = Field(
+        default=None, description="CNPJs a executar; default = todas as empresas."
+    )
+    reference_date: Optional[date] = None
+    dry_run: bool = False
+    resume: bool = False
+
+
+class TenantRunStatus(str, Enum):
+    """Situacao da execucao de uma empresa."""
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+    BUSY = "busy"
+    RUNNING = "running"
+
+
+class TenantRunResult(BaseModel):
+    """Resultado de uma empresa; `response` so existe quando concluida."""
+
+    tenant_id: str
+    status: TenantRunStatus
+    detail: Optional[str] = None
+    response: Optional[BillingReminderResponse] = None
+
+
+class TenantRunResponse(BaseModel):
+    """Resultados por empresa, na ordem pedida."""
+
+    results: list[TenantRunResult]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class WebhookAccepted(BaseModel):
+    """Eventos recebidos e quantos viraram atualizacoes de entrega."""
+
+    received: int
+    queued: int
+
+
+class DeliveryEventsStatus(BaseModel):
+    """Contadores do buffer de eventos de entrega deste worker."""
+
+    pending: int
+    received: int
+    written: int
+    dropped: int
+    unmatched: int
+    failed_batches: int
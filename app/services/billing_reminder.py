@@ -1,24 +1,50 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import glob
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable, List, Sequence
-
-from openpyxl import load_workbook
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Sequence
 
 from app.models.reminder import (
     BillingReminderRequest,
     BillingReminderResponse,
+    DeadlineReport,
+    ReminderChannel,
     ReminderDispatchResult,
+    ReminderSchedule,
     ReminderStatus,
+    ScheduleChannelSummary,
+    ScheduleDay,
 )
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.dispatch_pipeline import ChannelStage, run_stages
 from app.services.email_client import EmailClient, EmailClientError
 from app.services.email_templates import (
+    format_brl,
     get_billing_reminder_html,
     get_billing_reminder_text,
+    get_billing_summary_html,
+    get_billing_summary_text,
 )
+from app.services.number_cache import WhatsAppNumberCache, normalize_number
+from app.services.rate_limit import SendRateLimiter
+from app.services.record_snapshot import load_snapshot, save_snapshot
+from app.services.record_store import BillingRecord, BillingRecordStore
+from app.services.run_checkpoint import RunCheckpoint, run_key
+from app.services.runtime_config import ReminderConfig, RuntimeConfig
+from app.services.send_window import DeadlineTracker, SendWindow
 from app.services.waha_client import WahaClient, WahaClientError
+from app.services.xlsx_reader import XlsxReaderError, list_sheets, read_xlsx_rows
+from app.services.xml_export import XmlExportError, read_export_rows
+
+if TYPE_CHECKING:  # keeps SQLAlchemy out of this module's imports
+    from app.services.delivery_events import DeliveryEventWriter
 
 
 class BillingReminderError(Exception):
@@ -39,12 +65,78 @@ class BillingRowError(BillingReminderError):
     pass
 
 
+class DueDateParser:
+    """Convert due-date cells using a layout sniffed once for the whole column."""
+
+    MEMO_LIMIT = 4096
+
+    def __init__(
+        self,
+        fallback: Callable[[Any], date],
+        layout: tuple[str, int, int, int] | None = None,
+    ) -> None:
+        self._fallback = fallback
+        self._layout = layout
+        self._memo: dict[Any, date] = {}
+
+    @property
+    def layout(self) -> tuple[str, int, int, int] | None:
+        return self._layout
+
+    @classmethod
+    def from_sample(
+        cls,
+        values: Iterable[Any],
+        layouts: Sequence[tuple[str, int, int, int]],
+        fallback: Callable[[Any], date],
+    ) -> "DueDateParser":
+        """Pick the first layout that converts every text value in the sample."""
+        sample = [value.strip() for value in values if isinstance(value, str)]
+        sample = [value for value in sample if value]
+        if not sample:
+            return cls(fallback)
+        for layout in layouts:
+            if all(cls._split_date(value, layout) is not None for value in sample):
+                return cls(fallback, layout)
+        return cls(fallback)
+
+    def __call__(self, value: Any) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            return self._fallback(value)
+
+        cached = self._memo.get(value)
+        if cached is not None:
+            return cached
+
+        parsed = None
+        if self._layout is not None and isinstance(value, str):
+            parsed = self._split_date(value.strip(), self._layout)
+        if parsed is None:
+            parsed = self._fallback(value)
+
+        if len(self._memo) >= self.MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[value] = parsed
+        return parsed
+
+    @staticmethod
+    def _split_date(value: str, layout: tuple[str, int, int, int]) -> date | None:
+        separator, year_pos, month_pos, day_pos = layout
+        parts = value.split(separator)
+        if len(parts) != 3 or len(parts[year_pos]) != 4:
+            return None
+        try:
+            return date(int(parts[year_pos]), int(parts[month_pos]), int(parts[day_pos]))
+        except ValueError:
+            return None
+
+
 @dataclass
-class BillingRecord:
-    client_name: str
-    whatsapp_number: str
-    email: str | None
-    due_date: date
+class ChannelOutcome:
+    status: ReminderStatus
+    detail: str | None = None
 
 
 class BillingReminderService:
@@ -53,11 +145,24 @@ class BillingReminderService:
     EXCEL_EPOCH = datetime(1899, 12, 30)
 
     CLIENT_HEADERS = {"cliente", "client", "clientenome", "nome", "name"}
-    PHONE_HEADERS = {"telefone", "phone", "whatsapp", "numerowhatsapp", "numero"}
+    PHONE_HEADERS = {"telefone", "fone", "celular", "phone", "whatsapp", "numerowhatsapp", "numero"}
     EMAIL_HEADERS = {"email", "e-mail", "mail", "correio"}
     DUE_HEADERS = {"vencimento", "datavencimento", "data", "duedate"}
+    AMOUNT_HEADERS = {"valor", "valordocumento", "valorboleto", "amount"}
+    CONTRACT_HEADERS = {"contrato", "numerocontrato", "contract"}
+    INSTALLMENT_HEADERS = {"parcela", "numeroparcela", "installment"}
 
     DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%m/%d/%Y")
+    # Same order as DATE_FORMATS: separator and positions of year, month, day.
+    DATE_LAYOUTS = (
+        ("-", 0, 1, 2),
+        ("/", 2, 1, 0),
+        ("-", 2, 1, 0),
+        ("/", 2, 0, 1),
+    )
+    DATE_SAMPLE_SIZE = 50
+    SOURCE_SUFFIXES = {".xlsx", ".xml"}
+    SCHEDULE_CACHE_SIZE = 32
 
     def __init__(
         self,
@@ -66,6 +171,22 @@ class BillingReminderService:
         waha_client: WahaClient,
         email_client: EmailClient | None = None,
         email_enabled: bool = False,
+        fast_xlsx_reader: bool = True,
+        ingest_workers: int | None = None,
+        number_cache: WhatsAppNumberCache | None = None,
+        number_check_workers: int = 8,
+        coalesce: bool = True,
+        snapshot_cache: bool = True,
+        runtime_config: RuntimeConfig | None = None,
+        checkpoint_dir: str | None = None,
+        checkpoint_sync_every: int = 20,
+        send_rate_limiter: SendRateLimiter | None = None,
+        send_window: SendWindow | None = None,
+        critical_days: int = 1,
+        whatsapp_workers: int = 1,
+        email_workers: int = 1,
+        stage_queue_depth: int = 100,
+        delivery_events: DeliveryEventWriter | None = None,
     ) -> None:
         if not reminder_days:
             raise ValueError("reminder_days cannot be empty")
@@ -75,75 +196,159 @@ class BillingReminderService:
         self._waha_client = waha_client
         self._email_client = email_client
         self._email_enabled = email_enabled
+        self._fast_xlsx_reader = fast_xlsx_reader
+        self._ingest_workers = ingest_workers
+        self._number_cache = number_cache
+        self._number_check_workers = number_check_workers
+        self._coalesce = coalesce
+        self._snapshot_cache = snapshot_cache
+        self._runtime_config = runtime_config
+        self._checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self._checkpoint_sync_every = checkpoint_sync_every
+        self._send_rate_limiter = send_rate_limiter
+        self._send_window = send_window
+        self._critical_days = critical_days
+        self._whatsapp_workers = whatsapp_workers
+        self._email_workers = email_workers
+        self._stage_queue_depth = stage_queue_depth
+        self._delivery_events = delivery_events
+        self._schedules: OrderedDict[tuple, ReminderSchedule] = OrderedDict()
+        self._schedules_lock = Lock()
+
+    def close(self) -> None:
+        """Release the WAHA connection pool of this service."""
+        self._waha_client.close()
 
     def run(self, request: BillingReminderRequest) -> BillingReminderResponse:
         sheet_path = Path(request.sheet_path or self._default_sheet_path).expanduser()
         reference_date = request.reference_date or date.today()
 
-        records = self._load_records(sheet_path)
+        config = self._current_config()
+        checkpoint = None
+        resumed = False
+        if not request.dry_run and self._checkpoint_dir is not None:
+            checkpoint, config, resumed = self._open_checkpoint(
+                sheet_path, request, reference_date, config
+            )
+        try:
+            return self._run(sheet_path, request, reference_date, config, checkpoint, resumed)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+    def _run(
+        self,
+        sheet_path: Path,
+        request: BillingReminderRequest,
+        reference_date: date,
+        config: ReminderConfig,
+        checkpoint: RunCheckpoint | None,
+        resumed: bool,
+    ) -> BillingReminderResponse:
+        records = self._load_records(sheet_path, all_sheets=request.all_sheets)
         total_rows = len(records)
 
         results: List[ReminderDispatchResult] = []
-        eligible_rows = 0
         dispatched = 0
 
-        for record in sorted(records, key=lambda rec: rec.due_date):
-            days_until_due = (record.due_date - reference_date).days
-            if days_until_due not in self._reminder_days:
-                continue
-            if days_until_due < 0:
-                continue
+        eligible = records.due_in(reference_date, config.reminder_days)
+        eligible_rows = len(eligible)
 
-            eligible_rows += 1
-            message = self._build_message(record, days_until_due)
+        invalid_numbers: set[str] = set()
+        if config.whatsapp_enabled:
+            invalid_numbers = self._find_invalid_numbers(
+                [record.whatsapp_number for record, _ in eligible],
+                cache_only=request.dry_run,
+            )
 
-            # Send WhatsApp
-            whatsapp_status = ReminderStatus.SKIPPED
-            whatsapp_detail = None
-            if request.dry_run:
-                whatsapp_status = ReminderStatus.DRY_RUN
-                whatsapp_detail = "Dry-run: WhatsApp não enviado."
-            else:
-                try:
-                    api_result = self._waha_client.send_text_message(
-                        recipient=record.whatsapp_number,
-                        message=message,
-                        sender=request.sender_whatsapp_number,
-                    )
-                    whatsapp_status = ReminderStatus.SENT
-                    whatsapp_detail = api_result.get("message", "Mensagem registrada no WAHA.")
-                except WahaClientError as exc:
-                    whatsapp_status = ReminderStatus.FAILED
-                    whatsapp_detail = str(exc)
-
-            # Send Email
-            email_status = ReminderStatus.SKIPPED
-            email_detail = None
-            if self._email_enabled and self._email_client and record.email:
-                if request.dry_run:
-                    email_status = ReminderStatus.DRY_RUN
-                    email_detail = "Dry-run: Email não enviado."
-                else:
-                    try:
-                        html_content = get_billing_reminder_html(
-                            record.client_name, record.due_date, days_until_due
-                        )
-                        text_content = get_billing_reminder_text(
-                            record.client_name, record.due_date, days_until_due
-                        )
-                        email_result = self._email_client.send_email(
-                            to_email=record.email,
-                            subject=f"Lembrete de Boleto - Vence em {days_until_due} dia(s)",
-                            html_content=html_content,
-                            text_content=text_content,
-                        )
-                        email_status = ReminderStatus.SENT
-                        email_detail = email_result.get("message", "Email enviado com sucesso.")
-                    except EmailClientError as exc:
-                        email_status = ReminderStatus.FAILED
-                        email_detail = str(exc)
-            elif record.email is None:
-                email_detail = "Email não informado na planilha."
+        whatsapp_groups = self._group_titles(
+            eligible, key=lambda record: normalize_number(record.whatsapp_number)
+        )
+        email_groups = self._email_groups(eligible)
+        email_enabled = config.email_enabled and self._email_client is not None
+        tracker = None
+        if not request.dry_run:
+            tracker = DeadlineTracker(self._send_window)
+            if config.whatsapp_enabled:
+                tracker.add_channel(
+                    ReminderChannel.WHATSAPP.value,
+                    self._pending_critical(
+                        eligible,
+                        whatsapp_groups,
+                        ReminderChannel.WHATSAPP,
+                        checkpoint,
+                        skip=lambda record: normalize_number(record.whatsapp_number)
+                        in invalid_numbers,
+                    ),
+                    self._whatsapp_workers,
+                )
+            if email_enabled:
+                tracker.add_channel(
+                    ReminderChannel.EMAIL.value,
+                    self._pending_critical(
+                        eligible, email_groups, ReminderChannel.EMAIL, checkpoint
+                    ),
+                    self._email_workers,
+                )
+
+        # Each channel drains its own queue with its own workers, so a slow
+        # provider never holds up the other; results merge once both finish.
+        whatsapp_outcomes = [ChannelOutcome(ReminderStatus.SKIPPED)] * eligible_rows
+        messages = [""] * eligible_rows
+        email_outcomes = self._email_defaults(eligible)
+        stages = [
+            (
+                self._whatsapp_stage(
+                    eligible,
+                    whatsapp_groups,
+                    request,
+                    invalid_numbers,
+                    whatsapp_outcomes,
+                    messages,
+                    enabled=config.whatsapp_enabled,
+                    checkpoint=checkpoint,
+                    tracker=tracker,
+                ),
+                self._priority_order(eligible, whatsapp_groups),
+            )
+        ]
+        if email_enabled:
+            stages.append(
+                (
+                    self._email_stage(
+                        eligible,
+                        email_groups,
+                        request,
+                        email_outcomes,
+                        checkpoint=checkpoint,
+                        tracker=tracker,
+                    ),
+                    self._priority_order(eligible, email_groups),
+                )
+            )
+        run_stages(stages)
+        if checkpoint is None and not request.dry_run:
+            # Nothing would pick a deferred send up again without a checkpoint.
+            whatsapp_outcomes[:] = map(self._not_resumable, whatsapp_outcomes)
+            email_outcomes[:] = map(self._not_resumable, email_outcomes)
+        deferred = any(
+            outcome.status == ReminderStatus.DEFERRED
+            for outcome in (*whatsapp_outcomes, *email_outcomes)
+        )
+        if checkpoint is not None and not checkpoint.finished and not deferred:
+            # With deferred sends the run stays open so a resume can finish it.
+            checkpoint.finish()
+
+        deadline = DeadlineReport(
+            critical_days=self._critical_days,
+            send_window=str(self._send_window) if self._send_window else None,
+            yielded=tracker.yielded if tracker else 0,
+        )
+        for idx, (record, days_until_due) in enumerate(eligible):
+            whatsapp_status = whatsapp_outcomes[idx].status
+            whatsapp_detail = whatsapp_outcomes[idx].detail
+            email_status = email_outcomes[idx].status
+            email_detail = email_outcomes[idx].detail
 
             # Determine overall status (SENT if at least one succeeded)
             overall_status = whatsapp_status
@@ -162,6 +367,12 @@ class BillingReminderService:
 
             if overall_status in {ReminderStatus.SENT, ReminderStatus.DRY_RUN}:
                 dispatched += 1
+            if days_until_due <= self._critical_days:
+                deadline.critical_titles += 1
+                if overall_status in {ReminderStatus.SENT, ReminderStatus.DRY_RUN}:
+                    deadline.critical_dispatched += 1
+                elif overall_status in {ReminderStatus.DEFERRED, ReminderStatus.FAILED}:
+                    deadline.critical_pending += 1
 
             results.append(
                 ReminderDispatchResult(
@@ -170,67 +381,733 @@ class BillingReminderService:
                     due_date=record.due_date,
                     days_until_due=days_until_due,
                     status=overall_status,
-                    message_preview=message[:120],
+                    message_preview=messages[idx][:120],
                     detail=detail,
                 )
             )
 
+        deadline.at_risk = deadline.critical_pending > 0 or bool(tracker and tracker.at_risk)
         return BillingReminderResponse(
             sheet_path=str(sheet_path),
             reference_date=reference_date,
-            days_watched=self._reminder_days,
+            days_watched=list(config.reminder_days),
             dry_run=request.dry_run,
             total_rows=total_rows,
             eligible_rows=eligible_rows,
             dispatched=dispatched,
+            resumed=resumed,
+            deadline=deadline,
             results=results,
         )
 
-    def _load_records(self, sheet_path: Path) -> List[BillingRecord]:
-        if not sheet_path.exists():
+    def preload(
+        self,
+        sheet_path: str | Path,
+        all_sheets: bool = False,
+        rows: List[tuple] | None = None,
+    ) -> int:
+        """
+        Parse a source now (writing its snapshot) so runs that use it start
+        from the cache; return how many titles it has. ``rows`` are the rows
+        of a single-sheet source when they were already read.
+        """
+        if rows is not None:
+            return len(self._store_rows(rows, Path(sheet_path), None, self._snapshot_cache))
+        return len(self._load_records(Path(sheet_path), all_sheets=all_sheets))
+
+    def run_identity(self, request: BillingReminderRequest) -> tuple[str, bool]:
+        """What makes two requests the same run: sources, day, sender and dry_run."""
+        sheet_path = Path(request.sheet_path or self._default_sheet_path).expanduser()
+        key = run_key(
+            sheet_path,
+            request.all_sheets,
+            request.reference_date or date.today(),
+            request.sender_whatsapp_number,
+        )
+        return key, request.dry_run
+
+    def schedule(
+        self,
+        days: int,
+        start_date: date | None = None,
+        sheet_path: str | None = None,
+        all_sheets: bool = False,
+    ) -> ReminderSchedule:
+        """
+        Count the reminders each of the next ``days`` reference dates would send.
+
+        One pass over the titles due inside the window covers every date and
+        offset. Results are cached until a source file changes (size/mtime).
+        """
+        path = Path(sheet_path or self._default_sheet_path).expanduser()
+        start_date = start_date or date.today()
+        config = self._current_config()
+        fingerprint = self._source_fingerprint(path, all_sheets)
+        key = (str(path), all_sheets, start_date, days, fingerprint, config)
+        with self._schedules_lock:
+            cached = self._schedules.get(key)
+        if cached is not None:
+            return cached
+
+        records = self._load_records(path, all_sheets=all_sheets)
+        last_date = start_date + timedelta(days=days - 1)
+        offsets = [offset for offset in config.reminder_days if offset >= 0]
+        with_whatsapp = config.whatsapp_enabled
+        with_email = config.email_enabled and self._email_client is not None
+
+        # (reference date, channel) -> [titles, recipients, total amount]
+        buckets: dict[tuple[date, ReminderChannel], list] = {}
+
+        def add(when: date, channel: ReminderChannel, recipient: str, amount) -> None:
+            bucket = buckets.setdefault((when, channel), [0, set(), 0.0])
+            bucket[0] += 1
+            bucket[1].add(recipient)
+            bucket[2] += amount or 0.0
+
+        if offsets:
+            window = records.due_between(
+                start_date + timedelta(days=min(offsets)),
+                last_date + timedelta(days=max(offsets)),
+            )
+            for record in window:
+                for offset in offsets:
+                    when = record.due_date - timedelta(days=offset)
+                    if not start_date <= when <= last_date:
+                        continue
+                    if with_whatsapp:
+                        add(
+                            when,
+                            ReminderChannel.WHATSAPP,
+                            normalize_number(record.whatsapp_number),
+                            record.amount,
+                        )
+                    if with_email and record.email:
+                        add(when, ReminderChannel.EMAIL, record.email, record.amount)
+
+        schedule_days = []
+        for offset in range(days):
+            when = start_date + timedelta(days=offset)
+            channels = []
+            for channel in ReminderChannel:
+                bucket = buckets.get((when, channel))
+                if bucket is None:
+                    continue
+                titles, recipients, total = bucket
+                channels.append(
+                    ScheduleChannelSummary(
+                        channel=channel,
+                        titles=titles,
+                        messages=len(recipients) if self._coalesce else titles,
+                        total_amount=round(total, 2),
+                    )
+                )
+            schedule_days.append(ScheduleDay(reference_date=when, channels=channels))
+
+        result = ReminderSchedule(
+            sheet_path=str(path),
+            start_date=start_date,
+            days=days,
+            days_watched=list(config.reminder_days),
+            total_rows=len(records),
+            schedule=schedule_days,
+        )
+        with self._schedules_lock:
+            self._schedules[key] = result
+            while len(self._schedules) > self.SCHEDULE_CACHE_SIZE:
+                self._schedules.popitem(last=False)
+        return result
+
+    def _source_fingerprint(self, path: Path, all_sheets: bool) -> tuple:
+        """(source, sheet, size, mtime) of every file/sheet a run would read."""
+        return tuple(
+            (str(source), sheet_name, source.stat().st_size, source.stat().st_mtime_ns)
+            for source, sheet_name in self._expand_sources(path, all_sheets)
+        )
+
+    def _open_checkpoint(
+        self,
+        sheet_path: Path,
+        request: BillingReminderRequest,
+        reference_date: date,
+        config: ReminderConfig,
+    ) -> tuple[RunCheckpoint, ReminderConfig, bool]:
+        """
+        Start the checkpoint log of a run, or reopen it when resuming.
+
+        A resumed run reuses the settings recorded when it started, so the
+        eligible titles and their grouping are the same as before.
+        """
+        key = run_key(
+            sheet_path, request.all_sheets, reference_date, request.sender_whatsapp_number
+        )
+        checkpoint = RunCheckpoint(
+            self._checkpoint_dir / f"{key}.jsonl", self._checkpoint_sync_every
+        )
+        # Round-trip through JSON so it compares equal to a header read back.
+        header = json.loads(
+            json.dumps(
+                {
+                    "sources": self._source_fingerprint(sheet_path, request.all_sheets),
+                    "reference_date": reference_date.isoformat(),
+                    "reminder_days": config.reminder_days,
+                    "whatsapp_enabled": config.whatsapp_enabled,
+                    "email_enabled": config.email_enabled,
+                    "coalesce": self._coalesce,
+                }
+            )
+        )
+        if not (request.resume and checkpoint.load()):
+            checkpoint.start(header)
+            return checkpoint, config, False
+
+        recorded = checkpoint.header
+        if recorded.get("sources") != header["sources"]:
+            raise BillingSheetError(
+                "Arquivos de origem mudaram desde a execucao interrompida; "
+                "execute novamente sem resume."
+            )
+        if recorded.get("coalesce") != self._coalesce:
+            raise BillingReminderError(
+                "Agrupamento por cliente mudou desde a execucao interrompida; "
+                "execute novamente sem resume."
+            )
+        config = replace(
+            config,
+            reminder_days=tuple(recorded["reminder_days"]),
+            whatsapp_enabled=recorded["whatsapp_enabled"],
+            email_enabled=recorded["email_enabled"],
+        )
+        if not checkpoint.finished:
+            checkpoint.resume()
+        return checkpoint, config, True
+
+    @staticmethod
+    def _replayed(
+        checkpoint: RunCheckpoint | None, channel: ReminderChannel, group: int
+    ) -> ChannelOutcome | None:
+        if checkpoint is None:
+            return None
+        entry = checkpoint.get(channel.value, group)
+        if entry is None:
+            if checkpoint.finished:
+                # Nothing was sent to this group when the run completed.
+                return ChannelOutcome(
+                    ReminderStatus.SKIPPED, "Execução já concluída; nada a reenviar."
+                )
+            return None
+        return ChannelOutcome(ReminderStatus(entry[0]), entry[1])
+
+    @staticmethod
+    def _checkpoint(
+        checkpoint: RunCheckpoint | None,
+        channel: ReminderChannel,
+        group: int,
+        outcome: ChannelOutcome,
+    ) -> None:
+        # Only attempted sends matter; every other outcome is recomputed on resume.
+        if checkpoint is not None and outcome.status in {
+            ReminderStatus.SENT,
+            ReminderStatus.FAILED,
+        }:
+            checkpoint.record(channel.value, group, outcome.status.value, outcome.detail)
+
+    def _throttle(self) -> None:
+        if self._send_rate_limiter is not None:
+            self._send_rate_limiter.acquire()
+
+    def _current_config(self) -> ReminderConfig:
+        """Settings for one run: cached DB values, or the constructor defaults."""
+        if self._runtime_config is not None:
+            return self._runtime_config.current()
+        return ReminderConfig(
+            reminder_days=tuple(self._reminder_days),
+            email_enabled=self._email_enabled,
+        )
+
+    def _group_titles(
+        self, eligible: Sequence[tuple[BillingRecord, int]], key: Callable
+    ) -> List[List[int]]:
+        """Group eligible titles (by index) that go to the same recipient."""
+        if not self._coalesce:
+            return [[idx] for idx in range(len(eligible))]
+        groups: dict[Any, List[int]] = {}
+        for idx, (record, _) in enumerate(eligible):
+            groups.setdefault(key(record), []).append(idx)
+        return list(groups.values())
+
+    def _email_groups(self, eligible: Sequence[tuple[BillingRecord, int]]) -> List[List[int]]:
+        """Group the titles that have an email, as indexes into ``eligible``."""
+        with_email = [idx for idx, (record, _) in enumerate(eligible) if record.email]
+        groups = self._group_titles(
+            [eligible[idx] for idx in with_email], key=lambda record: record.email
+        )
+        return [[with_email[member] for member in group] for group in groups]
+
+    def _is_critical(
+        self, eligible: Sequence[tuple[BillingRecord, int]], group: Sequence[int]
+    ) -> bool:
+        return min(eligible[idx][1] for idx in group) <= self._critical_days
+
+    @staticmethod
+    def _priority_order(
+        eligible: Sequence[tuple[BillingRecord, int]], groups: Sequence[Sequence[int]]
+    ) -> List[int]:
+        """
+        Positions of ``groups`` in send order: most urgent first, then the
+        largest amount, then due-date order. Positions stay the checkpoint
+        keys, so a resume matches groups regardless of the order they went out.
+        """
+
+        def key(position: int) -> tuple:
+            group = groups[position]
+            amount = sum(eligible[idx][0].amount or 0.0 for idx in group)
+            return (min(eligible[idx][1] for idx in group), -amount, position)
+
+        return sorted(range(len(groups)), key=key)
+
+    def _pending_critical(
+        self,
+        eligible: Sequence[tuple[BillingRecord, int]],
+        groups: Sequence[Sequence[int]],
+        channel: ReminderChannel,
+        checkpoint: RunCheckpoint | None,
+        skip: Callable[[BillingRecord], bool] = lambda record: False,
+    ) -> int:
+        """Critical groups of ``channel`` this run will still try to send."""
+        return sum(
+            1
+            for position, group in enumerate(groups)
+            if self._is_critical(eligible, group)
+            and (checkpoint is None or checkpoint.get(channel.value, position) is None)
+            and not skip(eligible[group[0]][0])
+        )
+
+    @staticmethod
+    def _not_resumable(outcome: ChannelOutcome) -> ChannelOutcome:
+        if outcome.status != ReminderStatus.DEFERRED:
+            return outcome
+        return ChannelOutcome(
+            ReminderStatus.FAILED,
+            f"{outcome.detail}; nao enviado (sem API_REMINDER_CHECKPOINT_DIR para resume)",
+        )
+
+    @staticmethod
+    def _gated_send(
+        tracker: DeadlineTracker | None,
+        channel: ReminderChannel,
+        critical: bool,
+        send: Callable[[], ChannelOutcome],
+    ) -> ChannelOutcome:
+        """Send now, unless the window is closed or the time is kept for critical titles."""
+        if tracker is None:
+            return send()
+        reason = tracker.admit(channel.value, critical)
+        if reason is not None:
+            outcome = ChannelOutcome(ReminderStatus.DEFERRED, reason)
+        else:
+            started = time.perf_counter()
+            outcome = send()
+            if outcome.status in {ReminderStatus.SENT, ReminderStatus.FAILED}:
+                tracker.observe(channel.value, time.perf_counter() - started)
+        tracker.done(channel.value, critical)
+        return outcome
+
+    def _whatsapp_stage(
+        self,
+        eligible: Sequence[tuple[BillingRecord, int]],
+        groups: Sequence[Sequence[int]],
+        request: BillingReminderRequest,
+        invalid_numbers: set[str],
+        outcomes: List[ChannelOutcome],
+        messages: List[str],
+        enabled: bool = True,
+        checkpoint: RunCheckpoint | None = None,
+        tracker: DeadlineTracker | None = None,
+    ) -> ChannelStage[int]:
+        """Stage that sends one WhatsApp per group position, filling ``outcomes``."""
+
+        def dispatch(position: int) -> None:
+            group = groups[position]
+            titles = [eligible[idx] for idx in group]
+            record = titles[0][0]
+            if len(titles) == 1:
+                message = self._build_message(*titles[0])
+            else:
+                message = self._build_consolidated_message(titles)
+
+            replayed = self._replayed(checkpoint, ReminderChannel.WHATSAPP, position)
+            if replayed is not None:
+                outcome = replayed
+            elif not enabled:
+                outcome = ChannelOutcome(
+                    ReminderStatus.SKIPPED, "WhatsApp desabilitado na configuração."
+                )
+            elif normalize_number(record.whatsapp_number) in invalid_numbers:
+                outcome = ChannelOutcome(
+                    ReminderStatus.INVALID_NUMBER,
+                    "Número sem conta no WhatsApp; envio ignorado.",
+                )
+            elif request.dry_run:
+                outcome = ChannelOutcome(
+                    ReminderStatus.DRY_RUN, "Dry-run: WhatsApp não enviado."
+                )
+            else:
+                outcome = self._gated_send(
+                    tracker,
+                    ReminderChannel.WHATSAPP,
+                    self._is_critical(eligible, group),
+                    lambda: self._send_whatsapp(record, message, request),
+                )
+
+            if replayed is None:
+                if len(titles) > 1 and outcome.detail:
+                    outcome.detail += f" (mensagem única para {len(titles)} títulos)"
+                self._checkpoint(checkpoint, ReminderChannel.WHATSAPP, position, outcome)
+            for idx in group:
+                outcomes[idx] = outcome
+                messages[idx] = message
+
+        return ChannelStage(
+            "whatsapp", dispatch, self._whatsapp_workers, self._stage_queue_depth
+        )
+
+    def _send_whatsapp(
+        self, record: BillingRecord, message: str, request: BillingReminderRequest
+    ) -> ChannelOutcome:
+        try:
+            self._waha_client.ensure_available()
+            self._throttle()
+            api_result = self._waha_client.send_text_message(
+                recipient=record.whatsapp_number,
+                message=message,
+                sender=request.sender_whatsapp_number,
+            )
+        except CircuitOpenError as exc:
+            # Not checkpointed: a resumed run sends it once WAHA is back.
+            return ChannelOutcome(ReminderStatus.DEFERRED, str(exc))
+        except WahaClientError as exc:
+            return ChannelOutcome(ReminderStatus.FAILED, str(exc))
+        if self._delivery_events is not None:
+            # The row delivery acks from the webhook will update.
+            self._delivery_events.record_sent(record.whatsapp_number, api_result)
+        return ChannelOutcome(
+            ReminderStatus.SENT, api_result.get("message", "Mensagem registrada no WAHA.")
+        )
+
+    @staticmethod
+    def _email_defaults(eligible: Sequence[tuple[BillingRecord, int]]) -> List[ChannelOutcome]:
+        return [
+            ChannelOutcome(ReminderStatus.SKIPPED)
+            if record.email
+            else ChannelOutcome(ReminderStatus.SKIPPED, "Email não informado na planilha.")
+            for record, _ in eligible
+        ]
+
+    def _email_stage(
+        self,
+        eligible: Sequence[tuple[BillingRecord, int]],
+        groups: Sequence[Sequence[int]],
+        request: BillingReminderRequest,
+        outcomes: List[ChannelOutcome],
+        checkpoint: RunCheckpoint | None = None,
+        tracker: DeadlineTracker | None = None,
+    ) -> ChannelStage[int]:
+        """Stage that sends one email per group position, filling ``outcomes``."""
+
+        def dispatch(position: int) -> None:
+            indexes = groups[position]
+            titles = [eligible[idx] for idx in indexes]
+            outcome = self._replayed(checkpoint, ReminderChannel.EMAIL, position)
+            if outcome is None:
+                outcome = self._gated_send(
+                    tracker,
+                    ReminderChannel.EMAIL,
+                    self._is_critical(eligible, indexes),
+                    lambda: self._send_email(titles, request),
+                )
+                if len(titles) > 1 and outcome.detail:
+                    outcome.detail += f" (email único para {len(titles)} títulos)"
+                self._checkpoint(checkpoint, ReminderChannel.EMAIL, position, outcome)
+            for idx in indexes:
+                outcomes[idx] = outcome
+
+        return ChannelStage("email", dispatch, self._email_workers, self._stage_queue_depth)
+
+    def _send_email(
+        self, titles: Sequence[tuple[BillingRecord, int]], request: BillingReminderRequest
+    ) -> ChannelOutcome:
+        if request.dry_run:
+            return ChannelOutcome(ReminderStatus.DRY_RUN, "Dry-run: Email não enviado.")
+
+        record, days_until_due = titles[0]
+        if len(titles) == 1:
+            html_content = get_billing_reminder_html(
+                record.client_name, record.due_date, days_until_due
+            )
+            text_content = get_billing_reminder_text(
+                record.client_name, record.due_date, days_until_due
+            )
+            subject = f"Lembrete de Boleto - Vence em {days_until_due} dia(s)"
+        else:
+            summary = [
+                (title.due_date, days, title.amount, title.title_label)
+                for title, days in titles
+            ]
+            html_content = get_billing_summary_html(record.client_name, summary)
+            text_content = get_billing_summary_text(record.client_name, summary)
+            subject = f"Lembrete de Boletos - {len(titles)} títulos a vencer"
+
+        try:
+            self._email_client.ensure_available()
+            self._throttle()
+            email_result = self._email_client.send_email(
+                to_email=record.email,
+                subject=subject,
+                html_content=html_content,
+                text_content=text_content,
+            )
+        except CircuitOpenError as exc:
+            return ChannelOutcome(ReminderStatus.DEFERRED, str(exc))
+        except EmailClientError as exc:
+            return ChannelOutcome(ReminderStatus.FAILED, str(exc))
+        return ChannelOutcome(
+            ReminderStatus.SENT, email_result.get("message", "Email enviado com sucesso.")
+        )
+
+    def _find_invalid_numbers(
+        self, numbers: Sequence[str], cache_only: bool
+    ) -> set[str]:
+        if self._number_cache is None or not numbers:
+            return set()
+
+        known = self._number_cache.get_many(numbers)
+        unknown = {
+            normalize_number(number)
+            for number in numbers
+            if normalize_number(number) not in known
+        } - {""}
+        if unknown and not cache_only:
+            checked = self._waha_client.check_numbers_exist(
+                sorted(unknown),
+                max_workers=self._number_check_workers,
+            )
+            self._number_cache.set_many(checked)
+            known.update(checked)
+
+        return {number for number, exists in known.items() if not exists}
+
+    def _load_records(
+        self, sheet_path: Path, all_sheets: bool = False
+    ) -> BillingRecordStore:
+        tasks = [
+            (path, sheet_name, self._fast_xlsx_reader, self._snapshot_cache)
+            for path, sheet_name in self._expand_sources(sheet_path, all_sheets)
+        ]
+
+        if len(tasks) == 1:
+            # Already sorted (possibly mapped from a snapshot).
+            return self._load_sheet(*tasks[0])
+
+        batches: List[BillingRecordStore | None] = [None] * len(tasks)
+        if self._snapshot_cache:
+            # Current snapshots are mapped here; only changed sources need a worker.
+            for idx, (path, sheet_name, *_options) in enumerate(tasks):
+                batches[idx] = load_snapshot(path, sheet_name)
+        pending = [idx for idx, batch in enumerate(batches) if batch is None]
+
+        if pending:
+            # Only multi-file ingests need the process pool; import it on demand.
+            from concurrent.futures import ProcessPoolExecutor
+
+            workers = min(len(pending), self._ingest_workers or os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=self._process_context()
+            ) as executor:
+                loaded = executor.map(
+                    self._load_sheet, *zip(*(tasks[idx] for idx in pending))
+                )
+                for idx, batch in zip(pending, loaded):
+                    batches[idx] = batch
+
+        return self._merge_records(batches)
+
+    def _expand_sources(
+        self, sheet_path: Path, all_sheets: bool
+    ) -> List[tuple[Path, str | None]]:
+        pattern = str(sheet_path)
+        if sheet_path.is_dir():
+            files = sorted(
+                path
+                for path in sheet_path.iterdir()
+                if path.suffix.lower() in self.SOURCE_SUFFIXES
+                and not path.name.startswith(("~$", "."))
+            )
+        elif glob.has_magic(pattern):
+            files = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        elif sheet_path.exists():
+            files = [sheet_path]
+        else:
             raise BillingSheetError(f"Planilha nao encontrada em {sheet_path}")
 
+        if not files:
+            raise BillingSheetError(f"Nenhuma planilha encontrada em {sheet_path}")
+
+        if not all_sheets:
+            return [(path, None) for path in files]
+        return [(path, name) for path in files for name in self._sheet_names(path)]
+
+    def _sheet_names(self, path: Path) -> List[str | None]:
+        if path.suffix.lower() == ".xml":
+            return [None]  # ERP exports have a single record list
         try:
-            workbook = load_workbook(sheet_path, read_only=True, data_only=True)
-        except Exception as exc:  # pragma: no cover - openpyxl specific errors
-            raise BillingSheetError(f"Falha ao abrir {sheet_path}: {exc}") from exc
+            return list_sheets(path)
+        except XlsxReaderError:
+            pass
+        from openpyxl import load_workbook  # slow import, only for the fallback
 
         try:
-            sheet = workbook.active
-            rows = list(sheet.iter_rows(values_only=True))
+            workbook = load_workbook(path, read_only=True)
+        except Exception as exc:  # pragma: no cover - openpyxl specific errors
+            raise BillingSheetError(f"Falha ao abrir {path}: {exc}") from exc
+        try:
+            return list(workbook.sheetnames)
         finally:
             workbook.close()
 
+    @staticmethod
+    def _process_context():
+        import multiprocessing
+
+        # Forking a threaded gunicorn worker is unsafe; forkserver/spawn start
+        # clean interpreters instead.
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn"
+        )
+
+    @staticmethod
+    def _merge_records(batches: Iterable[BillingRecordStore]) -> BillingRecordStore:
+        # Only rows repeated across sources (files/tabs) are dropped: identical
+        # rows of one sheet are separate titles, each with its own reminder.
+        seen: set[tuple] = set()
+        merged = BillingRecordStore()
+        for batch in batches:
+            merged.extend_unique(batch, seen)
+        merged.sort_by_due_date()
+        return merged
+
+    @classmethod
+    def _load_sheet(
+        cls,
+        sheet_path: Path,
+        sheet_name: str | None = None,
+        fast_xlsx_reader: bool = True,
+        snapshot_cache: bool = False,
+    ) -> BillingRecordStore:
+        if snapshot_cache:
+            cached = load_snapshot(sheet_path, sheet_name)
+            if cached is not None:
+                return cached
+
+        rows = cls._read_rows(sheet_path, sheet_name, fast_xlsx_reader)
+        return cls._store_rows(rows, sheet_path, sheet_name, snapshot_cache)
+
+    @classmethod
+    def _store_rows(
+        cls,
+        rows: List[tuple],
+        sheet_path: Path,
+        sheet_name: str | None,
+        snapshot_cache: bool,
+    ) -> BillingRecordStore:
+        records = cls._merge_records([cls._build_store(rows)])
+        if snapshot_cache:
+            save_snapshot(records, sheet_path, sheet_name)
+        return records
+
+    @classmethod
+    def _build_store(cls, rows: List[tuple]) -> BillingRecordStore:
+        records = BillingRecordStore()
         if not rows:
-            return []
+            return records
 
         header = rows[0]
-        indexes = self._resolve_indexes(header)
+        indexes = cls._resolve_indexes(header)
+        data_rows = rows[1:]
+        parse_due = cls._build_due_date_parser(data_rows, indexes["due_date"])
 
-        records: List[BillingRecord] = []
-        for row in rows[1:]:
+        for row in data_rows:
             try:
-                record = self._build_record(row, indexes)
+                record = cls._build_record(row, indexes, parse_due)
             except BillingRowError:
                 continue
             records.append(record)
 
         return records
 
-    def _resolve_indexes(self, header_row: Iterable) -> dict[str, int]:
+    @classmethod
+    def _read_rows(
+        cls,
+        sheet_path: Path,
+        sheet_name: str | None = None,
+        fast_xlsx_reader: bool = True,
+    ) -> List[tuple]:
+        if sheet_path.suffix.lower() == ".xml":
+            try:
+                return read_export_rows(sheet_path)
+            except XmlExportError as exc:
+                raise BillingSheetError(str(exc)) from exc
+
+        if fast_xlsx_reader:
+            try:
+                return list(
+                    read_xlsx_rows(
+                        sheet_path,
+                        sheet=sheet_name,
+                        columns=lambda header: cls._resolve_indexes(header).values(),
+                    )
+                )
+            except XlsxReaderError:
+                pass  # Layout not covered by the streaming reader; openpyxl handles it.
+
+        from openpyxl import load_workbook  # slow import, only for the fallback
+
+        try:
+            workbook = load_workbook(sheet_path, read_only=True, data_only=True)
+        except Exception as exc:  # pragma: no cover - openpyxl specific errors
+            raise BillingSheetError(f"Falha ao abrir {sheet_path}: {exc}") from exc
+
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.active
+            return list(sheet.iter_rows(values_only=True))
+        except KeyError as exc:
+            raise BillingSheetError(
+                f"Aba {sheet_name!r} nao encontrada em {sheet_path}"
+            ) from exc
+        finally:
+            workbook.close()
+
+    @classmethod
+    def _resolve_indexes(cls, header_row: Iterable) -> dict[str, int]:
         indexes: dict[str, int] = {}
         for idx, raw_name in enumerate(header_row):
-            normalized = self._normalize_header(raw_name)
+            normalized = cls._normalize_header(raw_name)
             if not normalized:
                 continue
-            if normalized in self.CLIENT_HEADERS:
+            if normalized in cls.CLIENT_HEADERS:
                 indexes["client_name"] = idx
-            elif normalized in self.PHONE_HEADERS:
+            elif normalized in cls.PHONE_HEADERS:
                 indexes["whatsapp_number"] = idx
-            elif normalized in self.EMAIL_HEADERS:
+            elif normalized in cls.EMAIL_HEADERS:
                 indexes["email"] = idx
-            elif normalized in self.DUE_HEADERS:
+            elif normalized in cls.DUE_HEADERS:
                 indexes["due_date"] = idx
+            elif normalized in cls.AMOUNT_HEADERS:
+                indexes["amount"] = idx
+            elif normalized in cls.CONTRACT_HEADERS:
+                indexes["contract"] = idx
+            elif normalized in cls.INSTALLMENT_HEADERS:
+                indexes["installment"] = idx
 
         missing = {"client_name", "whatsapp_number", "due_date"} - indexes.keys()
         if missing:
@@ -240,7 +1117,27 @@ class BillingReminderService:
             )
         return indexes
 
-    def _build_record(self, row: Iterable, indexes: dict[str, int]) -> BillingRecord:
+    @classmethod
+    def _build_due_date_parser(
+        cls, rows: Sequence[Sequence[Any]], due_index: int
+    ) -> DueDateParser:
+        sample = []
+        for row in rows:
+            if due_index < len(row) and isinstance(row[due_index], str):
+                sample.append(row[due_index])
+                if len(sample) >= cls.DATE_SAMPLE_SIZE:
+                    break
+        return DueDateParser.from_sample(
+            sample, cls.DATE_LAYOUTS, fallback=cls._parse_due_date
+        )
+
+    @classmethod
+    def _build_record(
+        cls,
+        row: Iterable,
+        indexes: dict[str, int],
+        parse_due: Callable[[Any], date] | None = None,
+    ) -> BillingRecord:
         client_value = row[indexes["client_name"]]
         phone_value = row[indexes["whatsapp_number"]]
         due_value = row[indexes["due_date"]]
@@ -249,8 +1146,8 @@ class BillingReminderService:
             raise BillingRowError("Linha com valores obrigatorios vazios.")
 
         client_name = str(client_value).strip()
-        whatsapp_number = self._sanitize_phone(str(phone_value))
-        due_date = self._parse_due_date(due_value)
+        whatsapp_number = cls._sanitize_phone(str(phone_value))
+        due_date = (parse_due or cls._parse_due_date)(due_value)
 
         if not client_name or not whatsapp_number:
             raise BillingRowError("Linha com cliente ou telefone invalido.")
@@ -269,19 +1166,55 @@ class BillingReminderService:
             whatsapp_number=whatsapp_number,
             email=email,
             due_date=due_date,
+            amount=cls._parse_amount(cls._optional_cell(row, indexes, "amount")),
+            contract=cls._optional_text(cls._optional_cell(row, indexes, "contract")),
+            installment=cls._optional_text(
+                cls._optional_cell(row, indexes, "installment")
+            ),
         )
 
-    def _parse_due_date(self, value) -> date:
+    @staticmethod
+    def _optional_cell(row: Sequence, indexes: dict[str, int], field: str):
+        idx = indexes.get(field)
+        if idx is None or idx >= len(row):
+            return None
+        return row[idx]
+
+    @staticmethod
+    def _optional_text(value) -> str | None:
+        if value is None:
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip()
+        return text or None
+
+    @staticmethod
+    def _parse_amount(value) -> float | None:
+        if value is None or isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        cleaned = str(value).strip().replace("R$", "").replace(" ", "")
+        if "," in cleaned:
+            cleaned = cleaned.replace(".", "").replace(",", ".")
+        try:
+            return float(cleaned)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _parse_due_date(cls, value) -> date:
         if isinstance(value, datetime):
             return value.date()
         if isinstance(value, date):
             return value
         if isinstance(value, (int, float)):
-            excel_date = self.EXCEL_EPOCH + timedelta(days=float(value))
+            excel_date = cls.EXCEL_EPOCH + timedelta(days=float(value))
             return excel_date.date()
         if isinstance(value, str):
             cleaned = value.strip()
-            for fmt in self.DATE_FORMATS:
+            for fmt in cls.DATE_FORMATS:
                 try:
                     return datetime.strptime(cleaned, fmt).date()
                 except ValueError:
@@ -291,7 +1224,7 @@ class BillingReminderService:
             except ValueError:
                 pass
             else:
-                excel_date = self.EXCEL_EPOCH + timedelta(days=as_float)
+                excel_date = cls.EXCEL_EPOCH + timedelta(days=as_float)
                 return excel_date.date()
 
         raise BillingRowError(f"Nao foi possivel converter a data: {value!r}")
@@ -307,6 +1240,27 @@ class BillingReminderService:
             f"vencimento do seu boleto ({record.due_date:%d/%m/%Y})."
         )
 
+    def _build_consolidated_message(
+        self, titles: Sequence[tuple[BillingRecord, int]]
+    ) -> str:
+        record = titles[0][0]
+        lines = [
+            f"Ola {record.client_name}, voce tem {len(titles)} boletos "
+            "proximos do vencimento:"
+        ]
+        for title, days_until_due in titles:
+            when = "amanha" if days_until_due <= 1 else f"em {days_until_due} dias"
+            line = f"- {title.due_date:%d/%m/%Y} (vence {when})"
+            if title.amount is not None:
+                line += f" - {format_brl(title.amount)}"
+            if title.title_label:
+                line += f" - {title.title_label}"
+            lines.append(line)
+        amounts = [title.amount for title, _ in titles if title.amount is not None]
+        if amounts:
+            lines.append(f"Total: {format_brl(sum(amounts))}")
+        return "\n".join(lines)
+
     @staticmethod
     def _normalize_header(value) -> str:
         if value is None:
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, List
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_registry: Dict[str, "CircuitBreaker"] = {}
+_registry_lock = Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(
+            f"{name} indisponivel (circuito aberto); nova tentativa em {retry_after:.0f}s."
+        )
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker for one external provider.
+
+    The outcomes of the last ``window`` calls are kept; once at least
+    ``min_calls`` were seen and the share of failures reaches
+    ``failure_rate`` the circuit opens and calls fail immediately for
+    ``open_seconds``. After that a single probe call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+        with _registry_lock:
+            _registry[name] = self
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def check(self) -> None:
+        """Fail fast if a call would be rejected, without taking the probe."""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probing):
+                raise CircuitOpenError(self.name, self._retry_after())
+
+    def before_call(self) -> None:
+        """Admit a call or raise :class:`CircuitOpenError`."""
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probing):
+                raise CircuitOpenError(self.name, self._retry_after())
+            if state == HALF_OPEN:
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._close()
+            elif self._state == CLOSED:
+                self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open()
+            elif self._state == CLOSED:
+                self._outcomes.append(False)
+                calls = len(self._outcomes)
+                failures = calls - sum(self._outcomes)
+                if calls >= self._min_calls and failures / calls >= self._failure_rate:
+                    self._open()
+
+    def status(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            failures = calls - sum(self._outcomes)
+            return {
+                "name": self.name,
+                "state": state,
+                "calls": calls,
+                "failures": failures,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "retry_in_seconds": round(self._retry_after(), 1) if state == OPEN else None,
+            }
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._open_seconds - (time.monotonic() - self._opened_at))
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._probing = False
+
+
+def circuit_breakers() -> List[CircuitBreaker]:
+    """Every breaker created in this worker, by name."""
+    with _registry_lock:
+        return [_registry[name] for name in sorted(_registry)]
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from app.core.database import DatabaseNotInitializedError
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# WAHA ack codes -> historico_envios.status_entrega
+ACK_STATUS = {
+    -1: "erro",
+    0: "pendente",
+    1: "servidor",
+    2: "entregue",
+    3: "lido",
+    4: "reproduzido",
+}
+# Acks may arrive out of order; a status never moves back to an earlier one.
+STATUS_ORDER = ("erro", "pendente", "servidor", "entregue", "lido", "reproduzido")
+STATUS_RANK = {status: rank for rank, status in enumerate(STATUS_ORDER)}
+
+_STATUS_FIELD = ", ".join(f"'{status}'" for status in STATUS_ORDER)
+_INSERT_SENT = """
+INSERT IGNORE INTO historico_envios
+    (tipo_envio, destinatario, mensagem_id, status, data_envio)
+VALUES ('whatsapp', :destinatario, :mensagem_id, 'enviado', :data_envio)
+"""
+_KNOWN_IDS = "SELECT mensagem_id FROM historico_envios WHERE mensagem_id IN :ids"
+# FIELD(NULL, ...) is 0, so the first ack of a send always applies.
+_UPDATE_STATUS = f"""
+UPDATE historico_envios SET
+    data_status_entrega = IF(
+        FIELD(:status_entrega, {_STATUS_FIELD}) > FIELD(status_entrega, {_STATUS_FIELD}),
+        :data_evento, data_status_entrega),
+    status_entrega = IF(
+        FIELD(:status_entrega, {_STATUS_FIELD}) > FIELD(status_entrega, {_STATUS_FIELD}),
+        :status_entrega, status_entrega)
+WHERE mensagem_id = :mensagem_id
+"""
+
+_MESSAGE_EVENTS = {"message", "message.any"}
+
+
+@dataclass(slots=True)
+class DeliveryEvent:
+    message_id: str
+    status: str
+    recipient: str
+    occurred_at: datetime
+
+
+@dataclass(slots=True)
+class SentMessage:
+    message_id: str
+    recipient: str
+    sent_at: datetime
+
+
+def message_id_of(payload: Dict[str, Any]) -> Optional[str]:
+    """WAHA message id from a sendText response or a webhook payload."""
+    message_id = payload.get("id")
+    if isinstance(message_id, dict):  # some engines send {"_serialized": ...}
+        message_id = message_id.get("_serialized")
+    if not message_id and isinstance(payload.get("key"), dict):
+        message_id = payload["key"].get("id")
+    return str(message_id)[:128] if message_id else None
+
+
+def verify_signature(body: bytes, signature: str | None, key: str) -> bool:
+    """Check the ``X-Webhook-Hmac`` header WAHA sends when an HMAC key is set."""
+    if not signature:
+        return False
+    expected = hmac.new(key.encode("utf-8"), body, hashlib.sha512).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+def parse_waha_event(event: Dict[str, Any]) -> Optional[DeliveryEvent]:
+    """
+    Turn a WAHA ``message.ack`` or outgoing ``message``/``message.any`` event
+    into a delivery update; anything else (incoming messages, session
+    events) returns ``None``.
+    """
+    if not isinstance(event, dict):
+        return None
+    name = event.get("event")
+    payload = event.get("payload")
+    if not isinstance(payload, dict):
+        return None
+    if name in _MESSAGE_EVENTS and not payload.get("fromMe"):
+        return None
+    if name != "message.ack" and name not in _MESSAGE_EVENTS:
+        return None
+
+    message_id = message_id_of(payload)
+    status = ACK_STATUS.get(payload.get("ack", 1))
+    if not message_id or status is None:
+        return None
+
+    timestamp = payload.get("timestamp") or event.get("timestamp")
+    if isinstance(timestamp, (int, float)) and timestamp > 1e11:
+        timestamp /= 1000  # milliseconds
+    try:
+        occurred_at = datetime.fromtimestamp(timestamp) if timestamp else datetime.now()
+    except (TypeError, ValueError, OverflowError, OSError):
+        occurred_at = datetime.now()
+
+    recipient = str(payload.get("to") or "").split("@", 1)[0]
+    return DeliveryEvent(message_id, status, recipient[:255], occurred_at)
+
+
+class DeliveryEventWriter:
+    """
+    Buffer sent messages and delivery events in memory; write them in batches.
+
+    ``record_sent`` (called by the reminder job with the id WAHA returned)
+    and ``submit`` (webhook) only append to bounded deques, so neither waits
+    for the database. A daemon thread drains them every
+    ``flush_interval_seconds`` (or as soon as ``batch_size`` events are
+    waiting): sends are inserted into ``historico_envios`` first, then each
+    event updates the row of its message, keeping the most advanced status.
+    Events never create rows. One whose send is not there yet (e.g. written
+    by another worker's buffer) is retried for ``match_window_seconds``,
+    then dropped and counted as unmatched. When a buffer is full the oldest
+    entries are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 1000,
+        flush_interval_seconds: float = 0.5,
+        max_pending: int = 100_000,
+        match_window_seconds: float = 60.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_seconds
+        self._match_window = match_window_seconds
+        self._pending: Deque[DeliveryEvent] = deque(maxlen=max_pending)
+        self._sent: Deque[SentMessage] = deque(maxlen=max_pending)
+        # Events whose send row was missing, with when they were first tried.
+        self._unmatched: List[tuple[float, DeliveryEvent]] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.received = 0
+        self.written = 0
+        self.dropped = 0
+        self.unmatched = 0
+        self.failed_batches = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name="delivery-events", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is buffered and stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def submit(self, events: Iterable[DeliveryEvent]) -> int:
+        with self._lock:
+            before = len(self._pending)
+            count = 0
+            for event in events:
+                self._pending.append(event)
+                count += 1
+            overflow = before + count - len(self._pending)
+            self.received += count
+            self.dropped += overflow
+            size = len(self._pending)
+        if size >= self._batch_size:
+            self._wake.set()
+        return count
+
+    def record_sent(self, recipient: str, response: Dict[str, Any]) -> None:
+        """Queue the ``historico_envios`` row of a WhatsApp WAHA accepted."""
+        message_id = message_id_of(response)
+        if message_id is None:
+            return  # nothing an ack could be matched to
+        with self._lock:
+            before = len(self._sent)
+            self._sent.append(SentMessage(message_id, recipient[:255], datetime.now()))
+            self.dropped += before + 1 - len(self._sent)
+
+    def pending(self) -> int:
+        return len(self._pending) + len(self._sent) + len(self._unmatched)
+
+    def flush(self) -> int:
+        """Write everything buffered now; return how many entries were taken."""
+        taken = 0
+        retry, self._unmatched = self._unmatched, []
+        while True:
+            with self._lock:
+                sent = [self._sent.popleft() for _ in range(min(self._batch_size, len(self._sent)))]
+                count = min(self._batch_size, len(self._pending))
+                fresh = [self._pending.popleft() for _ in range(count)]
+            batch = [event for _, event in retry] + fresh
+            if not sent and not batch:
+                return taken
+            if not self._write(sent, batch, retry):
+                with self._lock:
+                    # Put the batches back in front; if new entries filled a
+                    # buffer meanwhile, the newest ones are dropped instead.
+                    before = len(self._pending) + len(self._sent)
+                    self._pending.extendleft(reversed(fresh))
+                    self._sent.extendleft(reversed(sent))
+                    after = len(self._pending) + len(self._sent)
+                    self.dropped += before + len(fresh) + len(sent) - after
+                self._unmatched = retry + self._unmatched
+                return taken
+            taken += len(sent) + len(fresh)
+            retry = []
+
+    def _loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            if self.flush() == 0 and (self._pending or self._sent):
+                # The database refused the batch; back off before retrying.
+                self._stopping.wait(min(5.0, self._flush_interval * 10))
+        self.flush()
+
+    def _write(
+        self,
+        sent: List[SentMessage],
+        batch: List[DeliveryEvent],
+        retry: List[tuple[float, DeliveryEvent]],
+    ) -> bool:
+        """Write one batch; ``batch`` starts with the events of ``retry``."""
+        from sqlalchemy import bindparam, text
+        from sqlalchemy.exc import SQLAlchemyError
+
+        first_tried = {id(event): tried for tried, event in retry}
+        latest: Dict[str, DeliveryEvent] = {}
+        for event in batch:
+            current = latest.get(event.message_id)
+            if current is None or STATUS_RANK[event.status] > STATUS_RANK[current.status]:
+                latest[event.message_id] = event
+        started = time.perf_counter()
+        try:
+            session = self._session_factory()
+        except DatabaseNotInitializedError as exc:
+            logger.warning("Eventos de entrega aguardando o banco: %s", exc)
+            self.failed_batches += 1
+            return False
+        try:
+            with session.begin():
+                if sent:
+                    session.execute(
+                        text(_INSERT_SENT),
+                        [
+                            {
+                                "mensagem_id": message.message_id,
+                                "destinatario": message.recipient,
+                                "data_envio": message.sent_at,
+                            }
+                            for message in sent
+                        ],
+                    )
+                known = set()
+                if latest:
+                    known = set(
+                        session.execute(
+                            text(_KNOWN_IDS).bindparams(bindparam("ids", expanding=True)),
+                            {"ids": list(latest)},
+                        ).scalars()
+                    )
+                rows = [
+                    {
+                        "mensagem_id": event.message_id,
+                        "status_entrega": event.status,
+                        "data_evento": event.occurred_at,
+                    }
+                    for message_id, event in latest.items()
+                    if message_id in known
+                ]
+                if rows:
+                    session.execute(text(_UPDATE_STATUS), rows)
+        except SQLAlchemyError as exc:
+            logger.warning(
+                "Falha ao gravar %d envios e %d eventos de entrega: %s",
+                len(sent),
+                len(latest),
+                exc,
+            )
+            self.failed_batches += 1
+            return False
+        finally:
+            session.close()
+
+        now = time.monotonic()
+        for message_id, event in latest.items():
+            if message_id in known:
+                continue
+            tried = first_tried.get(id(event), now)
+            if now - tried < self._match_window:
+                self._unmatched.append((tried, event))
+            else:
+                self.unmatched += 1
+        self.written += len(sent) + len(rows)
+        logger.debug(
+            "%d envios e %d eventos de entrega gravados em %.1f ms",
+            len(sent),
+            len(rows),
+            (time.perf_counter() - started) * 1000,
+        )
+        return True
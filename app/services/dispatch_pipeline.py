@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Callable, Generic, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class ChannelStage(Generic[T]):
+    """
+    One channel of a reminder run: a bounded queue drained by its own workers.
+
+    A feeder thread puts ``items`` into the queue in order (blocking while
+    it holds ``queue_depth`` items) and ``workers`` threads call ``handler``
+    on each one. Stages of different channels share nothing, so a slow
+    provider only backs up its own queue. The first exception raised by
+    ``handler`` stops the stage and is re-raised by :meth:`join`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[T], None],
+        workers: int = 1,
+        queue_depth: int = 100,
+    ) -> None:
+        self.name = name
+        self._handler = handler
+        self._workers = max(1, workers)
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, queue_depth))
+        self._threads: List[threading.Thread] = []
+        self._error: Optional[BaseException] = None
+        self._failed = threading.Event()
+
+    def start(self, items: Iterable[T]) -> None:
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{self.name}-{idx}", daemon=True)
+            for idx in range(self._workers)
+        ]
+        self._threads.append(
+            threading.Thread(
+                target=self._feed, args=(items,), name=f"{self.name}-feed", daemon=True
+            )
+        )
+        for thread in self._threads:
+            thread.start()
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _feed(self, items: Iterable[T]) -> None:
+        try:
+            for item in items:
+                if self._failed.is_set():
+                    break
+                self._queue.put(item)
+        finally:
+            for _ in range(self._workers):
+                self._queue.put(_DONE)
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if self._failed.is_set():
+                continue  # drain so the feeder never blocks
+            try:
+                self._handler(item)
+            except BaseException as exc:  # surfaced by join()
+                if self._error is None:
+                    self._error = exc
+                self._failed.set()
+
+
+def run_stages(stages: Sequence[tuple[ChannelStage, Iterable]]) -> None:
+    """Run channel stages side by side and wait until every one is done."""
+    for stage, items in stages:
+        stage.start(items)
+    errors: List[BaseException] = []
+    for stage, _ in stages:
+        try:
+            stage.join()
+        except BaseException as exc:
+            errors.append(exc)
+    if errors:
+        raise errors[0]
@@ -1,12 +1,9 @@
 from __future__ import annotations
 
-import smtplib
 from dataclasses import dataclass
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 from typing import Any, Dict, Optional
 
-import httpx
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 
 class EmailClientError(Exception):
@@ -15,6 +12,18 @@ class EmailClientError(Exception):
     pass
 
 
+class EmailProviderUnavailableError(EmailClientError):
+    """Raised when the provider could not be reached or failed (timeout, 5xx)."""
+
+    pass
+
+
+class EmailCircuitOpenError(EmailClientError, CircuitOpenError):
+    """Raised without contacting the provider while its circuit breaker is open."""
+
+    pass
+
+
 @dataclass
 class EmailClient:
     """Client for sending emails via SMTP or transactional API."""
@@ -35,6 +44,17 @@ class EmailClient:
     default_from_email: str = "noreply@example.com"
     default_from_name: Optional[str] = None
 
+    # One per tenant: each tenant copy gets its own "Email:<tenant_id>" breaker
+    breaker: Optional[CircuitBreaker] = None
+
+    def ensure_available(self) -> None:
+        """Raise :class:`EmailCircuitOpenError` if sends are being short-circuited."""
+        if self.breaker is not None:
+            try:
+                self.breaker.check()
+            except CircuitOpenError as exc:
+                raise EmailCircuitOpenError(exc.name, exc.retry_after) from None
+
     def send_email(
         self,
         to_email: str,
@@ -60,7 +80,39 @@ class EmailClient:
 
         Raises:
             EmailClientError: If sending fails
+            EmailCircuitOpenError: If the provider is failing and was not called
         """
+        breaker = self.breaker
+        if breaker is None:
+            return self._send(to_email, subject, html_content, text_content, from_email, from_name)
+
+        try:
+            breaker.before_call()
+        except CircuitOpenError as exc:
+            raise EmailCircuitOpenError(exc.name, exc.retry_after) from None
+        try:
+            result = self._send(
+                to_email, subject, html_content, text_content, from_email, from_name
+            )
+        except EmailProviderUnavailableError:
+            breaker.record_failure()
+            raise
+        except EmailClientError:
+            # Rejected recipient, 4xx or local configuration: the provider is up.
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+
+    def _send(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str],
+        from_email: Optional[str],
+        from_name: Optional[str],
+    ) -> Dict[str, Any]:
         if self.api_provider:
             return self._send_via_api(
                 to_email=to_email,
@@ -95,6 +147,11 @@ class EmailClient:
                 "SMTP não configurado. Defina API_EMAIL_SMTP_HOST ou use API_EMAIL_PROVIDER."
             )
 
+        # Imported here so API-only deployments never load the SMTP stack.
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
         try:
             # Create message
             msg = MIMEMultipart("alternative")
@@ -124,8 +181,12 @@ class EmailClient:
                 "message": "Email enviado com sucesso via SMTP.",
             }
 
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as exc:
+            raise EmailProviderUnavailableError(f"Servidor SMTP indisponivel: {exc}") from exc
         except smtplib.SMTPException as exc:
             raise EmailClientError(f"Erro SMTP: {exc}") from exc
+        except OSError as exc:  # connection refused, DNS failure, timeout
+            raise EmailProviderUnavailableError(f"Falha ao contatar SMTP: {exc}") from exc
         except Exception as exc:
             raise EmailClientError(f"Falha ao enviar email: {exc}") from exc
 
@@ -167,6 +228,8 @@ class EmailClient:
         from_name: Optional[str],
     ) -> Dict[str, Any]:
         """Send email via SendGrid API."""
+        import httpx  # slow import, only for the API providers
+
         url = "https://api.sendgrid.com/v3/mail/send"
         payload = {
             "personalizations": [{"to": [{"email": to_email}]}],
@@ -201,12 +264,18 @@ class EmailClient:
                 "message": "Email enviado com sucesso via SendGrid.",
             }
         except httpx.HTTPStatusError as exc:
-            raise EmailClientError(
+            # 4xx means the provider is up and rejected this email.
+            error = (
+                EmailProviderUnavailableError
+                if exc.response.status_code >= 500
+                else EmailClientError
+            )
+            raise error(
                 f"SendGrid respondeu com status {exc.response.status_code}: "
                 f"{exc.response.text}"
             ) from exc
-        except httpx.HTTPError as exc:
-            raise EmailClientError(f"Falha ao contatar SendGrid: {exc}") from exc
+        except httpx.HTTPError as exc:  # network issues, timeouts, etc.
+            raise EmailProviderUnavailableError(f"Falha ao contatar SendGrid: {exc}") from exc
 
     def _send_via_resend(
         self,
@@ -218,6 +287,8 @@ class EmailClient:
         from_name: Optional[str],
     ) -> Dict[str, Any]:
         """Send email via Resend API."""
+        import httpx  # slow import, only for the API providers
+
         url = "https://api.resend.com/emails"
         payload = {
             "from": f"{from_name or 'API Services'} <{from_email}>",
@@ -248,11 +319,17 @@ class EmailClient:
                 "message": f"Email enviado com sucesso via Resend (ID: {data.get('id', 'N/A')}).",
             }
         except httpx.HTTPStatusError as exc:
-            raise EmailClientError(
+            # 4xx means the provider is up and rejected this email.
+            error = (
+                EmailProviderUnavailableError
+                if exc.response.status_code >= 500
+                else EmailClientError
+            )
+            raise error(
                 f"Resend respondeu com status {exc.response.status_code}: "
                 f"{exc.response.text}"
             ) from exc
-        except httpx.HTTPError as exc:
-            raise EmailClientError(f"Falha ao contatar Resend: {exc}") from exc
+        except httpx.HTTPError as exc:  # network issues, timeouts, etc.
+            raise EmailProviderUnavailableError(f"Falha ao contatar Resend: {exc}") from exc
 
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Optional, Sequence
 
 
 def get_billing_reminder_html(
@@ -119,3 +120,143 @@ Este é um email automático, por favor não responda.
 """.strip()
 
 
+def format_brl(value: float) -> str:
+    """Format an amount as Brazilian currency (R$ 1.234,56)."""
+    formatted = f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+    return f"R$ {formatted}"
+
+
+def get_billing_summary_html(
+    client_name: str,
+    titles: Sequence[tuple[date, int, Optional[float], Optional[str]]],
+) -> str:
+    """
+    Generate HTML email listing several titles of the same client.
+
+    Args:
+        client_name: Client's name
+        titles: (due_date, days_until_due, amount, description) per title
+
+    Returns:
+        HTML content as string
+    """
+    most_urgent = min(days for _, days, _, _ in titles)
+    urgency_color = "#e74c3c" if most_urgent <= 1 else "#f39c12"
+    urgency_text = "URGENTE" if most_urgent <= 1 else "ATENÇÃO"
+    amounts = [amount for _, _, amount, _ in titles if amount is not None]
+
+    rows = "".join(
+        f"""
+                    <tr>
+                        <td style="padding: 8px 0; color: #333; font-size: 14px;">{description or '-'}</td>
+                        <td style="padding: 8px 0; color: {urgency_color if days <= 1 else '#333'}; font-size: 14px; font-weight: 600;">{due_date.strftime('%d/%m/%Y')}</td>
+                        <td style="padding: 8px 0; color: #333; font-size: 14px; text-align: right;">{format_brl(amount) if amount is not None else '-'}</td>
+                    </tr>"""
+        for due_date, days, amount, description in titles
+    )
+    total_row = (
+        f"""
+                    <tr>
+                        <td colspan="2" style="padding: 8px 0; color: #666; font-size: 14px; border-top: 1px solid #dee2e6;">Total:</td>
+                        <td style="padding: 8px 0; color: #333; font-size: 14px; font-weight: 600; text-align: right; border-top: 1px solid #dee2e6;">{format_brl(sum(amounts))}</td>
+                    </tr>"""
+        if amounts
+        else ""
+    )
+
+    return f"""
+<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Lembrete de Boletos</title>
+</head>
+<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f4f4f4; margin: 0; padding: 20px; line-height: 1.6;">
+    <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+        <!-- Header -->
+        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center;">
+            <h1 style="margin: 0; font-size: 24px; font-weight: 600;">Lembrete de Boletos</h1>
+        </div>
+
+        <!-- Content -->
+        <div style="padding: 30px;">
+            <p style="font-size: 16px; color: #333; margin-bottom: 20px;">
+                Olá <strong style="color: #667eea;">{client_name}</strong>,
+            </p>
+
+            <div style="background: #fff3cd; border-left: 4px solid {urgency_color}; padding: 15px; margin: 20px 0; border-radius: 4px;">
+                <p style="margin: 0; font-size: 14px; color: #856404; font-weight: 600; text-transform: uppercase; letter-spacing: 0.5px;">
+                    {urgency_text}
+                </p>
+            </div>
+
+            <p style="font-size: 16px; color: #666; line-height: 1.6; margin-bottom: 15px;">
+                Você possui <strong>{len(titles)} boletos</strong> próximos do vencimento:
+            </p>
+
+            <div style="background: #f8f9fa; padding: 20px; border-radius: 6px; margin: 20px 0;">
+                <table style="width: 100%; border-collapse: collapse;">
+                    <tr>
+                        <th style="padding: 8px 0; color: #666; font-size: 13px; text-align: left;">Título</th>
+                        <th style="padding: 8px 0; color: #666; font-size: 13px; text-align: left;">Vencimento</th>
+                        <th style="padding: 8px 0; color: #666; font-size: 13px; text-align: right;">Valor</th>
+                    </tr>{rows}{total_row}
+                </table>
+            </div>
+
+            <p style="font-size: 14px; color: #999; margin-top: 20px; margin-bottom: 0;">
+                Por favor, verifique seus boletos e efetue o pagamento antes do vencimento para evitar multas e juros.
+            </p>
+        </div>
+
+        <!-- Footer -->
+        <div style="background: #f8f9fa; padding: 20px; text-align: center; border-top: 1px solid #dee2e6;">
+            <p style="font-size: 12px; color: #999; margin: 0 0 10px 0;">
+                Este é um email automático, por favor não responda.
+            </p>
+            <p style="font-size: 11px; color: #bbb; margin: 0;">
+                © {date.today().year} - Todos os direitos reservados
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def get_billing_summary_text(
+    client_name: str,
+    titles: Sequence[tuple[date, int, Optional[float], Optional[str]]],
+) -> str:
+    """
+    Generate plain text email listing several titles of the same client.
+
+    Args:
+        client_name: Client's name
+        titles: (due_date, days_until_due, amount, description) per title
+
+    Returns:
+        Plain text content as string
+    """
+    lines = [
+        f"- {due_date.strftime('%d/%m/%Y')}"
+        + (f" | {description}" if description else "")
+        + (f" | {format_brl(amount)}" if amount is not None else "")
+        for due_date, _, amount, description in titles
+    ]
+    amounts = [amount for _, _, amount, _ in titles if amount is not None]
+    total = f"\nTotal: {format_brl(sum(amounts))}\n" if amounts else ""
+    listing = "\n".join(lines)
+
+    return f"""
+Olá {client_name},
+
+Você possui {len(titles)} boletos próximos do vencimento:
+
+{listing}
+{total}
+Por favor, verifique seus boletos e efetue o pagamento antes do vencimento para evitar multas e juros.
+
+Este é um email automático, por favor não responda.
+""".strip()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable
+
+
+def normalize_number(phone: str) -> str:
+    """Reduce a phone number to the digits WAHA uses as chat id."""
+    return "".join(ch for ch in phone if ch.isdigit())
+
+
+class WhatsAppNumberCache:
+    """Persistent cache of WAHA number-existence checks with expiration."""
+
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str, ttl_seconds: float) -> None:
+        self._path = Path(path).expanduser()
+        self._ttl_seconds = ttl_seconds
+        self._initialized = False
+
+    def warm_up(self) -> None:
+        """Create the database file and table ahead of the first lookup."""
+        with closing(self._connect()):
+            pass
+
+    def get_many(self, numbers: Iterable[str]) -> Dict[str, bool]:
+        """Return the cached, non-expired result for each known number."""
+        keys = sorted({normalize_number(number) for number in numbers} - {""})
+        if not keys:
+            return {}
+
+        oldest = time.time() - self._ttl_seconds
+        found: Dict[str, bool] = {}
+        with closing(self._connect()) as conn:
+            for start in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[start : start + self.QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT number, number_exists FROM whatsapp_numbers "
+                    f"WHERE checked_at >= ? AND number IN ({placeholders})",
+                    (oldest, *chunk),
+                )
+                for number, exists in rows:
+                    found[number] = bool(exists)
+        return found
+
+    def set_many(self, results: Dict[str, bool]) -> None:
+        """Store fresh check results, replacing older entries."""
+        if not results:
+            return
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO whatsapp_numbers "
+                "(number, number_exists, checked_at) VALUES (?, ?, ?)",
+                [
+                    (normalize_number(number), int(exists), now)
+                    for number, exists in results.items()
+                ],
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Both gunicorn workers share the file; sqlite serializes the writes.
+        conn = sqlite3.connect(self._path, timeout=5.0)
+        if not self._initialized:
+            with conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS whatsapp_numbers ("
+                    "number TEXT PRIMARY KEY, "
+                    "number_exists INTEGER NOT NULL, "
+                    "checked_at REAL NOT NULL)"
+                )
+            self._initialized = True
+        return conn
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import time
+from threading import Lock
+
+
+class SendRateLimiter:
+    """
+    Token bucket that paces outgoing sends to ``per_minute``.
+
+    ``acquire`` blocks the calling thread until a token is available, so a
+    tenant over its budget only slows down its own run.
+    """
+
+    def __init__(self, per_minute: float, burst: float = 1.0) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self._rate = per_minute / 60.0
+        self._capacity = max(1.0, burst)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
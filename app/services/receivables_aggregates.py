@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, timedelta
+from threading import Lock, Timer
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import DatabaseNotInitializedError
+
+from app.models.aggregates import (
+    AggregateBucket,
+    AggregateDimension,
+    AggregatesRefreshResult,
+    ReceivablesAggregates,
+    ReminderConversion,
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "versao_importacao"
+WATERMARK_KEY = "resumos_atualizados_em"
+# statusdoc "0-ABERTO" means the title is still open; anything else was settled.
+OPEN_STATUS_PATTERN = "0-%"
+
+# Summaries read the main tables plus the archive filled by the retention job
+# (receivables_archive.py), so archiving rows does not change the totals.
+_RECEIVABLES_INSERT = """
+INSERT INTO resumo_recebiveis
+    (datavencimento, uf, descmuni, descricaoformapagto, statusdoc, quantidade, valor_total)
+SELECT datavencimento, COALESCE(uf, ''), COALESCE(descmuni, ''),
+       COALESCE(descricaoformapagto, ''), COALESCE(statusdoc, ''),
+       COUNT(*), SUM(valordocumento)
+FROM (
+    SELECT datavencimento, uf, descmuni, descricaoformapagto, statusdoc, valordocumento
+    FROM contas_receber {where}
+    UNION ALL
+    SELECT datavencimento, uf, descmuni, descricaoformapagto, statusdoc, valordocumento
+    FROM contas_receber_arquivo {where}
+) AS c
+GROUP BY 1, 2, 3, 4, 5
+"""
+
+_CONVERSION_INSERT = """
+INSERT INTO resumo_conversao_lembretes (data_envio, tipo_envio, enviados, liquidados)
+SELECT DATE(h.data_envio), h.tipo_envio,
+       COUNT(DISTINCT h.conta_receber_id),
+       COUNT(DISTINCT CASE WHEN COALESCE(c.statusdoc, a.statusdoc) NOT LIKE :open_status
+                           THEN h.conta_receber_id END)
+FROM (
+    SELECT h.conta_receber_id, h.tipo_envio, h.data_envio
+    FROM historico_envios h
+    WHERE h.status = 'enviado' AND h.data_envio IS NOT NULL {where}
+    UNION ALL
+    SELECT h.conta_receber_id, h.tipo_envio, h.data_envio
+    FROM historico_envios_arquivo h
+    WHERE h.status = 'enviado' AND h.data_envio IS NOT NULL {where}
+) AS h
+LEFT JOIN contas_receber c ON c.id = h.conta_receber_id
+LEFT JOIN contas_receber_arquivo a ON a.id = h.conta_receber_id
+WHERE c.id IS NOT NULL OR a.id IS NOT NULL
+GROUP BY 1, 2
+"""
+
+
+class ReceivablesAggregator:
+    """Maintain the dashboard summary tables incrementally."""
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def refresh(self, full: bool = False) -> AggregatesRefreshResult:
+        """
+        Recompute the summaries touched since the last refresh.
+
+        Triggers (``06_resumos_dias_pendentes.sql``) mark the old and new due
+        day of every title inserted, changed or deleted, and the send days
+        affected by sends and settlements; only those days are rebuilt and
+        their marks cleared. The first refresh (no watermark yet) rebuilds
+        everything. The import version is bumped so every worker drops its
+        cached responses.
+        """
+        session = self._session
+        with session.begin():
+            # Refreshes run one at a time: a second one waits on this row
+            # instead of inserting the same summary keys concurrently.
+            session.execute(
+                text("SELECT valor FROM configuracao_sistema WHERE chave = :key FOR UPDATE"),
+                {"key": VERSION_KEY},
+            )
+            # Locking read before any snapshot read: waits for writers still
+            # marking days, so the rebuild below sees their rows.
+            pending = session.execute(
+                text("SELECT tipo, dia FROM resumos_dias_pendentes FOR UPDATE")
+            ).all()
+            started = session.execute(text("SELECT NOW()")).scalar_one()
+            watermark = None if full else self._read_config(WATERMARK_KEY)
+            full = full or watermark is None
+
+            if full:
+                session.execute(text("DELETE FROM resumo_recebiveis"))
+                session.execute(text(_RECEIVABLES_INSERT.format(where="")))
+                session.execute(text("DELETE FROM resumo_conversao_lembretes"))
+                session.execute(
+                    text(_CONVERSION_INSERT.format(where="")),
+                    {"open_status": OPEN_STATUS_PATTERN},
+                )
+                due_days = session.execute(
+                    text("SELECT COUNT(DISTINCT datavencimento) FROM resumo_recebiveis")
+                ).scalar_one()
+                send_days = session.execute(
+                    text("SELECT COUNT(DISTINCT data_envio) FROM resumo_conversao_lembretes")
+                ).scalar_one()
+            else:
+                due_days = self._refresh_due_days(
+                    [day for kind, day in pending if kind == "vencimento"]
+                )
+                send_days = self._refresh_send_days(
+                    [day for kind, day in pending if kind == "envio"]
+                )
+            self._clear_pending(pending)
+
+            version = int(self._read_config(VERSION_KEY) or 0) + 1
+            self._write_config(VERSION_KEY, str(version))
+            self._write_config(WATERMARK_KEY, str(started))
+
+        return AggregatesRefreshResult(
+            version=version,
+            due_days_refreshed=due_days,
+            send_days_refreshed=send_days,
+            full=full,
+        )
+
+    def _refresh_due_days(self, days: List[date]) -> int:
+        if not days:
+            return 0
+        in_days = bindparam("days", expanding=True)
+        self._session.execute(
+            text("DELETE FROM resumo_recebiveis WHERE datavencimento IN :days").bindparams(
+                in_days
+            ),
+            {"days": days},
+        )
+        self._session.execute(
+            text(
+                _RECEIVABLES_INSERT.format(where="WHERE datavencimento IN :days")
+            ).bindparams(in_days),
+            {"days": days},
+        )
+        return len(days)
+
+    def _refresh_send_days(self, days: List[date]) -> int:
+        if not days:
+            return 0
+        in_days = bindparam("days", expanding=True)
+        self._session.execute(
+            text("DELETE FROM resumo_conversao_lembretes WHERE data_envio IN :days").bindparams(
+                in_days
+            ),
+            {"days": days},
+        )
+        # The range keeps idx_data_envio usable; the IN list drops untouched days.
+        self._session.execute(
+            text(
+                _CONVERSION_INSERT.format(
+                    where=(
+                        "AND h.data_envio >= :first_day AND h.data_envio < :after_last "
+                        "AND DATE(h.data_envio) IN :days"
+                    )
+                )
+            ).bindparams(in_days),
+            {
+                "days": days,
+                "first_day": min(days),
+                "after_last": max(days) + timedelta(days=1),
+                "open_status": OPEN_STATUS_PATTERN,
+            },
+        )
+        return len(days)
+
+    def _clear_pending(self, pending: Sequence[Any]) -> None:
+        """Remove the marks just rebuilt (locked above, so none was re-marked since)."""
+        if pending:
+            self._session.execute(
+                text("DELETE FROM resumos_dias_pendentes WHERE tipo = :tipo AND dia = :dia"),
+                [{"tipo": kind, "dia": day} for kind, day in pending],
+            )
+
+    def _read_config(self, key: str) -> Optional[str]:
+        return self._session.execute(
+            text("SELECT valor FROM configuracao_sistema WHERE chave = :key"),
+            {"key": key},
+        ).scalar_one_or_none()
+
+    def _write_config(self, key: str, value: str) -> None:
+        self._session.execute(
+            text(
+                "INSERT INTO configuracao_sistema (chave, valor) VALUES (:key, :value) "
+                "ON DUPLICATE KEY UPDATE valor = VALUES(valor)"
+            ),
+            {"key": key, "value": value},
+        )
+
+
+def read_import_version(session: Session) -> int:
+    """Return the summaries version (a primary-key lookup)."""
+    value = session.execute(
+        text("SELECT valor FROM configuracao_sistema WHERE chave = :key"),
+        {"key": VERSION_KEY},
+    ).scalar_one_or_none()
+    return int(value or 0)
+
+
+def load_aggregates(
+    session: Session,
+    version: int,
+    group_by: AggregateDimension,
+    due_from: Optional[date],
+    due_to: Optional[date],
+) -> ReceivablesAggregates:
+    """Read totals and reminder conversion from the summary tables."""
+    clauses: List[str] = []
+    params: Dict[str, Any] = {}
+    if due_from is not None:
+        clauses.append("{column} >= :due_from")
+        params["due_from"] = due_from
+    if due_to is not None:
+        clauses.append("{column} <= :due_to")
+        params["due_to"] = due_to
+
+    def where(column: str) -> str:
+        if not clauses:
+            return ""
+        return "WHERE " + " AND ".join(clause.format(column=column) for clause in clauses)
+
+    dimension = group_by.value
+    bucket_rows = session.execute(
+        text(
+            f"SELECT {dimension} AS bucket, SUM(quantidade), SUM(valor_total) "
+            f"FROM resumo_recebiveis {where('datavencimento')} "
+            "GROUP BY bucket ORDER BY bucket"
+        ),
+        params,
+    ).all()
+    conversion_rows = session.execute(
+        text(
+            "SELECT tipo_envio, SUM(enviados), SUM(liquidados) "
+            f"FROM resumo_conversao_lembretes {where('data_envio')} "
+            "GROUP BY tipo_envio ORDER BY tipo_envio"
+        ),
+        params,
+    ).all()
+
+    return ReceivablesAggregates(
+        version=version,
+        group_by=group_by,
+        due_from=due_from,
+        due_to=due_to,
+        buckets=[
+            AggregateBucket(key=str(key), quantidade=int(count), valor_total=total)
+            for key, count, total in bucket_rows
+        ],
+        conversion=[
+            ReminderConversion(
+                tipo_envio=channel,
+                enviados=int(sent),
+                liquidados=int(settled),
+                taxa_conversao=round(int(settled) / int(sent), 4) if sent else 0.0,
+            )
+            for channel, sent, settled in conversion_rows
+        ],
+    )
+
+
+class AggregatesCache:
+    """In-process cache of aggregate responses keyed by the import version."""
+
+    def __init__(self, version_check_seconds: float = 5.0) -> None:
+        self._version_check_seconds = version_check_seconds
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._entries: Dict[Hashable, ReceivablesAggregates] = {}
+        self._lock = Lock()
+
+    def get(
+        self,
+        session: Session,
+        key: Sequence[Hashable],
+        loader: Callable[[int], ReceivablesAggregates],
+    ) -> ReceivablesAggregates:
+        """Serve ``key`` from memory unless the import version moved."""
+        now = time.monotonic()
+        with self._lock:
+            stale = now - self._checked_at >= self._version_check_seconds
+        if stale or self._version is None:
+            version = read_import_version(session)
+            with self._lock:
+                if version != self._version:
+                    self._entries.clear()
+                    self._version = version
+                self._checked_at = now
+
+        cache_key = tuple(key)
+        with self._lock:
+            cached = self._entries.get(cache_key)
+            version = self._version
+        if cached is not None:
+            return cached
+
+        fresh = loader(version)
+        with self._lock:
+            if version == self._version:
+                self._entries[cache_key] = fresh
+        return fresh
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+class AggregatesRefresher:
+    """
+    Refresh the summaries in the background after runs and uploads.
+
+    ``request`` returns at once; the refresh runs ``delay_seconds`` later in
+    a timer thread, and requests made while one is scheduled are folded
+    into it. The delay also gives the delivery-event writer time to store
+    the sends of a run. A failed refresh is only logged: its days stay
+    marked and the next refresh rebuilds them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        cache: AggregatesCache,
+        delay_seconds: float = 5.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._cache = cache
+        self._delay = delay_seconds
+        self._timer: Timer | None = None
+        self._lock = Lock()
+
+    def request(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = Timer(self._delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def close(self) -> None:
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _run(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            session = self._session_factory()
+        except DatabaseNotInitializedError:
+            return
+        try:
+            result = ReceivablesAggregator(session).refresh()
+        except SQLAlchemyError as exc:
+            logger.warning("Falha ao atualizar os resumos: %s", exc)
+            return
+        finally:
+            session.close()
+        self._cache.invalidate()
+        logger.info(
+            "Resumos atualizados (versao %d): %d dia(s) de vencimento, %d de envio",
+            result.version,
+            result.due_days_refreshed,
+            result.send_days_refreshed,
+        )
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from threading import Lock, Timer
+from typing import Callable, List, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.database import DatabaseNotInitializedError
+from app.models.receivable import ArchiveRunResult
+from app.services.receivables_aggregates import OPEN_STATUS_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# Copied by name, so the archive tables may differ in column order (e.g.
+# after an ALTER ... AFTER on one side only). Keep in sync with
+# mysql/init/01_init_schema.sql and 05_status_entrega.sql.
+TITLE_COLUMNS = (
+    "id", "tipopessoa", "codcliente", "cpf", "nome", "fksiglalogra", "logradouro",
+    "numero", "bairro", "cep", "descmuni", "uf", "codoper", "descoper", "nfserie",
+    "nfnum", "valtotalnf", "numerocontrato", "nossonumero", "numeroparcela",
+    "datacontrato", "datavencimento", "valordocumento", "codigoformapagto",
+    "descricaoformapagto", "vendcod", "nomevend", "codmov", "statusdoc", "rg",
+    "datanascimento", "fone", "email", "email_enviado", "whatsapp_enviado",
+    "data_envio_email", "data_envio_whatsapp", "created_at", "updated_at",
+)
+HISTORY_COLUMNS = (
+    "id", "conta_receber_id", "tipo_envio", "destinatario", "mensagem_id", "status",
+    "status_entrega", "data_status_entrega", "mensagem_erro", "data_envio", "created_at",
+)
+
+# Rows locked by a concurrent run are skipped, so two runs split the work.
+_SETTLED_BATCH = """
+SELECT id FROM contas_receber
+WHERE datavencimento < :before AND statusdoc NOT LIKE :open_status
+ORDER BY datavencimento, id
+LIMIT :limit
+FOR UPDATE SKIP LOCKED
+"""
+
+# Age is the send date (idx_data_envio); rows without one fall back to created_at.
+_HISTORY_BATCH = """
+SELECT id FROM historico_envios
+WHERE data_envio < :before OR (data_envio IS NULL AND created_at < :before)
+ORDER BY data_envio, id
+LIMIT :limit
+FOR UPDATE SKIP LOCKED
+"""
+
+
+class ReceivablesArchiver:
+    """
+    Move settled titles and old send history to the archive tables.
+
+    Each batch of at most ``batch_size`` rows is copied and deleted in its own
+    short transaction, so the job never holds locks on more than one batch.
+    A title's history moves together with the title. The summary tables are
+    rebuilt from both the main and the archive tables, so archiving does not
+    change the dashboards.
+    """
+
+    def __init__(self, session: Session, batch_size: int = 1000, max_batches: int = 100) -> None:
+        self._session = session
+        self._batch_size = batch_size
+        self._max_batches = max_batches
+
+    def run_retention(
+        self, settled_after_days: int, history_after_days: int, dry_run: bool = False
+    ) -> ArchiveRunResult:
+        """Archive what is older than the retention periods, counted from today."""
+        today = date.today()
+        return self.run(
+            settled_before=today - timedelta(days=settled_after_days),
+            history_before=today - timedelta(days=history_after_days),
+            dry_run=dry_run,
+        )
+
+    def run(self, settled_before: date, history_before: date, dry_run: bool = False) -> ArchiveRunResult:
+        """Archive titles settled and due before ``settled_before`` and older history."""
+        if dry_run:
+            return self._count(settled_before, history_before)
+
+        titles = history = batches = 0
+        complete = False
+        while batches < self._max_batches:
+            batch_titles, batch_history = self._archive_settled_batch(settled_before)
+            titles += batch_titles
+            history += batch_history
+            batches += 1
+            if batch_titles < self._batch_size:
+                complete = True
+                break
+
+        if complete:
+            complete = False
+            while batches < self._max_batches:
+                batch_history = self._archive_history_batch(history_before)
+                history += batch_history
+                batches += 1
+                if batch_history < self._batch_size:
+                    complete = True
+                    break
+
+        return ArchiveRunResult(
+            settled_before=settled_before,
+            history_before=history_before,
+            dry_run=False,
+            titles_archived=titles,
+            history_archived=history,
+            batches=batches,
+            complete=complete,
+        )
+
+    def _archive_settled_batch(self, before: date) -> tuple[int, int]:
+        session = self._session
+        with session.begin():
+            ids = self._select_ids(
+                _SETTLED_BATCH, {"before": before, "open_status": OPEN_STATUS_PATTERN}
+            )
+            if not ids:
+                return 0, 0
+            history = self._move(
+                "historico_envios",
+                "historico_envios_arquivo",
+                HISTORY_COLUMNS,
+                "conta_receber_id",
+                ids,
+            )
+            titles = self._move(
+                "contas_receber", "contas_receber_arquivo", TITLE_COLUMNS, "id", ids
+            )
+        return titles, history
+
+    def _archive_history_batch(self, before: date) -> int:
+        session = self._session
+        with session.begin():
+            ids = self._select_ids(_HISTORY_BATCH, {"before": before})
+            if not ids:
+                return 0
+            return self._move(
+                "historico_envios", "historico_envios_arquivo", HISTORY_COLUMNS, "id", ids
+            )
+
+    def _select_ids(self, query: str, params: dict) -> List[int]:
+        return list(
+            self._session.execute(
+                text(query), {**params, "limit": self._batch_size}
+            ).scalars()
+        )
+
+    def _move(
+        self, table: str, archive: str, columns: Sequence[str], column: str, ids: List[int]
+    ) -> int:
+        in_ids = bindparam("ids", expanding=True)
+        names = ", ".join(columns)
+        self._session.execute(
+            text(
+                f"INSERT INTO {archive} ({names}) SELECT {names} FROM {table} "
+                f"WHERE {column} IN :ids"
+            ).bindparams(in_ids),
+            {"ids": ids},
+        )
+        return self._session.execute(
+            text(f"DELETE FROM {table} WHERE {column} IN :ids").bindparams(in_ids),
+            {"ids": ids},
+        ).rowcount
+
+    def _count(self, settled_before: date, history_before: date) -> ArchiveRunResult:
+        session = self._session
+        with session.begin():
+            titles = session.execute(
+                text(
+                    "SELECT COUNT(*) FROM contas_receber "
+                    "WHERE datavencimento < :before AND statusdoc NOT LIKE :open_status"
+                ),
+                {"before": settled_before, "open_status": OPEN_STATUS_PATTERN},
+            ).scalar_one()
+            history = session.execute(
+                text(
+                    "SELECT COUNT(*) FROM historico_envios h "
+                    "LEFT JOIN contas_receber c ON c.id = h.conta_receber_id "
+                    "AND c.datavencimento < :settled_before "
+                    "AND c.statusdoc NOT LIKE :open_status "
+                    "WHERE h.data_envio < :history_before "
+                    "OR (h.data_envio IS NULL AND h.created_at < :history_before) "
+                    "OR c.id IS NOT NULL"
+                ),
+                {
+                    "settled_before": settled_before,
+                    "history_before": history_before,
+                    "open_status": OPEN_STATUS_PATTERN,
+                },
+            ).scalar_one()
+        return ArchiveRunResult(
+            settled_before=settled_before,
+            history_before=history_before,
+            dry_run=True,
+            titles_archived=int(titles),
+            history_archived=int(history),
+            batches=0,
+            complete=True,
+        )
+
+
+class ArchiveScheduler:
+    """
+    Run the retention job every ``interval_seconds`` in a timer thread.
+
+    Every worker schedules its own runs; since batches skip rows locked by
+    another run, overlapping runs split the work and later ones find little
+    left. A failed run is only logged and retried at the next interval.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float,
+        settled_after_days: int,
+        history_after_days: int,
+        batch_size: int = 1000,
+        max_batches: int = 100,
+    ) -> None:
+        self._session_factory = session_factory
+        self._interval = interval_seconds
+        self._settled_after_days = settled_after_days
+        self._history_after_days = history_after_days
+        self._batch_size = batch_size
+        self._max_batches = max_batches
+        self._timer: Timer | None = None
+        self._closed = False
+        self._lock = Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            self._closed = False
+        self._schedule()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._timer = Timer(self._interval, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self) -> None:
+        try:
+            self._archive()
+        finally:
+            self._schedule()
+
+    def _archive(self) -> None:
+        try:
+            session = self._session_factory()
+        except DatabaseNotInitializedError:
+            return
+        try:
+            result = ReceivablesArchiver(
+                session, batch_size=self._batch_size, max_batches=self._max_batches
+            ).run_retention(self._settled_after_days, self._history_after_days)
+        except SQLAlchemyError as exc:
+            logger.warning("Falha no job de retencao: %s", exc)
+            return
+        finally:
+            session.close()
+        logger.info(
+            "Retencao: %d titulo(s) e %d envio(s) arquivados em %d lote(s)%s",
+            result.titles_archived,
+            result.history_archived,
+            result.batches,
+            "" if result.complete else "; o restante fica para a proxima execucao",
+        )
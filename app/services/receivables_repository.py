@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import Date, Numeric, text
+from sqlalchemy.orm import Session
+
+
+class ReceivablesQueryError(Exception):
+    """Raised when filters or cursor cannot be served efficiently."""
+
+    pass
+
+
+@dataclass
+class ReceivableFilters:
+    due_from: Optional[date] = None
+    due_to: Optional[date] = None
+    statusdoc: Optional[str] = None
+    codcliente: Optional[int] = None
+    cpf: Optional[str] = None
+    uf: Optional[str] = None
+
+
+class ReceivablesRepository:
+    """Keyset-paginated reads over contas_receber ordered by (datavencimento, id)."""
+
+    COLUMNS = (
+        "id",
+        "codcliente",
+        "cpf",
+        "nome",
+        "uf",
+        "descmuni",
+        "numerocontrato",
+        "numeroparcela",
+        "nossonumero",
+        "datavencimento",
+        "valordocumento",
+        "descricaoformapagto",
+        "statusdoc",
+        "fone",
+        "email",
+    )
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    @staticmethod
+    def validate_filters(filters: ReceivableFilters) -> None:
+        """
+        Reject combinations that no index of contas_receber can serve.
+
+        Every query walks (datavencimento, id): idx_datavencimento and
+        idx_datavencimento_status cover the due range and statusdoc, while
+        codcliente and cpf narrow the scan through idx_codcliente / idx_cpf.
+        uf has no index, so it is only accepted together with one of those
+        selective filters or a closed due-date range.
+        """
+        if filters.due_from and filters.due_to and filters.due_from > filters.due_to:
+            raise ReceivablesQueryError("due_from deve ser anterior ou igual a due_to.")
+        if filters.uf is None:
+            return
+        selective = filters.codcliente is not None or filters.cpf is not None
+        bounded = filters.due_from is not None and filters.due_to is not None
+        if not (selective or bounded):
+            raise ReceivablesQueryError(
+                "Filtro por uf exige codcliente, cpf ou intervalo completo "
+                "de vencimento (due_from e due_to)."
+            )
+
+    @staticmethod
+    def encode_cursor(due_date: date, row_id: int) -> str:
+        raw = f"{due_date.isoformat()}|{row_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[date, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            due_text, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+            return date.fromisoformat(due_text), int(row_id)
+        except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+            raise ReceivablesQueryError("Cursor invalido.") from exc
+
+    def iter_page(
+        self,
+        filters: ReceivableFilters,
+        cursor: Optional[str],
+        limit: int,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run the page query and stream up to ``limit + 1`` rows after the cursor.
+
+        The query executes before this returns; the extra row only signals
+        that another page exists.
+        """
+        self.validate_filters(filters)
+
+        clauses: List[str] = []
+        params: Dict[str, Any] = {"limit": limit + 1}
+        if filters.due_from is not None:
+            clauses.append("datavencimento >= :due_from")
+            params["due_from"] = filters.due_from
+        if filters.due_to is not None:
+            clauses.append("datavencimento <= :due_to")
+            params["due_to"] = filters.due_to
+        for field in ("statusdoc", "codcliente", "cpf", "uf"):
+            value = getattr(filters, field)
+            if value is not None:
+                clauses.append(f"{field} = :{field}")
+                params[field] = value
+        if cursor:
+            params["cursor_due"], params["cursor_id"] = self.decode_cursor(cursor)
+            clauses.append("(datavencimento, id) > (:cursor_due, :cursor_id)")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        statement = text(
+            f"SELECT {', '.join(self.COLUMNS)} FROM contas_receber {where} "
+            "ORDER BY datavencimento, id LIMIT :limit"
+        ).columns(datavencimento=Date, valordocumento=Numeric(15, 2))
+        result = self._session.execute(
+            statement.execution_options(stream_results=True, yield_per=500),
+            params,
+        )
+        return (dict(row) for row in result.mappings())
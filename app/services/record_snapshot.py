@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.services.record_store import BillingRecordStore, MappedStringTable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BRSNAP\x00\x01"
+# Bump when the layout or the parsing rules change so old snapshots are rebuilt.
+FORMAT_VERSION = 1
+# magic, version, little-endian flag, rows, string slots, heap bytes,
+# source size, source mtime (ns), source hash.
+_HEADER = struct.Struct("<8sIIQQQQq32s")
+_ALIGN = 8
+_TEXT_COLUMNS = BillingRecordStore._TEXT_COLUMNS
+
+
+def snapshot_path(source: Path, sheet_name: str | None = None) -> Path:
+    """Hidden file next to the source, one per sheet."""
+    tag = "default"
+    if sheet_name is not None:
+        tag = hashlib.blake2b(sheet_name.encode("utf-8"), digest_size=6).hexdigest()
+    return source.with_name(f".{source.name}.{tag}.snap")
+
+
+def source_digest(source: Path) -> bytes:
+    digest = hashlib.blake2b(digest_size=32)
+    with source.open("rb") as handle:
+        while chunk := handle.read(1 << 20):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _padded(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _layout(rows: int, slots: int, heap_len: int) -> List[Tuple[str, str, int, int]]:
+    """Return (name, typecode, offset, count) for each section of the file."""
+    sections = [("due", "i", rows), ("amount", "d", rows)]
+    sections += [(name, "I", rows) for name in _TEXT_COLUMNS]
+    sections += [("offsets", "Q", slots + 1), ("heap", "B", heap_len)]
+    layout = []
+    offset = _padded(_HEADER.size)
+    for name, code, count in sections:
+        layout.append((name, code, offset, count))
+        offset = _padded(offset + count * array(code).itemsize)
+    return layout
+
+
+def save_snapshot(
+    store: BillingRecordStore, source: Path, sheet_name: str | None = None
+) -> Optional[Path]:
+    """
+    Write ``store`` (sorted by due date) as a memory-mappable snapshot.
+
+    Returns ``None`` when the directory is not writable; the snapshot is an
+    optimization, so the caller simply keeps parsing next time.
+    """
+    store.sort_by_due_date()
+    stat = source.stat()
+    digest = source_digest(source)
+
+    strings = [value.encode("utf-8") for value in list(store.strings.values)[1:]]
+    offsets = array("Q", [0, 0])
+    for encoded in strings:
+        offsets.append(offsets[-1] + len(encoded))
+    heap = b"".join(strings)
+    slots = len(strings) + 1
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        int(sys.byteorder == "little"),
+        len(store),
+        slots,
+        len(heap),
+        stat.st_size,
+        stat.st_mtime_ns,
+        digest,
+    )
+    columns = store.columns()
+    target = snapshot_path(source, sheet_name)
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+    except OSError as exc:
+        logger.info("Snapshot nao gravado em %s: %s", target.parent, exc)
+        return None
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(header)
+            for name, _code, offset, _count in _layout(len(store), slots, len(heap)):
+                handle.write(b"\0" * (offset - handle.tell()))
+                if name == "offsets":
+                    handle.write(offsets.tobytes())
+                elif name == "heap":
+                    handle.write(heap)
+                else:
+                    handle.write(columns[name].tobytes())
+        os.replace(tmp_name, target)
+    except OSError as exc:
+        logger.info("Snapshot nao gravado em %s: %s", target, exc)
+        Path(tmp_name).unlink(missing_ok=True)
+        return None
+    return target
+
+
+def load_snapshot(
+    source: Path, sheet_name: str | None = None
+) -> Optional[BillingRecordStore]:
+    """
+    Map the snapshot of ``source`` if it is still current, else ``None``.
+
+    Size and mtime are checked first; when they differ the source is hashed
+    and the snapshot is reused (with the stat refreshed) only if the content
+    is unchanged.
+    """
+    target = snapshot_path(source, sheet_name)
+    try:
+        stat = source.stat()
+        with target.open("rb") as handle:
+            raw = handle.read(_HEADER.size)
+            if len(raw) < _HEADER.size:
+                return None
+            (magic, version, little, rows, slots, heap_len,
+             size, mtime_ns, digest) = _HEADER.unpack(raw)
+            if (
+                magic != MAGIC
+                or version != FORMAT_VERSION
+                or bool(little) != (sys.byteorder == "little")
+            ):
+                return None
+            if (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                if source_digest(source) != digest:
+                    return None
+                _refresh_stat(
+                    target,
+                    _HEADER.pack(magic, version, little, rows, slots, heap_len,
+                                 stat.st_size, stat.st_mtime_ns, digest),
+                )
+            layout = _layout(rows, slots, heap_len)
+            expected = layout[-1][2] + heap_len
+            if os.fstat(handle.fileno()).st_size < expected:
+                return None
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, struct.error):
+        return None
+
+    view = memoryview(mapped)
+    sections = {
+        name: view[offset : offset + count * array(code).itemsize].cast(code)
+        for name, code, offset, count in layout
+    }
+    strings = MappedStringTable(sections["offsets"], sections["heap"])
+    return BillingRecordStore.from_columns(
+        strings,
+        sections["due"],
+        sections["amount"],
+        {name: sections[name] for name in _TEXT_COLUMNS},
+    )
+
+
+def _refresh_stat(target: Path, header: bytes) -> None:
+    # Touched but unchanged source: record the new stat to skip hashing next time.
+    try:
+        with target.open("r+b") as handle:
+            handle.write(header)
+    except OSError:
+        pass
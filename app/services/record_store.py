@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+@dataclass(slots=True)
+class BillingRecord:
+    client_name: str
+    whatsapp_number: str
+    email: str | None
+    due_date: date
+    amount: float | None = None
+    contract: str | None = None
+    installment: str | None = None
+
+    @property
+    def title_label(self) -> str | None:
+        if self.contract and self.installment:
+            return f"Contrato {self.contract} parcela {self.installment}"
+        if self.contract:
+            return f"Contrato {self.contract}"
+        return None
+
+
+class StringTable:
+    """Store each distinct string once and refer to it by a small integer."""
+
+    __slots__ = ("_ids", "values")
+
+    def __init__(self) -> None:
+        # Id 0 is reserved for None so optional columns need no extra mask.
+        self.values: List[Optional[str]] = [None]
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = len(self.values)
+            self._ids[value] = idx
+            self.values.append(value)
+        return idx
+
+    @classmethod
+    def from_values(cls, values: Iterable[Optional[str]]) -> "StringTable":
+        table = cls()
+        for value in values:
+            table.intern(value)
+        return table
+
+    def __len__(self) -> int:
+        return len(self.values) - 1
+
+    def nbytes(self) -> int:
+        total = sys.getsizeof(self.values) + sys.getsizeof(self._ids)
+        return total + sum(sys.getsizeof(value) for value in self.values[1:])
+
+
+class HeapStrings(Sequence):
+    """Read-only string table over a UTF-8 heap and an offsets column."""
+
+    def __init__(self, offsets: Sequence[int], heap: memoryview) -> None:
+        self._offsets = offsets
+        self._heap = heap
+        self._decoded: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, idx: int) -> Optional[str]:
+        if idx == 0:
+            return None
+        value = self._decoded.get(idx)
+        if value is None:
+            start, stop = self._offsets[idx], self._offsets[idx + 1]
+            value = self._decoded[idx] = str(self._heap[start:stop], "utf-8")
+        return value
+
+
+class MappedStringTable:
+    """String table backed by a snapshot; strings are decoded on first use."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, offsets: Sequence[int], heap: memoryview) -> None:
+        self.values = HeapStrings(offsets, heap)
+
+    def intern(self, value: Optional[str]) -> int:
+        raise TypeError("Tabela de strings mapeada e somente leitura.")
+
+    def __len__(self) -> int:
+        return len(self.values) - 1
+
+    def nbytes(self) -> int:
+        return self.values._heap.nbytes + len(self.values._offsets) * 8
+
+
+class BillingRecordStore:
+    """
+    Column-oriented storage for billing records.
+
+    Due dates are kept as day ordinals, amounts as doubles (NaN for missing)
+    and text fields as ids into a shared string table, so repeated names,
+    phones and contracts cost four bytes per row. Iterating yields
+    ``BillingRecord`` objects built on demand.
+    """
+
+    _TEXT_COLUMNS = ("client_name", "whatsapp_number", "email", "contract", "installment")
+
+    def __init__(self) -> None:
+        self.strings = StringTable()
+        self._due = array("i")
+        self._amount = array("d")
+        self._text = {name: array("I") for name in self._TEXT_COLUMNS}
+        self._sorted = True
+
+    @classmethod
+    def from_columns(
+        cls,
+        strings: StringTable | MappedStringTable,
+        due: Sequence[int],
+        amount: Sequence[float],
+        text: Dict[str, Sequence[int]],
+    ) -> "BillingRecordStore":
+        """Wrap existing columns (e.g. views over a snapshot) sorted by due date."""
+        store = cls.__new__(cls)
+        store.strings = strings
+        store._due = due
+        store._amount = amount
+        store._text = {name: text[name] for name in cls._TEXT_COLUMNS}
+        store._sorted = True
+        return store
+
+    @classmethod
+    def from_records(cls, records: Iterable[BillingRecord]) -> "BillingRecordStore":
+        store = cls()
+        for record in records:
+            store.append(record)
+        return store
+
+    def append(self, record: BillingRecord) -> None:
+        self.add(
+            record.client_name,
+            record.whatsapp_number,
+            record.email,
+            record.due_date,
+            record.amount,
+            record.contract,
+            record.installment,
+        )
+
+    def add(
+        self,
+        client_name: str,
+        whatsapp_number: str,
+        email: str | None,
+        due_date: date,
+        amount: float | None = None,
+        contract: str | None = None,
+        installment: str | None = None,
+    ) -> None:
+        ordinal = due_date.toordinal()
+        if self._due and ordinal < self._due[-1]:
+            self._sorted = False
+        self._due.append(ordinal)
+        self._amount.append(math.nan if amount is None else amount)
+        intern = self.strings.intern
+        text = self._text
+        text["client_name"].append(intern(client_name))
+        text["whatsapp_number"].append(intern(whatsapp_number))
+        text["email"].append(intern(email))
+        text["contract"].append(intern(contract))
+        text["installment"].append(intern(installment))
+
+    def extend_unique(self, other: "BillingRecordStore", seen: set) -> None:
+        """
+        Append rows of ``other`` whose full key is not in ``seen``, then add
+        its keys to ``seen``. Repeated rows within ``other`` are all kept.
+        """
+        remap = array("I", (self.strings.intern(value) for value in other.strings.values))
+        columns = [other._text[name] for name in self._TEXT_COLUMNS]
+        targets = [self._text[name] for name in self._TEXT_COLUMNS]
+        added = set()
+        for row in range(len(other)):
+            ids = tuple(remap[column[row]] for column in columns)
+            ordinal = other._due[row]
+            amount = other._amount[row]
+            # NaN never compares equal, so missing amounts are keyed as None.
+            key = (ids, ordinal, None if amount != amount else amount)
+            if key in seen:
+                continue
+            added.add(key)
+            if self._due and ordinal < self._due[-1]:
+                self._sorted = False
+            self._due.append(ordinal)
+            self._amount.append(amount)
+            for target, value in zip(targets, ids):
+                target.append(value)
+        seen |= added
+
+    def sort_by_due_date(self) -> None:
+        """Reorder rows by due date (stable), enabling range lookups."""
+        if self._sorted:
+            return
+        order = sorted(range(len(self._due)), key=self._due.__getitem__)
+        self._due = array("i", (self._due[idx] for idx in order))
+        self._amount = array("d", (self._amount[idx] for idx in order))
+        for name, column in self._text.items():
+            self._text[name] = array("I", (column[idx] for idx in order))
+        self._sorted = True
+
+    def due_in(
+        self, reference_date: date, days: Sequence[int]
+    ) -> List[tuple[BillingRecord, int]]:
+        """
+        Return ``(record, days_until_due)`` for rows due ``days`` after
+        ``reference_date``, ordered by due date.
+
+        Each wanted day is a contiguous slice of the sorted ordinal column,
+        found by binary search; only matching rows become objects.
+        """
+        self.sort_by_due_date()
+        reference = reference_date.toordinal()
+        selected: List[tuple[BillingRecord, int]] = []
+        for offset in sorted(set(days)):
+            if offset < 0:
+                continue
+            target = reference + offset
+            start = bisect_left(self._due, target)
+            stop = bisect_right(self._due, target, lo=start)
+            selected.extend((self[idx], offset) for idx in range(start, stop))
+        return selected
+
+    def due_between(self, first: date, last: date) -> Iterator[BillingRecord]:
+        """Yield records due from ``first`` to ``last`` (inclusive), by due date."""
+        self.sort_by_due_date()
+        start = bisect_left(self._due, first.toordinal())
+        stop = bisect_right(self._due, last.toordinal(), lo=start)
+        for idx in range(start, stop):
+            yield self[idx]
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __getitem__(self, idx: int) -> BillingRecord:
+        values = self.strings.values
+        text = self._text
+        amount = self._amount[idx]
+        return BillingRecord(
+            client_name=values[text["client_name"][idx]],
+            whatsapp_number=values[text["whatsapp_number"][idx]],
+            email=values[text["email"][idx]],
+            due_date=date.fromordinal(self._due[idx]),
+            amount=None if amount != amount else amount,
+            contract=values[text["contract"][idx]],
+            installment=values[text["installment"][idx]],
+        )
+
+    def __iter__(self) -> Iterator[BillingRecord]:
+        for idx in range(len(self._due)):
+            yield self[idx]
+
+    @property
+    def is_sorted(self) -> bool:
+        return self._sorted
+
+    def columns(self) -> Dict[str, Sequence]:
+        """Return the raw columns: ``due``, ``amount`` and one per text field."""
+        return {"due": self._due, "amount": self._amount, **self._text}
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns and the string table."""
+        columns = [self._due, self._amount, *self._text.values()]
+        total = sum(len(column) * column.itemsize for column in columns)
+        return total + self.strings.nbytes()
+
+    def __getstate__(self) -> dict:
+        # Snapshot-backed columns are memoryviews; ship plain bytes instead.
+        return {
+            "strings": list(self.strings.values),
+            "columns": {name: column.tobytes() for name, column in self.columns().items()},
+            "sorted": self._sorted,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        columns = state["columns"]
+        self.strings = StringTable.from_values(state["strings"][1:])
+        self._due = array("i", columns["due"])
+        self._amount = array("d", columns["amount"])
+        self._text = {name: array("I", columns[name]) for name in self._TEXT_COLUMNS}
+        self._sorted = state["sorted"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import date
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when the header or entry layout changes; older files are not resumed.
+FORMAT_VERSION = 1
+# Checkpoints of runs nobody resumed are removed after this long.
+MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+def run_key(
+    sheet_path: Path, all_sheets: bool, reference_date: date, sender: str | None
+) -> str:
+    """Identify a run by what it reads and for which day it sends."""
+    raw = json.dumps(
+        [str(sheet_path.resolve()), all_sheets, reference_date.isoformat(), sender or ""]
+    )
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def prune_checkpoints(directory: Path, max_age_seconds: float = MAX_AGE_SECONDS) -> None:
+    cutoff = time.time() - max_age_seconds
+    for path in directory.glob("*.jsonl"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+class RunCheckpoint:
+    """
+    Append-only log of the sends of one reminder run.
+
+    The first line is a header describing the run (source fingerprint,
+    reference date, settings); each following line records the outcome of
+    one dispatched group in due-date order. Every line is flushed to the OS
+    as soon as it is written, so a killed worker loses nothing; ``fsync``
+    runs every ``sync_every`` entries to bound what a host crash can lose.
+    Channel stages record from their own threads, so writes are serialized.
+    """
+
+    def __init__(self, path: Path, sync_every: int = 20) -> None:
+        self.path = path
+        self.header: Optional[Dict[str, Any]] = None
+        self.finished = False
+        self._sync_every = max(1, sync_every)
+        self._entries: Dict[Tuple[str, int], Tuple[str, Optional[str]]] = {}
+        self._handle = None
+        self._unsynced = 0
+        self._lock = Lock()
+
+    def load(self) -> bool:
+        """Read an existing log; return ``False`` when there is nothing to resume."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return False
+
+        # A crash can leave a partial last line; drop it before appending.
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            with self.path.open("r+b") as handle:
+                handle.truncate(complete)
+
+        lines = data[:complete].splitlines()
+        if not lines:
+            return False
+        try:
+            header = json.loads(lines[0])
+            entries = [json.loads(line) for line in lines[1:]]
+        except ValueError:
+            logger.warning("Checkpoint corrompido ignorado: %s", self.path)
+            return False
+        if header.get("format") != FORMAT_VERSION:
+            return False
+
+        self.header = header
+        self._entries.clear()
+        for entry in entries:
+            if entry.get("finished"):
+                self.finished = True
+            else:
+                self._entries[(entry["channel"], entry["group"])] = (
+                    entry["status"],
+                    entry.get("detail"),
+                )
+        return True
+
+    def start(self, header: Dict[str, Any]) -> None:
+        """Begin a new log, replacing any previous one for the same run."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        prune_checkpoints(self.path.parent)
+        self.header = {"format": FORMAT_VERSION, **header}
+        self.finished = False
+        self._entries.clear()
+        self._handle = self.path.open("w", encoding="utf-8")
+        self._write(self.header)
+        self._sync()
+
+    def resume(self) -> None:
+        """Keep appending to the log read by :meth:`load`."""
+        self._handle = self.path.open("a", encoding="utf-8")
+
+    def get(self, channel: str, group: int) -> Optional[Tuple[str, Optional[str]]]:
+        """Recorded (status, detail) of ``group``, if it was already dispatched."""
+        return self._entries.get((channel, group))
+
+    def record(self, channel: str, group: int, status: str, detail: Optional[str]) -> None:
+        with self._lock:
+            self._entries[(channel, group)] = (status, detail)
+            self._write(
+                {"channel": channel, "group": group, "status": status, "detail": detail}
+            )
+            self._unsynced += 1
+            if self._unsynced >= self._sync_every:
+                self._sync()
+
+    def finish(self) -> None:
+        self.finished = True
+        self._write({"finished": True})
+        self.close()
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        self._sync()
+        self._handle.close()
+        self._handle = None
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def _sync(self) -> None:
+        os.fsync(self._handle.fileno())
+        self._unsynced = 0
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import TYPE_CHECKING, Callable, Dict
+
+from app.core.database import DatabaseNotInitializedError
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DAYS_KEY = "dias_antes_vencimento"
+EMAIL_KEY = "email_habilitado"
+WHATSAPP_KEY = "whatsapp_habilitado"
+VERSION_KEY = "versao_configuracao"
+CONFIG_KEYS = (DAYS_KEY, EMAIL_KEY, WHATSAPP_KEY)
+
+# Longest wait before retrying after the database failed to answer.
+MAX_RETRY_SECONDS = 300.0
+
+_SELECT_VERSION = "SELECT valor FROM configuracao_sistema WHERE chave = :key"
+_LOCK_VERSION = _SELECT_VERSION + " FOR UPDATE"
+_SELECT_KEYS = "SELECT chave, valor FROM configuracao_sistema WHERE chave IN :keys"
+_UPSERT = (
+    "INSERT INTO configuracao_sistema (chave, valor) VALUES (:key, :value) "
+    "ON DUPLICATE KEY UPDATE valor = VALUES(valor)"
+)
+_BUMP_VERSION = (
+    "INSERT INTO configuracao_sistema (chave, valor) VALUES (:key, '1') "
+    "ON DUPLICATE KEY UPDATE valor = CAST(valor AS UNSIGNED) + 1"
+)
+
+_TRUE_VALUES = {"1", "true", "sim", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "nao", "não", "no", "off"}
+
+
+class RuntimeConfigError(ValueError):
+    """Raised when a configuration value cannot be parsed."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class ReminderConfig:
+    reminder_days: tuple[int, ...]
+    email_enabled: bool = True
+    whatsapp_enabled: bool = True
+    version: int = 0
+    source: str = "env"
+
+
+def parse_days(value: str) -> tuple[int, ...]:
+    try:
+        days = sorted({int(part) for part in value.replace(";", ",").split(",") if part.strip()})
+    except ValueError as exc:
+        raise RuntimeConfigError(f"Dias invalidos: {value!r}") from exc
+    if not days or days[0] < 0:
+        raise RuntimeConfigError(f"Dias invalidos: {value!r}")
+    return tuple(days)
+
+
+def format_values(config: ReminderConfig) -> Dict[str, str]:
+    """The ``configuracao_sistema`` values that describe ``config``."""
+    return {
+        DAYS_KEY: ",".join(str(day) for day in config.reminder_days),
+        EMAIL_KEY: "true" if config.email_enabled else "false",
+        WHATSAPP_KEY: "true" if config.whatsapp_enabled else "false",
+    }
+
+
+def parse_flag(value: str) -> bool:
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise RuntimeConfigError(f"Valor booleano invalido: {value!r}")
+
+
+class RuntimeConfig:
+    """
+    Reminder settings from ``configuracao_sistema``, cached per worker.
+
+    Within ``ttl_seconds`` the cached values are returned without touching
+    the database. After that a primary-key lookup of ``versao_configuracao``
+    decides whether the keys must be reloaded, so every worker picks up a
+    change within one TTL. One thread reloads while the others keep getting
+    the cached values. If the database is unavailable the last known values
+    (initially the env defaults) stay in use and the next attempt is backed
+    off up to ``MAX_RETRY_SECONDS``.
+
+    While ``versao_configuracao`` is 0 the configuration was never saved,
+    so the rows seeded by the schema are ignored and the env defaults apply.
+    The first save stores every key, starting from the values in use.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        defaults: ReminderConfig,
+        ttl_seconds: float = 30.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._defaults = defaults
+        self._ttl_seconds = ttl_seconds
+        self._config = defaults
+        self._expires_at = 0.0
+        self._failures = 0
+        self._lock = Lock()
+
+    def current(self) -> ReminderConfig:
+        if time.monotonic() < self._expires_at:
+            return self._config
+        if not self._lock.acquire(blocking=False):
+            return self._config  # another thread is reloading
+        try:
+            if time.monotonic() >= self._expires_at:
+                self._reload()
+        finally:
+            self._lock.release()
+        return self._config
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def update(self, values: Dict[str, str]) -> ReminderConfig:
+        """Validate and store new values, bump the version and reload."""
+        self._apply(self._config, values)  # raises RuntimeConfigError on bad input
+        if not values:
+            return self.current()
+        from sqlalchemy import text
+
+        session = self._session_factory()
+        try:
+            with session.begin():
+                version = session.execute(
+                    text(_LOCK_VERSION), {"key": VERSION_KEY}
+                ).scalar_one_or_none()
+                if not int(version or 0):
+                    # First save: the seeded rows were never in use, so store
+                    # every key rather than let them take effect.
+                    values = {**format_values(self._defaults), **values}
+                for key, value in values.items():
+                    session.execute(text(_UPSERT), {"key": key, "value": value})
+                session.execute(text(_BUMP_VERSION), {"key": VERSION_KEY})
+        finally:
+            session.close()
+        with self._lock:
+            self._reload()
+        return self._config
+
+    def _reload(self) -> None:
+        """Refresh and set when to check again; the caller holds ``_lock``."""
+        if self._refresh():
+            self._failures = 0
+            delay = self._ttl_seconds
+        else:
+            self._failures += 1
+            delay = min(
+                max(self._ttl_seconds, 1.0) * 2 ** (self._failures - 1), MAX_RETRY_SECONDS
+            )
+        self._expires_at = time.monotonic() + delay
+
+    def _refresh(self) -> bool:
+        """Load the stored configuration; ``False`` when the database did not answer."""
+        from sqlalchemy import bindparam, text
+        from sqlalchemy.exc import SQLAlchemyError
+
+        try:
+            session = self._session_factory()
+        except DatabaseNotInitializedError:
+            return False
+        try:
+            version = session.execute(
+                text(_SELECT_VERSION), {"key": VERSION_KEY}
+            ).scalar_one_or_none()
+            version = int(version or 0)
+            if version == 0:
+                self._config = self._defaults
+                return True
+            if self._config.source == "db" and version == self._config.version:
+                return True
+            rows = session.execute(
+                text(_SELECT_KEYS).bindparams(bindparam("keys", expanding=True)),
+                {"keys": list(CONFIG_KEYS)},
+            ).all()
+        except (SQLAlchemyError, ValueError) as exc:
+            logger.warning("Configuracao do banco indisponivel, mantendo a atual: %s", exc)
+            return False
+        finally:
+            session.close()
+
+        values = {key: value for key, value in rows if value is not None}
+        try:
+            config = self._apply(self._defaults, values)
+        except RuntimeConfigError as exc:
+            logger.warning("Configuracao invalida em configuracao_sistema: %s", exc)
+            return True  # the database answered; retrying sooner will not help
+        self._config = replace(config, version=version, source="db")
+        return True
+
+    @staticmethod
+    def _apply(base: ReminderConfig, values: Dict[str, str]) -> ReminderConfig:
+        changes: Dict[str, object] = {}
+        if DAYS_KEY in values:
+            changes["reminder_days"] = parse_days(values[DAYS_KEY])
+        if EMAIL_KEY in values:
+            changes["email_enabled"] = parse_flag(values[EMAIL_KEY])
+        if WHATSAPP_KEY in values:
+            changes["whatsapp_enabled"] = parse_flag(values[WHATSAPP_KEY])
+        return replace(base, **changes)
+
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from threading import Lock
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SendWindow:
+    """Daily period (server local time) in which reminders may be sent."""
+
+    start: time
+    end: time
+
+    def contains(self, moment: datetime) -> bool:
+        current = moment.time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        return current >= self.start or current < self.end  # crosses midnight
+
+    def seconds_left(self, moment: datetime) -> float:
+        """Seconds until the window closes; 0 when it is already closed."""
+        if not self.contains(moment):
+            return 0.0
+        closes = datetime.combine(moment.date(), self.end)
+        if closes <= moment:
+            closes += timedelta(days=1)
+        return (closes - moment).total_seconds()
+
+    def __str__(self) -> str:
+        return f"{self.start:%H:%M}-{self.end:%H:%M}"
+
+
+class DeadlineTracker:
+    """
+    Keep deadline-critical sends of a run ahead of the window closing.
+
+    Each channel is tracked on its own, since channels send in parallel:
+    ``add_channel`` sets how many critical sends it will attempt and how
+    many workers send for it. Measured send times feed a moving average per
+    channel; once a channel's critical sends still pending would not fit in
+    what is left of the window, the run is at risk and that channel's
+    non-critical sends are deferred so the remaining time goes to the
+    critical ones.
+    """
+
+    SMOOTHING = 0.2
+
+    def __init__(self, window: SendWindow | None) -> None:
+        self.window = window
+        self.at_risk = False
+        self.yielded = 0
+        self._pending: Dict[str, int] = {}
+        self._workers: Dict[str, int] = {}
+        self._average: Dict[str, float] = {}
+        self._lock = Lock()  # shared by the channel stages
+
+    def add_channel(self, channel: str, critical_pending: int, workers: int = 1) -> None:
+        self._pending[channel] = critical_pending
+        self._workers[channel] = max(1, workers)
+
+    def admit(self, channel: str, critical: bool) -> str | None:
+        """Return why a send must wait, or ``None`` when it may go now."""
+        if self.window is None:
+            return None
+        now = datetime.now()
+        with self._lock:
+            if not self.window.contains(now):
+                if critical:
+                    self.at_risk = True
+                return f"Fora da janela de envio ({self.window}); reenviar com resume."
+            if critical or not self._critical_at_risk(channel, now):
+                return None
+            self.yielded += 1
+        return "Adiado para priorizar titulos com vencimento mais proximo."
+
+    def observe(self, channel: str, seconds: float) -> None:
+        with self._lock:
+            average = self._average.get(channel)
+            if average is None:
+                self._average[channel] = seconds
+            else:
+                self._average[channel] = average + self.SMOOTHING * (seconds - average)
+
+    def done(self, channel: str, critical: bool) -> None:
+        if critical:
+            with self._lock:
+                self._pending[channel] = self._pending.get(channel, 0) - 1
+
+    def _critical_at_risk(self, channel: str, now: datetime) -> bool:
+        pending = self._pending.get(channel, 0)
+        average = self._average.get(channel)
+        if pending <= 0 or average is None:
+            return False
+        needed = pending * average / self._workers.get(channel, 1)
+        left = self.window.seconds_left(now)
+        if needed < left:
+            return False
+        if not self.at_risk:
+            logger.warning(
+                "Envios criticos em risco (%s): %d pendentes (~%.0fs) e %.0fs ate o "
+                "fim da janela %s; adiando envios nao criticos.",
+                channel,
+                pending,
+                needed,
+                left,
+                self.window,
+            )
+        self.at_risk = True
+        return True
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from threading import RLock
-from typing import Dict, Iterable
+from typing import Dict, Iterable, List, Sequence
 from uuid import UUID, uuid4
 
-from app.models.service import Service, ServiceCreate, ServiceUpdate
+from pydantic import ValidationError
+
+from app.models.service import (
+    BulkItem,
+    BulkItemStatus,
+    Service,
+    ServiceBulkItemResult,
+    ServiceBulkUpdate,
+    ServiceCreate,
+    ServiceUpdate,
+    validation_detail,
+)
+
+_APPLIED = {BulkItemStatus.CREATED, BulkItemStatus.UPDATED, BulkItemStatus.DELETED}
 
 
 class ServiceNotFoundError(Exception):
@@ -38,7 +51,7 @@ class ServiceManager:
 
     def create_service(self, payload: ServiceCreate) -> Service:
         """Persist a new service and return it."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         service = Service(
             id=uuid4(),
             created_at=now,
@@ -59,7 +72,7 @@ class ServiceManager:
             data = current.model_dump()
             update_data = payload.model_dump(exclude_unset=True)
             data.update(update_data)
-            data["updated_at"] = datetime.utcnow()
+            data["updated_at"] = datetime.now(timezone.utc)
 
             updated = Service(**data)
             self._services[service_id] = updated
@@ -71,3 +84,143 @@ class ServiceManager:
             if service_id not in self._services:
                 raise ServiceNotFoundError(service_id)
             del self._services[service_id]
+
+    def bulk_create(
+        self, items: Sequence[BulkItem[ServiceCreate]], atomic: bool = False
+    ) -> List[ServiceBulkItemResult]:
+        """
+        Register the valid create payloads under a single lock acquisition.
+        With ``atomic`` nothing is stored unless every item is valid.
+        """
+        now = datetime.now(timezone.utc)
+        results: List[ServiceBulkItemResult] = []
+        created: List[Service] = []
+        for index, item in enumerate(items):
+            if item.error is not None:
+                results.append(_invalid(index, item.error))
+                continue
+            # Already validated as ServiceCreate: no second validation.
+            service = Service.model_construct(
+                id=uuid4(), created_at=now, updated_at=now, **dict(item.value)
+            )
+            created.append(service)
+            results.append(
+                ServiceBulkItemResult(
+                    index=index, status=BulkItemStatus.CREATED, id=service.id, service=service
+                )
+            )
+        if atomic and len(created) < len(results):
+            return [_not_applied(result) for result in results]
+        with self._lock:
+            for service in created:
+                self._services[service.id] = service
+        return results
+
+    def bulk_update(
+        self, items: Sequence[BulkItem[ServiceBulkUpdate]], atomic: bool = False
+    ) -> List[ServiceBulkItemResult]:
+        """
+        Apply ``{id, fields...}`` partial updates under a single lock
+        acquisition. Items for the same id are applied in order. With
+        ``atomic`` nothing is stored unless every item succeeds.
+        """
+        now = datetime.now(timezone.utc)
+        results: List[ServiceBulkItemResult] = []
+        payloads: List[tuple[int, ServiceBulkUpdate]] = []
+        for index, item in enumerate(items):
+            if item.error is not None:
+                results.append(_invalid(index, item.error))
+            else:
+                payloads.append((index, item.value))
+
+        with self._lock:
+            staged: Dict[UUID, Service] = {}
+            for index, payload in payloads:
+                current = staged.get(payload.id) or self._services.get(payload.id)
+                if current is None:
+                    results.append(_not_found(index, payload.id))
+                    continue
+                data = current.model_dump()
+                data.update(payload.model_dump(exclude_unset=True, exclude={"id"}))
+                data["updated_at"] = now
+                try:
+                    updated = Service(**data)
+                except ValidationError as exc:
+                    results.append(_invalid(index, validation_detail(exc), payload.id))
+                    continue
+                staged[payload.id] = updated
+                results.append(
+                    ServiceBulkItemResult(
+                        index=index, status=BulkItemStatus.UPDATED, id=payload.id, service=updated
+                    )
+                )
+            if atomic and any(result.status != BulkItemStatus.UPDATED for result in results):
+                return _in_order([_not_applied(result) for result in results])
+            self._services.update(staged)
+        return _in_order(results)
+
+    def bulk_delete(
+        self, items: Sequence[BulkItem[UUID]], atomic: bool = False
+    ) -> List[ServiceBulkItemResult]:
+        """Remove services by id under a single lock acquisition."""
+        results: List[ServiceBulkItemResult] = []
+        service_ids: List[tuple[int, UUID]] = []
+        for index, item in enumerate(items):
+            if item.error is not None:
+                results.append(_invalid(index, item.error))
+            else:
+                service_ids.append((index, item.value))
+
+        with self._lock:
+            removed: set[UUID] = set()
+            for index, service_id in service_ids:
+                if service_id in self._services and service_id not in removed:
+                    removed.add(service_id)
+                    results.append(
+                        ServiceBulkItemResult(
+                            index=index, status=BulkItemStatus.DELETED, id=service_id
+                        )
+                    )
+                else:
+                    results.append(_not_found(index, service_id))
+            if atomic and len(removed) < len(results):
+                return _in_order([_not_applied(result) for result in results])
+            for service_id in removed:
+                del self._services[service_id]
+        return _in_order(results)
+
+
+def _invalid(
+    index: int, detail: str, service_id: UUID | None = None
+) -> ServiceBulkItemResult:
+    return ServiceBulkItemResult(
+        index=index,
+        status=BulkItemStatus.INVALID,
+        id=service_id,
+        detail=detail,
+    )
+
+
+def _not_found(index: int, service_id: UUID) -> ServiceBulkItemResult:
+    return ServiceBulkItemResult(
+        index=index,
+        status=BulkItemStatus.NOT_FOUND,
+        id=service_id,
+        detail=str(ServiceNotFoundError(service_id)),
+    )
+
+
+def _in_order(results: List[ServiceBulkItemResult]) -> List[ServiceBulkItemResult]:
+    return sorted(results, key=lambda result: result.index)
+
+
+def _not_applied(result: ServiceBulkItemResult) -> ServiceBulkItemResult:
+    """Successful item of an atomic request that was rolled back."""
+    if result.status in _APPLIED:
+        return ServiceBulkItemResult(
+            index=result.index,
+            status=BulkItemStatus.NOT_APPLIED,
+            id=result.id,
+            detail="Nao aplicado: outro item da requisicao falhou.",
+        )
+    return result
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from app.services.xml_export import ExportReader, XmlExportError
+
+_PARAM_RE = re.compile(r'(\w+)="([^"]*)"')
+_MAX_HEADER_BYTES = 16 * 1024
+# First bytes of each accepted source: XLSX is a zip, the ERP export is XML.
+_SIGNATURES = {".xlsx": (b"PK\x03\x04",), ".xml": (b"<", b"\xef\xbb\xbf<")}
+
+
+class UploadError(Exception):
+    """Raised when an upload is malformed or not an accepted sheet."""
+
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds the configured size."""
+
+    pass
+
+
+class MultipartReader:
+    """
+    Incremental ``multipart/form-data`` parser.
+
+    ``feed`` takes body chunks as they arrive and returns events:
+    ``("part", headers)`` when a part starts and ``("data", bytes)`` for its
+    content. Only a delimiter's worth of bytes is held back between chunks,
+    so memory use does not grow with the body.
+    """
+
+    def __init__(self, boundary: str) -> None:
+        self._delimiter = b"\r\n--" + boundary.encode("latin-1")
+        self._buffer = b"\r\n"  # lets the first boundary match the delimiter
+        self._state = "preamble"
+        self.finished = False
+
+    @classmethod
+    def from_content_type(cls, content_type: str) -> "MultipartReader":
+        media_type, _, params = content_type.partition(";")
+        if media_type.strip().lower() != "multipart/form-data":
+            raise UploadError("Envie o arquivo como multipart/form-data (campo file).")
+        match = re.search(r'boundary="?([^";]+)"?', params)
+        if not match:
+            raise UploadError("Content-Type multipart sem boundary.")
+        return cls(match.group(1))
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, object]]:
+        self._buffer += chunk
+        events: List[Tuple[str, object]] = []
+        keep = len(self._delimiter) - 1
+        while not self.finished:
+            if self._state in ("preamble", "body"):
+                found = self._buffer.find(self._delimiter)
+                if found < 0:
+                    safe = len(self._buffer) - keep
+                    if safe > 0:
+                        if self._state == "body":
+                            events.append(("data", self._buffer[:safe]))
+                        self._buffer = self._buffer[safe:]
+                    break
+                if self._state == "body" and found:
+                    events.append(("data", self._buffer[:found]))
+                self._buffer = self._buffer[found + len(self._delimiter) :]
+                self._state = "boundary"
+            elif self._state == "boundary":
+                if len(self._buffer) < 2:
+                    break
+                if self._buffer.startswith(b"--"):
+                    self.finished = True
+                    self._buffer = b""
+                    break
+                end = self._buffer.find(b"\r\n")
+                if end < 0:
+                    break
+                self._buffer = self._buffer[end + 2 :]  # skips transport padding
+                self._state = "headers"
+            else:  # headers
+                end = self._buffer.find(b"\r\n\r\n")
+                if end < 0:
+                    if len(self._buffer) > _MAX_HEADER_BYTES:
+                        raise UploadError("Cabecalhos da parte multipart muito grandes.")
+                    break
+                events.append(("part", self._parse_headers(self._buffer[:end])))
+                self._buffer = self._buffer[end + 4 :]
+                self._state = "body"
+        return events
+
+    @staticmethod
+    def _parse_headers(raw: bytes) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        for line in raw.decode("utf-8", "replace").split("\r\n"):
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return headers
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    path: Path
+    filename: str
+    sha256: str
+    size_bytes: int
+    deduplicated: bool
+    # Rows of an XML export, parsed while it was received.
+    rows: Optional[List[tuple]] = None
+
+
+class SheetUploadStore:
+    """
+    Stream uploaded sheets to ``directory``, named by their SHA-256.
+
+    The file part of a multipart body is written to a temporary file chunk
+    by chunk while it is hashed; once complete it is renamed to
+    ``<sha256><suffix>``. Content that is already stored is not kept twice:
+    the temporary file is dropped and the existing path returned.
+
+    XML exports are also parsed chunk by chunk as they arrive. An XLSX is a
+    zip whose directory sits at the end, so it can only be read once the
+    upload is complete.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+
+    async def save(self, content_type: str, body: AsyncIterator[bytes]) -> StoredUpload:
+        reader = MultipartReader.from_content_type(content_type)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self._directory / f".upload-{uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        filename: str | None = None
+        suffix = ""
+        writing = False
+        head = b""
+        xml: Optional[ExportReader] = None
+        try:
+            with temp_path.open("wb") as handle:
+                async for chunk in body:
+                    for kind, value in reader.feed(chunk):
+                        if kind == "part":
+                            if filename is None:
+                                filename, suffix = self._file_part(value)
+                                writing = filename is not None
+                                if suffix == ".xml":
+                                    xml = ExportReader()
+                            else:
+                                writing = False  # only the first file is kept
+                            continue
+                        if not writing:
+                            continue
+                        if len(head) < 8:
+                            head += value[: 8 - len(head)]
+                        size += len(value)
+                        if size > self._max_bytes:
+                            raise UploadTooLargeError(
+                                f"Arquivo acima do limite de {self._max_bytes} bytes."
+                            )
+                        digest.update(value)
+                        handle.write(value)
+                        xml = self._feed(xml, value)
+            if filename is None:
+                raise UploadError("Nenhum arquivo no campo file do multipart.")
+            if not reader.finished:
+                raise UploadError("Upload interrompido antes do fim do multipart.")
+            if not head.startswith(_SIGNATURES[suffix]):
+                raise UploadError(f"Conteudo de {filename} nao parece um arquivo {suffix}.")
+
+            rows = None
+            if xml is not None:
+                try:
+                    rows = xml.rows()
+                except XmlExportError:
+                    pass  # reported when the stored file is read
+            sha256 = digest.hexdigest()
+            path = self._directory / f"{sha256}{suffix}"
+            deduplicated = path.exists()
+            if deduplicated:
+                temp_path.unlink()
+            else:
+                os.replace(temp_path, path)
+            return StoredUpload(path, filename, sha256, size, deduplicated, rows)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _feed(reader: Optional[ExportReader], data: bytes) -> Optional[ExportReader]:
+        if reader is None:
+            return None
+        try:
+            reader.feed(data)
+        except XmlExportError:
+            return None  # reported when the stored file is read
+        return reader
+
+    @staticmethod
+    def _file_part(headers: Dict[str, str]) -> Tuple[str | None, str]:
+        disposition = dict(_PARAM_RE.findall(headers.get("content-disposition", "")))
+        filename = disposition.get("filename")
+        if not filename:
+            return None, ""  # a plain form field
+        suffix = Path(filename).suffix.lower()
+        if suffix not in _SIGNATURES:
+            raise UploadError("Envie um arquivo .xlsx ou .xml.")
+        return Path(filename).name, suffix
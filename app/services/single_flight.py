@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Lock and result files of runs are removed after this long.
+MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+class FlightError(Exception):
+    """Base exception for coalesced runs."""
+
+    pass
+
+
+class FlightTimeoutError(FlightError):
+    """Raised when an identical run is still in flight after the wait limit."""
+
+    pass
+
+
+class FlightAbortedError(FlightError):
+    """Raised when the identical run being waited on ended without a result."""
+
+    pass
+
+
+class IdempotencyKeyReusedError(FlightError):
+    """Raised when an idempotency key is sent again with a different request."""
+
+    pass
+
+
+def flight_key(*parts: Any) -> str:
+    """Stable file-safe key for a run identity."""
+    raw = json.dumps(parts, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest()
+
+
+@dataclass(frozen=True)
+class FlightResult:
+    status_code: int
+    body: bytes
+    shared: bool  # produced by another request
+
+
+class SingleFlight:
+    """
+    Run identical requests once, across every worker sharing ``directory``.
+
+    Each run holds an exclusive ``flock`` on ``<key>.lock`` while it works
+    and writes ``<key>.json`` (status code, JSON body, request fingerprint)
+    before releasing it. A request that finds the lock held waits for it;
+    if the result written meanwhile has its fingerprint it is returned as
+    is, otherwise the request runs itself, after the other one. Requests
+    sent with an idempotency key also get the stored result back for
+    ``replay_seconds`` after the run finished.
+
+    Old lock files are only removed while locked, and a run checks that the
+    file it locked is still the one at its path, so a removed lock never
+    lets two runs in at once.
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(
+        self, directory: str | Path, wait_seconds: float = 900.0, replay_seconds: float = 86400.0
+    ) -> None:
+        self._directory = Path(directory)
+        self._wait_seconds = wait_seconds
+        self._replay_seconds = replay_seconds
+
+    def run(
+        self,
+        key: str,
+        fingerprint: str,
+        call: Callable[[], Tuple[int, bytes]],
+        idempotency_key: str | None = None,
+    ) -> FlightResult:
+        """
+        Return ``call()``'s (status code, body), or those of an identical run.
+
+        ``key`` names what must not run twice at once (same sources, day and
+        sender); ``fingerprint`` the full request, so only requests that
+        would get the same answer share a result.
+        """
+        self._directory.mkdir(parents=True, exist_ok=True)
+        replay_path = None
+        if idempotency_key is not None:
+            replay_path = self._directory / f"idem-{flight_key(idempotency_key)}.json"
+            stored = self._read(replay_path, time.time() - self._replay_seconds)
+            if stored is not None:
+                return self._shared(stored, fingerprint, idempotency_key)
+
+        arrived = time.time()
+        handle, waited = self._acquire(self._directory / f"{key}.lock")
+        with handle:
+            try:
+                # Also catches a run that finished between arriving and locking.
+                stored = self._read(self._directory / f"{key}.json", arrived)
+                if stored is None and waited:
+                    raise FlightAbortedError(
+                        "A execucao identica em andamento terminou sem resultado; "
+                        "repita com resume=true."
+                    )
+                if stored is not None and stored["fingerprint"] == fingerprint:
+                    if replay_path is not None:
+                        self._write(replay_path, stored)
+                    return self._shared(stored, fingerprint, idempotency_key)
+                status_code, body = self._call(call)
+                result = {
+                    "fingerprint": fingerprint,
+                    "finished_at": time.time(),
+                    "status_code": status_code,
+                    "body": body.decode("utf-8"),
+                }
+                self._write(self._directory / f"{key}.json", result)
+                if replay_path is not None:
+                    self._write(replay_path, result)
+                return FlightResult(status_code, body, shared=False)
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _acquire(self, path: Path):
+        """Open and lock ``path``; return the handle and whether a run held it first."""
+        deadline = time.monotonic() + self._wait_seconds
+        while True:
+            handle = path.open("a+b")
+            try:
+                waited = self._lock(handle, deadline)
+                if self._is_current(handle, path):
+                    return handle, waited
+                # Pruned while we waited: lock the file now at the path instead.
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            except BaseException:
+                handle.close()
+                raise
+            handle.close()
+
+    @staticmethod
+    def _is_current(handle, path: Path) -> bool:
+        try:
+            current = path.stat()
+        except FileNotFoundError:
+            return False
+        opened = os.fstat(handle.fileno())
+        return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+    def _lock(self, handle, deadline: float) -> bool:
+        """Take the run lock; return whether another run held it first."""
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except BlockingIOError:
+            pass
+        while True:
+            time.sleep(self.POLL_SECONDS)
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise FlightTimeoutError(
+                        "Execucao identica ainda em andamento; tente novamente mais tarde."
+                    ) from None
+
+    def _call(self, call: Callable[[], Tuple[int, bytes]]) -> Tuple[int, bytes]:
+        try:
+            return call()
+        except Exception:
+            # Waiters get the failure instead of dispatching the run again.
+            logger.exception("Falha na execucao coalescida")
+            return 500, json.dumps({"detail": "Falha interna na execucao."}).encode("utf-8")
+
+    @staticmethod
+    def _shared(stored: dict, fingerprint: str, idempotency_key: str | None) -> FlightResult:
+        if stored["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReusedError(
+                f"Idempotency-Key {idempotency_key} ja usada com outra requisicao."
+            )
+        return FlightResult(stored["status_code"], stored["body"].encode("utf-8"), shared=True)
+
+    @staticmethod
+    def _read(path: Path, not_before: float) -> Optional[dict]:
+        try:
+            stored = json.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning("Resultado de execucao corrompido ignorado: %s", path)
+            return None
+        if stored.get("finished_at", 0) < not_before:
+            return None
+        return stored
+
+    def _write(self, path: Path, result: dict) -> None:
+        temp = path.with_suffix(f".{uuid4().hex}.tmp")
+        temp.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp, path)
+        self._prune()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - max(MAX_AGE_SECONDS, self._replay_seconds)
+        for path in self._directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                try:
+                    lock = path.with_suffix(".lock").open("rb")
+                except FileNotFoundError:  # idempotency results have no lock
+                    path.unlink()
+                    continue
+                with lock:
+                    try:
+                        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue  # a run of this key is in progress
+                    path.unlink(missing_ok=True)
+                    # Only removed while held; openers re-check the inode.
+                    Path(lock.name).unlink(missing_ok=True)
+            except OSError:
+                pass
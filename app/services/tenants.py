@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Dict, List, Sequence
+
+from pydantic import ValidationError
+
+from app.models.reminder import BillingReminderRequest, BillingReminderResponse
+from app.models.tenant import (
+    TenantConfig,
+    TenantInfo,
+    TenantRunResult,
+    TenantRunStatus,
+)
+from app.services.billing_reminder import BillingReminderError, BillingReminderService
+
+logger = logging.getLogger(__name__)
+
+
+class TenantError(Exception):
+    """Base exception for tenant operations."""
+
+    pass
+
+
+class TenantNotFoundError(TenantError):
+    """Raised when a tenant id is not configured."""
+
+    pass
+
+
+class TenantBusyError(TenantError):
+    """Raised when a tenant already runs as many jobs as it is allowed."""
+
+    pass
+
+
+def load_tenants(path: str | Path) -> List[TenantConfig]:
+    """Read the JSON list of tenants (one object per company)."""
+    try:
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        tenants = [TenantConfig.model_validate(item) for item in raw]
+    except (OSError, ValueError, TypeError, ValidationError) as exc:
+        raise TenantError(f"Arquivo de empresas invalido ({path}): {exc}") from exc
+    ids = [tenant.tenant_id for tenant in tenants]
+    if len(ids) != len(set(ids)):
+        raise TenantError(f"CNPJ repetido em {path}")
+    return tenants
+
+
+def default_sheet_path(tenant_id: str, billing_sheet_path: str) -> str:
+    """ERP exports carry the CNPJ in the name: ``..._11915754000198_....xml``."""
+    return str(Path(billing_sheet_path).parent / f"*_{tenant_id}_*.xml")
+
+
+class TenantRegistry:
+    """
+    Per-tenant reminder services, run side by side without sharing limits.
+
+    Services (with their own WAHA connection pool, email sender, data
+    source and send budget) are built on first use by ``factory``. Each
+    tenant may run at most ``max_concurrent_runs`` jobs at once; the shared
+    thread pool has a slot for every one of them, so a slow tenant never
+    waits for, or holds up, another.
+    """
+
+    def __init__(
+        self,
+        tenants: Sequence[TenantConfig],
+        factory: Callable[[TenantConfig], BillingReminderService],
+        timeout_seconds: float = 600.0,
+    ) -> None:
+        self._tenants: Dict[str, TenantConfig] = {tenant.tenant_id: tenant for tenant in tenants}
+        self._factory = factory
+        self._timeout_seconds = timeout_seconds
+        self._services: Dict[str, BillingReminderService] = {}
+        self._slots = {
+            tenant.tenant_id: BoundedSemaphore(tenant.max_concurrent_runs) for tenant in tenants
+        }
+        self._lock = Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def ids(self) -> List[str]:
+        return list(self._tenants)
+
+    def describe(self, billing_sheet_path: str) -> List[TenantInfo]:
+        return [
+            TenantInfo(
+                tenant_id=tenant.tenant_id,
+                name=tenant.name,
+                sheet_path=tenant.sheet_path
+                or default_sheet_path(tenant.tenant_id, billing_sheet_path),
+            )
+            for tenant in self._tenants.values()
+        ]
+
+    def service(self, tenant_id: str) -> BillingReminderService:
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            raise TenantNotFoundError(f"Empresa {tenant_id} nao configurada.")
+        with self._lock:
+            service = self._services.get(tenant_id)
+            if service is None:
+                service = self._services[tenant_id] = self._factory(tenant)
+            return service
+
+    def run(self, tenant_id: str, request: BillingReminderRequest) -> BillingReminderResponse:
+        """Run the job for one tenant, unless it already uses all its slots."""
+        service = self.service(tenant_id)
+        slots = self._slots[tenant_id]
+        if not slots.acquire(blocking=False):
+            raise TenantBusyError(f"Empresa {tenant_id} ja esta em execucao.")
+        try:
+            return service.run(request)
+        finally:
+            slots.release()
+
+    def run_many(
+        self,
+        tenant_ids: Sequence[str],
+        request: BillingReminderRequest,
+        run: Callable[[str, BillingReminderRequest], BillingReminderResponse] | None = None,
+    ) -> List[TenantRunResult]:
+        """
+        Run several tenants in parallel and wait up to ``timeout_seconds``.
+
+        Each tenant goes through ``run`` (default :meth:`run`), which lets the
+        caller wrap it, e.g. in a cross-worker lock. Tenants still running at
+        the deadline are reported as ``running`` and finish in the
+        background; their checkpoints allow a later resume.
+        """
+        for tenant_id in tenant_ids:
+            if tenant_id not in self._tenants:
+                raise TenantNotFoundError(f"Empresa {tenant_id} nao configurada.")
+
+        executor = self._get_executor()
+        futures = [
+            (tenant_id, executor.submit(run or self.run, tenant_id, request))
+            for tenant_id in dict.fromkeys(tenant_ids)
+        ]
+        deadline = time.monotonic() + self._timeout_seconds
+        results: List[TenantRunResult] = []
+        for tenant_id, future in futures:
+            try:
+                response = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                results.append(
+                    TenantRunResult(
+                        tenant_id=tenant_id,
+                        status=TenantRunStatus.RUNNING,
+                        detail="Execucao continua em segundo plano.",
+                    )
+                )
+            except TenantBusyError as exc:
+                results.append(
+                    TenantRunResult(
+                        tenant_id=tenant_id, status=TenantRunStatus.BUSY, detail=str(exc)
+                    )
+                )
+            except BillingReminderError as exc:
+                results.append(
+                    TenantRunResult(
+                        tenant_id=tenant_id, status=TenantRunStatus.FAILED, detail=str(exc)
+                    )
+                )
+            except Exception as exc:  # isolate any failure to its own tenant
+                logger.exception("Falha na execucao da empresa %s", tenant_id)
+                results.append(
+                    TenantRunResult(
+                        tenant_id=tenant_id,
+                        status=TenantRunStatus.FAILED,
+                        detail=f"{exc.__class__.__name__}: {exc}",
+                    )
+                )
+            else:
+                results.append(
+                    TenantRunResult(
+                        tenant_id=tenant_id,
+                        status=TenantRunStatus.COMPLETED,
+                        response=response,
+                    )
+                )
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            services = list(self._services.values())
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for service in services:
+            service.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # One thread per slot, plus one per tenant for calls that
+                # only find it busy.
+                workers = sum(
+                    tenant.max_concurrent_runs + 1 for tenant in self._tenants.values()
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(1, workers), thread_name_prefix="tenant-run"
+                )
+            return self._executor
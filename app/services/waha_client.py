@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional
 
-import httpx
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+if TYPE_CHECKING:
+    import httpx
 
 
 class WahaClientError(Exception):
@@ -12,6 +17,12 @@ class WahaClientError(Exception):
     pass
 
 
+class WahaCircuitOpenError(WahaClientError, CircuitOpenError):
+    """Raised without calling WAHA while its circuit breaker is open."""
+
+    pass
+
+
 @dataclass
 class WahaClient:
     """Small HTTP client responsible for sending WhatsApp messages."""
@@ -19,7 +30,22 @@ class WahaClient:
     base_url: str
     api_token: Optional[str] = None
     default_sender: Optional[str] = None
+    session: str = "default"
     timeout_seconds: float = 10.0
+    max_connections: int = 16
+    breaker: Optional[CircuitBreaker] = None
+    _http: Optional[httpx.Client] = field(default=None, init=False, repr=False)
+    _http_lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def warm_up(self) -> None:
+        """Create the keep-alive connection pool ahead of the first send."""
+        self._client()
+
+    def close(self) -> None:
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
 
     def send_text_message(
         self,
@@ -36,23 +62,105 @@ class WahaClient:
         if sender_to_use:
             payload["sender"] = sender_to_use
 
+        response = self._request("POST", "/api/sendText", json=payload)
+        return self._safe_json(response)
+
+    def check_number_exists(self, phone: str) -> bool:
+        """Ask WAHA, through the client's session, whether the number has WhatsApp."""
+        params = {
+            "phone": self._sanitize_phone(phone).lstrip("+"),
+            "session": self.session,
+        }
+        response = self._request("GET", "/api/contacts/check-exists", params=params)
+        data = self._safe_json(response)
+        if "numberExists" not in data:
+            raise WahaClientError(f"Resposta inesperada do WAHA: {data}")
+        return bool(data["numberExists"])
+
+    def check_numbers_exist(
+        self,
+        phones: Iterable[str],
+        max_workers: int = 8,
+    ) -> Dict[str, bool]:
+        """Check many numbers concurrently; numbers whose check failed are omitted."""
+        unique = list(dict.fromkeys(phones))
+        if not unique:
+            return {}
+
+        def check(phone: str) -> Optional[bool]:
+            try:
+                return self.check_number_exists(phone)
+            except WahaClientError:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+            outcomes = list(pool.map(check, unique))
+        return {
+            phone: exists
+            for phone, exists in zip(unique, outcomes)
+            if exists is not None
+        }
+
+    def ensure_available(self) -> None:
+        """Raise :class:`WahaCircuitOpenError` if WAHA calls are being short-circuited."""
+        if self.breaker is not None:
+            try:
+                self.breaker.check()
+            except CircuitOpenError as exc:
+                raise WahaCircuitOpenError(exc.name, exc.retry_after) from None
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        import httpx  # slow import, only once WAHA is called
+
+        breaker = self.breaker
+        if breaker is not None:
+            try:
+                breaker.before_call()
+            except CircuitOpenError as exc:
+                raise WahaCircuitOpenError(exc.name, exc.retry_after) from None
+
+        healthy = False
         try:
-            response = httpx.post(
-                self._build_url("/api/sendText"),
-                json=payload,
+            response = self._client().request(
+                method,
+                self._build_url(path),
                 headers=self._build_headers(),
                 timeout=self.timeout_seconds,
+                **kwargs,
             )
             response.raise_for_status()
+            healthy = True
         except httpx.HTTPStatusError as exc:
+            # 4xx means WAHA is up and rejected this request (e.g. bad number).
+            healthy = exc.response.status_code < 500
             raise WahaClientError(
                 f"WAHA respondeu com status {exc.response.status_code}: "
                 f"{exc.response.text}"
             ) from exc
         except httpx.HTTPError as exc:  # network issues, timeouts, etc.
             raise WahaClientError(f"Falha ao contatar WAHA: {exc}") from exc
+        finally:
+            if breaker is not None:
+                if healthy:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+        return response
 
-        return self._safe_json(response)
+    def _client(self) -> httpx.Client:
+        # One pooled client per worker: reuses TCP connections to WAHA.
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    import httpx
+
+                    self._http = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                        ),
+                    )
+        return self._http
 
     def _build_headers(self) -> Dict[str, str]:
         headers = {"Content-Type": "application/json"}
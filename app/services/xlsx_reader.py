@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+import html
+import posixpath
+import re
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional
+from xml.parsers import expat
+
+
+class XlsxReaderError(Exception):
+    """Raised when the workbook layout is not understood by the fast reader."""
+
+    pass
+
+
+SPREADSHEET_NAMESPACES = (
+    "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "http://purl.oclc.org/ooxml/spreadsheetml/main",
+)
+RELATIONSHIP_NAMESPACES = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "http://purl.oclc.org/ooxml/officeDocument/relationships",
+)
+
+EPOCH_1900 = datetime(1899, 12, 30)
+EPOCH_1904 = datetime(1904, 1, 1)
+CHUNK_SIZE = 1 << 16
+
+# Built-in number formats that openpyxl converts to datetime.
+BUILTIN_DATE_FORMATS = frozenset({14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47})
+_FORMAT_LITERALS = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.|_.|\*.')
+_DATE_TOKENS = re.compile(r"[dmyhs]", re.IGNORECASE)
+_DIGITS = "0123456789"
+
+# Sheet XML is tokenized with regexes instead of a SAX parser: for wide sheets
+# most cells are skipped, and expat callbacks alone cost more than openpyxl's
+# per-cell work we are trying to avoid. Anything unusual triggers the fallback.
+_ROW_RE = re.compile(rb"<row\b([^>]*?)(?:/>|>(.*?)</row>)", re.DOTALL)
+_CELL_RE = re.compile(rb"<c\b([^>]*?)(?:/>|>(.*?)</c>)", re.DOTALL)
+_ATTR_RE = re.compile(rb"([\w:]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+_VALUE_RE = re.compile(rb"<v(?:\s[^>]*)?>(.*?)</v>", re.DOTALL)
+_TEXT_RE = re.compile(rb"<t(?:\s[^>]*)?>(.*?)</t>", re.DOTALL)
+_PHONETIC_RE = re.compile(rb"<rPh\b.*?</rPh>", re.DOTALL)
+_TYPE_RE = re.compile(rb"\st\s*=\s*[\"']([^\"']*)")
+_STYLE_RE = re.compile(rb"\ss\s*=\s*[\"']([^\"']*)")
+_PREFIXED_ROOT_RE = re.compile(rb"<\w+:worksheet\b")
+
+ColumnSelector = Callable[[tuple], Collection[int]]
+
+
+def list_sheets(path: Path | str) -> List[str]:
+    """Return the sheet names of an XLSX file in workbook order."""
+    with _open_zip(path) as archive:
+        return [name for name, _ in _Workbook(archive).sheets]
+
+
+def read_xlsx_rows(
+    path: Path | str,
+    sheet: Optional[str] = None,
+    columns: Optional[ColumnSelector] = None,
+) -> Iterator[tuple]:
+    """
+    Stream worksheet rows straight from the XLSX zip.
+
+    The first yielded tuple is the header row (row 1) with every column
+    decoded. When ``columns`` is given it receives that header and returns the
+    column indexes to keep; cells outside that set are skipped without being
+    converted. Rows without any selected value are not yielded.
+
+    Raises:
+        XlsxReaderError: If the package or sheet XML cannot be processed.
+    """
+    with _open_zip(path) as archive:
+        workbook = _Workbook(archive)
+        sheet_part = workbook.sheet_part(sheet)
+        shared_strings = workbook.shared_strings()
+        parser = _SheetParser(
+            shared_strings=shared_strings,
+            date_styles=workbook.date_styles(),
+            epoch=workbook.epoch,
+            columns=columns,
+        )
+        try:
+            with archive.open(sheet_part) as stream:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    parser.feed(chunk, final=not chunk)
+                    if parser.rows:
+                        yield from parser.rows
+                        parser.rows = []
+                    if not chunk:
+                        break
+        except (KeyError, ValueError, IndexError, zipfile.BadZipFile) as exc:
+            raise XlsxReaderError(f"Falha ao ler {sheet_part}: {exc}") from exc
+
+
+def _open_zip(path: Path | str) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(path)
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise XlsxReaderError(f"Arquivo XLSX invalido: {exc}") from exc
+
+
+def _local_name(name: str) -> str:
+    return name.rpartition(" ")[2]
+
+
+def _parse_part(archive: zipfile.ZipFile, part: str, start, end=None, text=None) -> None:
+    parser = expat.ParserCreate(namespace_separator=" ")
+    parser.StartElementHandler = start
+    if end is not None:
+        parser.EndElementHandler = end
+    if text is not None:
+        parser.CharacterDataHandler = text
+    try:
+        with archive.open(part) as stream:
+            parser.ParseFile(stream)
+    except KeyError as exc:
+        raise XlsxReaderError(f"Parte ausente no XLSX: {part}") from exc
+    except expat.ExpatError as exc:
+        raise XlsxReaderError(f"XML invalido em {part}: {exc}") from exc
+
+
+def _read_relationships(archive: zipfile.ZipFile, part: str) -> Dict[str, tuple[str, str]]:
+    folder, filename = posixpath.split(part)
+    rels_part = posixpath.join(folder, "_rels", f"{filename}.rels")
+    relationships: Dict[str, tuple[str, str]] = {}
+
+    def start(name: str, attrs: dict) -> None:
+        if _local_name(name) != "Relationship":
+            return
+        target = attrs.get("Target", "")
+        if target.startswith("/"):
+            resolved = target.lstrip("/")
+        else:
+            resolved = posixpath.normpath(posixpath.join(folder, target))
+        relationships[attrs.get("Id", "")] = (attrs.get("Type", ""), resolved)
+
+    _parse_part(archive, rels_part, start)
+    return relationships
+
+
+class _Workbook:
+    """Workbook-level metadata needed to decode a sheet."""
+
+    def __init__(self, archive: zipfile.ZipFile) -> None:
+        self._archive = archive
+        package_rels = _read_relationships(archive, "")
+        workbook_part = next(
+            (
+                target
+                for rel_type, target in package_rels.values()
+                if rel_type.endswith("/officeDocument")
+            ),
+            "xl/workbook.xml",
+        )
+        self._rels = _read_relationships(archive, workbook_part)
+        self.sheets: List[tuple[str, str]] = []
+        self.active_index = 0
+        self.epoch = EPOCH_1900
+
+        def start(name: str, attrs: dict) -> None:
+            local = _local_name(name)
+            if local == "sheet":
+                rel_id = next(
+                    (attrs[f"{ns} id"] for ns in RELATIONSHIP_NAMESPACES if f"{ns} id" in attrs),
+                    None,
+                )
+                if rel_id in self._rels:
+                    self.sheets.append((attrs.get("name", ""), self._rels[rel_id][1]))
+            elif local == "workbookView":
+                self.active_index = int(attrs.get("activeTab", 0))
+            elif local == "workbookPr":
+                if attrs.get("date1904") in {"1", "true"}:
+                    self.epoch = EPOCH_1904
+
+        _parse_part(archive, workbook_part, start)
+        if not self.sheets:
+            raise XlsxReaderError("Nenhuma planilha encontrada no XLSX.")
+
+    def sheet_part(self, sheet: Optional[str]) -> str:
+        if sheet is None:
+            index = self.active_index if self.active_index < len(self.sheets) else 0
+            return self.sheets[index][1]
+        for name, part in self.sheets:
+            if name == sheet:
+                return part
+        raise XlsxReaderError(f"Aba {sheet!r} nao encontrada no XLSX.")
+
+    def _related_part(self, suffix: str) -> Optional[str]:
+        for rel_type, target in self._rels.values():
+            if rel_type.endswith(suffix):
+                return target
+        return None
+
+    def shared_strings(self) -> List[str]:
+        part = self._related_part("/sharedStrings")
+        strings: List[str] = []
+        if part is None:
+            return strings
+
+        state = {"capture": False, "phonetic": False}
+        buffer: List[str] = []
+
+        def start(name: str, attrs: dict) -> None:
+            local = _local_name(name)
+            if local == "si":
+                buffer.clear()
+            elif local == "rPh":
+                state["phonetic"] = True
+            elif local == "t" and not state["phonetic"]:
+                state["capture"] = True
+
+        def end(name: str) -> None:
+            local = _local_name(name)
+            if local == "si":
+                strings.append("".join(buffer))
+            elif local == "rPh":
+                state["phonetic"] = False
+            elif local == "t":
+                state["capture"] = False
+
+        def text(data: str) -> None:
+            if state["capture"]:
+                buffer.append(data)
+
+        _parse_part(self._archive, part, start, end, text)
+        return strings
+
+    def date_styles(self) -> frozenset[str]:
+        part = self._related_part("/styles")
+        if part is None:
+            return frozenset()
+
+        custom_formats: Dict[int, str] = {}
+        cell_formats: List[int] = []
+        state = {"in_cell_xfs": False}
+
+        def start(name: str, attrs: dict) -> None:
+            local = _local_name(name)
+            if local == "numFmt":
+                custom_formats[int(attrs.get("numFmtId", -1))] = attrs.get("formatCode", "")
+            elif local == "cellXfs":
+                state["in_cell_xfs"] = True
+            elif local == "xf" and state["in_cell_xfs"]:
+                cell_formats.append(int(attrs.get("numFmtId", 0)))
+
+        def end(name: str) -> None:
+            if _local_name(name) == "cellXfs":
+                state["in_cell_xfs"] = False
+
+        _parse_part(self._archive, part, start, end)
+
+        date_styles = set()
+        for style_index, format_id in enumerate(cell_formats):
+            if format_id in BUILTIN_DATE_FORMATS:
+                date_styles.add(str(style_index))
+            elif format_id in custom_formats:
+                cleaned = _FORMAT_LITERALS.sub("", custom_formats[format_id])
+                if _DATE_TOKENS.search(cleaned):
+                    date_styles.add(str(style_index))
+        return frozenset(date_styles)
+
+
+class _SheetParser:
+    """Incremental tokenizer turning sheet XML chunks into row tuples."""
+
+    def __init__(
+        self,
+        shared_strings: List[str],
+        date_styles: frozenset[str],
+        epoch: datetime,
+        columns: Optional[ColumnSelector],
+    ) -> None:
+        self.rows: List[tuple] = []
+        self.header_seen = False
+        self._shared_strings = shared_strings
+        self._date_styles = date_styles
+        self._epoch = epoch
+        self._columns = columns
+        self._wanted: Optional[frozenset[int]] = None
+        self._width = 0
+        self._cell_prefixes: List[tuple[int, bytes]] = []
+        self._column_cache: Dict[bytes, int] = {}
+        self._pending = b""
+        self._checked_root = False
+        self._row_number = 0
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        buffer = self._pending + data
+        if not self._checked_root and (len(buffer) >= 1024 or final):
+            self._check_supported(buffer)
+        if final:
+            cut = len(buffer)
+        else:
+            cut = buffer.rfind(b"</row>")
+            if cut == -1:
+                self._pending = buffer
+                return
+            cut += len(b"</row>")
+        self._pending = buffer[cut:]
+        for match in _ROW_RE.finditer(buffer, 0, cut):
+            self._parse_row(match.group(1), match.group(2) or b"")
+
+    def _check_supported(self, buffer: bytes) -> None:
+        self._checked_root = True
+        if _PREFIXED_ROOT_RE.search(buffer[:4096]):
+            raise XlsxReaderError("Planilha com prefixo de namespace nao suportada.")
+
+    def _column_index(self, letters: bytes) -> int:
+        index = self._column_cache.get(letters)
+        if index is None:
+            index = 0
+            for code in letters.upper():
+                index = index * 26 + (code - 64)
+            index -= 1
+            self._column_cache[letters] = index
+        return index
+
+    def _parse_row(self, row_attrs: bytes, body: bytes) -> None:
+        if b"<![CDATA[" in body:
+            raise XlsxReaderError("Celulas com CDATA nao suportadas.")
+        number = _attributes(row_attrs).get(b"r")
+        self._row_number = int(number) if number else self._row_number + 1
+
+        wanted = self._wanted
+        if wanted is not None and number and self._all_cells_referenced(body):
+            self._finish_row(self._pick_cells(body, number, wanted))
+            return
+
+        values: Dict[int, Any] = {}
+        column = -1
+        for cell in _CELL_RE.finditer(body):
+            attrs = cell.group(1)
+            position = attrs.find(b'r="')
+            if position != -1:
+                end = attrs.find(b'"', position + 3)
+                column = self._column_index(attrs[position + 3:end].rstrip(b"0123456789"))
+            else:
+                column += 1
+            if wanted is not None and column not in wanted:
+                continue
+            values[column] = self._read_cell(attrs, cell.group(2) or b"")
+        self._finish_row(values)
+
+    @staticmethod
+    def _all_cells_referenced(body: bytes) -> bool:
+        cells = body.count(b"<c ") + body.count(b"<c>") + body.count(b"<c/")
+        return cells == body.count(b'<c r="')
+
+    def _pick_cells(
+        self, body: bytes, number: bytes, wanted: frozenset[int]
+    ) -> Dict[int, Any]:
+        # Every cell starts with its reference, so selected cells are located
+        # directly instead of walking the whole row.
+        values: Dict[int, Any] = {}
+        for column, prefix in self._cell_prefixes:
+            start = body.find(prefix + number + b'"')
+            if start == -1:
+                continue
+            cell = _CELL_RE.match(body, start)
+            if cell is None:
+                raise XlsxReaderError(f"Celula malformada na linha {number.decode()}.")
+            values[column] = self._read_cell(cell.group(1), cell.group(2) or b"")
+        return values
+
+    def _read_cell(self, attrs: bytes, content: bytes) -> Any:
+        found_type = _TYPE_RE.search(attrs)
+        cell_type = found_type.group(1).decode() if found_type else "n"
+        if cell_type == "inlineStr":
+            if b"<rPh" in content:
+                content = _PHONETIC_RE.sub(b"", content)
+            raw = b"".join(_TEXT_RE.findall(content))
+        else:
+            found = _VALUE_RE.search(content)
+            raw = found.group(1) if found else b""
+        text = raw.decode("utf-8")
+        if "&" in text:
+            text = html.unescape(text)
+        style = _STYLE_RE.search(attrs)
+        return self._convert(cell_type, style.group(1).decode() if style else None, text)
+
+    def _finish_row(self, values: Dict[int, Any]) -> None:
+        if not self.header_seen:
+            self.header_seen = True
+            if self._row_number == 1:
+                width = max(values) + 1 if values else 0
+                header = tuple(values.get(idx) for idx in range(width))
+                self.rows.append(header)
+                self._select_columns(header)
+                return
+            self.rows.append(())
+            self._select_columns(())
+
+        if not values:
+            return
+        width = self._width or max(values) + 1
+        self.rows.append(tuple(values.get(idx) for idx in range(width)))
+
+    def _select_columns(self, header: tuple) -> None:
+        if self._columns is None:
+            return
+        wanted = frozenset(self._columns(header))
+        self._wanted = wanted
+        self._width = max(wanted) + 1 if wanted else 0
+        self._cell_prefixes = [
+            (column, b'<c r="' + _column_letters(column)) for column in sorted(wanted)
+        ]
+
+    def _convert(self, cell_type: str, style: Optional[str], text: str) -> Any:
+        if cell_type == "n":
+            if not text:
+                return None
+            if "." in text or "e" in text or "E" in text:
+                value: Any = float(text)
+            else:
+                value = int(text)
+            if style is not None and style in self._date_styles:
+                return self._epoch + timedelta(days=value)
+            return value
+        if cell_type == "s":
+            return self._shared_strings[int(text)]
+        if cell_type == "b":
+            return text == "1"
+        if cell_type == "d":
+            return datetime.fromisoformat(text) if text else None
+        # "str" (formula result), "inlineStr" and "e" (error code) keep the text.
+        return text
+
+
+def _column_letters(index: int) -> bytes:
+    letters = b""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = bytes([65 + remainder]) + letters
+    return letters
+
+
+def _attributes(raw: bytes) -> Dict[bytes, bytes]:
+    return {
+        name: double or single
+        for name, double, single in _ATTR_RE.findall(raw)
+    }
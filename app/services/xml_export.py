@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+RECORD_TAG = "registro_cr"
+_CHUNK_SIZE = 1024 * 1024
+
+
+class XmlExportError(Exception):
+    """Raised when an ERP receivables export cannot be parsed."""
+
+    pass
+
+
+class ExportReader:
+    """
+    Incremental reader of an ERP export (``<DocumentElement><registro_cr>...``).
+
+    ``feed`` takes the document in chunks as it arrives; ``rows`` returns
+    the sheet rows once it is complete. The first row holds the field names
+    in order of first appearance, so the result goes through the same header
+    matching as an XLSX sheet. Fields a record omits (or leaves empty)
+    become ``None``.
+    """
+
+    def __init__(self, record_tag: str = RECORD_TAG) -> None:
+        self._record_tag = record_tag
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._header: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._rows: List[List[Optional[str]]] = []
+        self._root = None
+        self._current: Optional[List[Optional[str]]] = None
+
+    def feed(self, data: bytes) -> None:
+        try:
+            self._parser.feed(data)
+        except ParseError as exc:
+            raise XmlExportError(str(exc)) from exc
+        self._consume()
+
+    def rows(self) -> List[tuple]:
+        try:
+            self._parser.close()
+        except ParseError as exc:
+            raise XmlExportError(str(exc)) from exc
+        self._consume()
+        width = len(self._header)
+        return [tuple(self._header)] + [
+            tuple(row) + (None,) * (width - len(row)) for row in self._rows
+        ]
+
+    def _consume(self) -> None:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                elif elem.tag == self._record_tag:
+                    self._current = [None] * len(self._header)
+                continue
+
+            current = self._current
+            if elem.tag == self._record_tag:
+                self._rows.append(current or [])
+                self._current = None
+                # Drop parsed records so memory stays flat on large exports.
+                self._root.clear()
+            elif current is not None:
+                idx = self._positions.get(elem.tag)
+                if idx is None:
+                    idx = self._positions[elem.tag] = len(self._header)
+                    self._header.append(elem.tag)
+                if idx >= len(current):
+                    current.extend([None] * (idx + 1 - len(current)))
+                value = (elem.text or "").strip()
+                current[idx] = value or None
+
+
+def read_export_rows(path: Path | str, record_tag: str = RECORD_TAG) -> List[tuple]:
+    """Read an ERP export file as sheet rows (see :class:`ExportReader`)."""
+    reader = ExportReader(record_tag)
+    try:
+        with open(path, "rb") as handle:
+            while chunk := handle.read(_CHUNK_SIZE):
+                reader.feed(chunk)
+        return reader.rows()
+    except (XmlExportError, OSError) as exc:
+        raise XmlExportError(f"Falha ao ler o XML {path}: {exc}") from exc
@@ -0,0 +1 @@
+"""Scripts de benchmark executados manualmente (python -m benchmarks.<nome>)."""
@@ -0,0 +1,61 @@
+"""Compara o custo por linha da conversao de vencimentos.
+
+Uso: python -m benchmarks.bench_due_dates [--rows 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.services.billing_reminder import BillingReminderService, DueDateParser
+
+
+def build_column(rows: int, distinct: int) -> list[str]:
+    start = date(2025, 11, 1)
+    values = [(start + timedelta(days=i)).strftime("%d/%m/%Y") for i in range(distinct)]
+    rng = random.Random(42)
+    return [rng.choice(values) for _ in range(rows)]
+
+
+def measure(label: str, parse, column: list[str]) -> float:
+    started = time.perf_counter()
+    for value in column:
+        parse(value)
+    elapsed = time.perf_counter() - started
+    per_row = elapsed / len(column) * 1e9
+    print(f"{label:<28} {elapsed:8.3f}s  {per_row:8.0f} ns/linha")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--distinct", type=int, default=60)
+    args = parser.parse_args()
+
+    column = build_column(args.rows, args.distinct)
+    service = BillingReminderService
+
+    baseline = measure("strptime por linha", service._parse_due_date, column)
+
+    no_memo = DueDateParser.from_sample(
+        column[: BillingReminderService.DATE_SAMPLE_SIZE],
+        BillingReminderService.DATE_LAYOUTS,
+        fallback=service._parse_due_date,
+    )
+    measure("layout detectado, sem memo", lambda v: no_memo._split_date(v, no_memo.layout), column)
+
+    sniffed = service._build_due_date_parser(
+        [(value,) for value in column], due_index=0
+    )
+    optimized = measure("layout detectado + memo", sniffed, column)
+
+    assert all(sniffed(v) == service._parse_due_date(v) for v in column[:1000])
+    print(f"ganho: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
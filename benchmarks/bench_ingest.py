@@ -0,0 +1,52 @@
+"""Mede a ingestao de varias planilhas com 1 processo vs. o pool completo.
+
+Uso: python -m benchmarks.bench_ingest [--files 8] [--rows 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from app.services.billing_reminder import BillingReminderService
+from benchmarks.bench_xlsx_reader import build_sheet
+
+
+def timed(workers: int, directory: Path) -> float:
+    service = BillingReminderService(
+        default_sheet_path=str(directory),
+        reminder_days=[3, 1],
+        waha_client=None,
+        ingest_workers=workers,
+        snapshot_cache=False,  # mede o parse, nao a recarga do .snap da rodada anterior
+    )
+    started = time.perf_counter()
+    records = service._load_records(directory)
+    elapsed = time.perf_counter() - started
+    print(f"{workers:>2} processo(s) {elapsed:8.3f}s  {len(records)} registros")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for idx in range(args.files):
+            # Conteudos distintos: linhas repetidas entre arquivos sao descartadas.
+            build_sheet(directory / f"filial_{idx}.xlsx", args.rows, first=idx * args.rows)
+
+        serial = timed(1, directory)
+        parallel = timed(os.cpu_count() or 1, directory)
+
+    print(f"ganho: {serial / parallel:.1f}x com {os.cpu_count()} nucleos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Gera carga HTTP contra a API e mede vazao, latencia e erros por endpoint.
+
+Cenarios (``--scenario``, separados por virgula, executados em rodizio):
+
+- ``services``: ciclo CRUD em /api/services (POST, GET, PUT, GET lista, DELETE);
+- ``billing-dry``: POST /api/reminders/billing/run com ``dry_run=true``;
+- ``billing-send``: o mesmo enviando de verdade para um WAHA falso local
+  (``--waha-latency-ms`` simula o tempo de resposta do WAHA).
+
+Sem ``--url`` o app e iniciado com gunicorn + UvicornWorker (mesmo comando do
+Dockerfile) usando ``--workers``/``--threads``, uma planilha sintetica com
+``--rows`` linhas e o WAHA falso; ``--env CHAVE=VALOR`` repassa outras
+configuracoes (ex.: ``API_MYSQL_POOL_SIZE=10``). Com ``--url`` a carga vai para
+uma API ja em execucao (o cenario billing-send exige que ela aponte para um
+WAHA de teste).
+
+``--concurrency`` e o numero de clientes simultaneos; ``--rate`` limita o total
+de requisicoes por segundo (0 = o mais rapido possivel). Com ``--rate`` a
+latencia conta a partir do horario previsto da requisicao, entao a fila
+causada por saturacao aparece nos percentis.
+
+Uso: python -m benchmarks.bench_load [--scenario services,billing-dry]
+     [--workers 2] [--threads 4] [--concurrency 16] [--rate 0] [--duration 20]
+     [--warmup 3] [--json resultado.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_xlsx_reader import build_sheet
+
+SCENARIOS = ("services", "billing-dry", "billing-send")
+# build_sheet spreads due dates from 2025-11-01; this day has titles 1 and 3 days ahead.
+REFERENCE_DATE = date(2025, 11, 10)
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class StubWaha:
+    """WAHA falso: aceita todo envio e diz que todo numero tem WhatsApp."""
+
+    def __init__(self, latency_ms: float) -> None:
+        latency = latency_ms / 1000
+        self.sent = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _reply(self, body: bytes) -> None:
+                if latency:
+                    time.sleep(latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                self._reply(b'{"numberExists": true}')
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                stub.sent += 1
+                self._reply(b'{"id": "stub", "message": "ok"}')
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(
+    args: argparse.Namespace, workdir: Path, waha_url: str
+) -> tuple[subprocess.Popen, str]:
+    """Start gunicorn like the Dockerfile does and wait until it answers."""
+    port = free_port()
+    sheet = workdir / "clientes.xlsx"
+    build_sheet(sheet, args.rows)
+    env = {
+        **os.environ,
+        "API_DEBUG": "false",
+        "API_BILLING_SHEET_PATH": str(sheet),
+        "API_WAHA_BASE_URL": waha_url,
+        "API_WAHA_NUMBER_CACHE_PATH": str(workdir / "numbers.sqlite3"),
+        "API_REMINDER_CHECKPOINT_DIR": str(workdir / "checkpoints"),
+    }
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    command = [
+        sys.executable, "-m", "gunicorn",
+        f"--workers={args.workers}",
+        f"--threads={args.threads}",
+        "--timeout=60",
+        "-k", "uvicorn.workers.UvicornWorker",
+        "app.main:app",
+        "--bind", f"127.0.0.1:{port}",
+        "--log-level=warning",
+    ]
+    process = subprocess.Popen(command, env=env, cwd=Path(__file__).resolve().parent.parent)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"gunicorn terminou com codigo {process.returncode}")
+        try:
+            if httpx.get(f"{url}/", timeout=1).status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise SystemExit("app nao respondeu em 60s")
+
+
+class LoadRunner:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        scenarios: List[str],
+        concurrency: int,
+        rate: float,
+        duration: float,
+        warmup: float,
+    ) -> None:
+        self._client = client
+        self._scenarios = scenarios
+        self._concurrency = concurrency
+        self._interval = 1 / rate if rate > 0 else 0.0
+        self._duration = duration
+        self._warmup = warmup
+        self._next_slot = 0.0
+        self._iteration = 0
+        self._measure_from = 0.0
+        self._stop_at = 0.0
+        self.stats: Dict[str, EndpointStats] = {}
+
+    async def run(self) -> None:
+        started = time.perf_counter()
+        self._next_slot = started
+        self._measure_from = started + self._warmup
+        self._stop_at = self._measure_from + self._duration
+        # Requests started inside the window are counted even if they end after it.
+        await asyncio.gather(*(self._worker() for _ in range(self._concurrency)))
+
+    async def _worker(self) -> None:
+        handlers: Dict[str, Callable[[], Awaitable[None]]] = {
+            "services": self._services_cycle,
+            "billing-dry": lambda: self._billing(dry_run=True),
+            "billing-send": lambda: self._billing(dry_run=False),
+        }
+        while time.perf_counter() < self._stop_at:
+            scenario = self._scenarios[self._iteration % len(self._scenarios)]
+            self._iteration += 1
+            await handlers[scenario]()
+
+    async def _request(
+        self, label: str, method: str, path: str, expected: int, **kwargs
+    ) -> Optional[httpx.Response]:
+        scheduled = time.perf_counter()
+        if self._interval:
+            scheduled = max(self._next_slot, scheduled)
+            self._next_slot = scheduled + self._interval
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        if scheduled >= self._stop_at:
+            return None
+        response: Optional[httpx.Response] = None
+        error: Optional[str] = None
+        try:
+            response = await self._client.request(method, path, **kwargs)
+            if response.status_code != expected:
+                error = str(response.status_code)
+        except httpx.HTTPError as exc:
+            error = exc.__class__.__name__
+        elapsed = time.perf_counter() - scheduled
+        if scheduled >= self._measure_from:
+            stats = self.stats.setdefault(label, EndpointStats())
+            stats.latencies.append(elapsed)
+            if error:
+                stats.errors[error] += 1
+        return response if error is None else None
+
+    async def _services_cycle(self) -> None:
+        created = await self._request(
+            "POST /api/services",
+            "POST",
+            "/api/services/",
+            201,
+            json={
+                "name": f"servico-{self._iteration}",
+                "description": "carga",
+                "endpoint_url": "https://example.com/health",
+            },
+        )
+        if created is None:
+            return
+        path = f"/api/services/{created.json()['id']}"
+        await self._request("GET /api/services/{id}", "GET", path, 200)
+        await self._request(
+            "PUT /api/services/{id}", "PUT", path, 200, json={"status": "maintenance"}
+        )
+        await self._request("GET /api/services", "GET", "/api/services/", 200)
+        await self._request("DELETE /api/services/{id}", "DELETE", path, 204)
+
+    async def _billing(self, dry_run: bool) -> None:
+        label = "POST /api/reminders/billing/run" + (" (dry_run)" if dry_run else "")
+        await self._request(
+            label,
+            "POST",
+            "/api/reminders/billing/run",
+            200,
+            json={"reference_date": REFERENCE_DATE.isoformat(), "dry_run": dry_run},
+        )
+
+
+def report(stats: Dict[str, EndpointStats], elapsed: float) -> List[dict]:
+    """Print one line per endpoint; ``elapsed`` is the measured window."""
+    rows = []
+    print(
+        f"{'endpoint':<44} {'req':>7} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8} {'erros':>7}"
+    )
+    for label, item in sorted(stats.items()):
+        ordered = sorted(item.latencies)
+        errors = sum(item.errors.values())
+        row = {
+            "endpoint": label,
+            "requests": item.count,
+            "rps": round(item.count / elapsed, 1),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+            "p90_ms": round(percentile(ordered, 90) * 1000, 1),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+            "error_rate": round(errors / item.count, 4) if item.count else 0.0,
+            "errors": dict(item.errors),
+        }
+        rows.append(row)
+        print(
+            f"{label:<44} {row['requests']:>7} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+            f"{row['p90_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f} "
+            f"{row['error_rate']:>6.1%}"
+        )
+        if item.errors:
+            detail = ", ".join(f"{key}: {count}" for key, count in item.errors.most_common())
+            print(f"{'':<44} erros -> {detail}")
+    total = sum(item.count for item in stats.values())
+    print(f"total: {total} requisicoes em {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    return rows
+
+
+async def drive(
+    args: argparse.Namespace, url: str, scenarios: List[str]
+) -> Dict[str, EndpointStats]:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+        runner = LoadRunner(
+            client, scenarios, args.concurrency, args.rate, args.duration, args.warmup
+        )
+        await runner.run()
+    return runner.stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scenario", default="services,billing-dry")
+    parser.add_argument("--url", help="API ja em execucao; sem ela o app e iniciado aqui")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--env", action="append", default=[], metavar="CHAVE=VALOR")
+    parser.add_argument("--rows", type=int, default=2_000, help="linhas da planilha sintetica")
+    parser.add_argument("--waha-latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=0.0, help="req/s no total; 0 = sem limite")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", help="grava o resultado neste arquivo")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenario.split(",") if name.strip()]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown or not scenarios:
+        parser.error(f"cenario invalido: {', '.join(unknown)}; use {', '.join(SCENARIOS)}")
+
+    waha: Optional[StubWaha] = None
+    process: Optional[subprocess.Popen] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            if args.url:
+                url = args.url.rstrip("/")
+            else:
+                waha = StubWaha(args.waha_latency_ms)
+                process, url = start_app(args, Path(tmp), waha.url)
+                print(
+                    f"app em {url} (gunicorn --workers={args.workers} "
+                    f"--threads={args.threads}), WAHA falso em {waha.url}"
+                )
+            print(
+                f"cenarios {','.join(scenarios)}; {args.concurrency} clientes, "
+                f"{'sem limite' if not args.rate else f'{args.rate:g} req/s'}, "
+                f"{args.duration:g}s (+{args.warmup:g}s de aquecimento)"
+            )
+            stats = asyncio.run(drive(args, url, scenarios))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+            if waha is not None:
+                waha.close()
+
+    rows = report(stats, args.duration)
+    if waha is not None and "billing-send" in scenarios:
+        print(f"mensagens recebidas pelo WAHA falso: {waha.sent}")
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "url": args.url,
+                    "workers": None if args.url else args.workers,
+                    "threads": None if args.url else args.threads,
+                    "env": args.env,
+                    "scenarios": scenarios,
+                    "concurrency": args.concurrency,
+                    "rate": args.rate,
+                    "duration": args.duration,
+                    "endpoints": rows,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
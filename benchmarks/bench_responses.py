@@ -0,0 +1,99 @@
+"""Compara a serializacao de uma execucao com 50k resultados.
+
+- padrao: rota devolve o modelo e o FastAPI revalida + usa o encoder da stdlib;
+- rapido: ``ModelJSONResponse`` (serializador do pydantic-core, sem revalidar);
+- rapido + gzip/br: o mesmo atras do ``CompressionMiddleware``.
+
+Uso: python -m benchmarks.bench_responses [--results 50000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import compression
+from app.api.compression import CompressionMiddleware
+from app.api.responses import ModelJSONResponse
+from app.models.reminder import (
+    BillingReminderResponse,
+    ReminderDispatchResult,
+    ReminderStatus,
+)
+
+
+def build_response(results: int) -> BillingReminderResponse:
+    reference = date(2025, 11, 12)
+    return BillingReminderResponse(
+        sheet_path="data/clientes.xlsx",
+        reference_date=reference,
+        days_watched=[1, 3],
+        dry_run=False,
+        total_rows=results * 4,
+        eligible_rows=results,
+        dispatched=results,
+        results=[
+            ReminderDispatchResult(
+                client_name=f"CLIENTE {idx:06d} LTDA",
+                whatsapp_number=f"+55699{idx:08d}",
+                due_date=reference + timedelta(days=3 if idx % 2 else 1),
+                days_until_due=3 if idx % 2 else 1,
+                status=ReminderStatus.SENT,
+                message_preview=(
+                    f"Ola CLIENTE {idx:06d} LTDA, faltam 3 dias para o vencimento "
+                    "do seu boleto."
+                ),
+                detail="WhatsApp: ok | Email: ok",
+            )
+            for idx in range(results)
+        ],
+    )
+
+
+def build_app(payload: BillingReminderResponse) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=BillingReminderResponse)
+    def default() -> BillingReminderResponse:
+        return payload
+
+    @app.get("/fast", response_model=BillingReminderResponse)
+    def fast() -> ModelJSONResponse:
+        return ModelJSONResponse(payload)
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+def timed(client: TestClient, label: str, path: str, encoding: str, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path, headers={"Accept-Encoding": encoding})
+        best = min(best, time.perf_counter() - started)
+    size = response.num_bytes_downloaded
+    print(f"{label:<18} {best * 1000:8.0f} ms  {size / 2**20:7.2f} MiB no fio")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    client = TestClient(build_app(build_response(args.results)))
+    timed(client, "padrao", "/default", "identity", args.repeat)
+    timed(client, "rapido", "/fast", "identity", args.repeat)
+    timed(client, "rapido + gzip", "/fast", "gzip", args.repeat)
+    if compression.brotli is not None:
+        timed(client, "rapido + br", "/fast", "br", args.repeat)
+    else:
+        print("rapido + br        (instale 'brotli' para medir)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Mede a recarga de uma planilha grande: parse completo vs. snapshot mapeado.
+
+Uso: python -m benchmarks.bench_snapshot [--rows 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+from app.services.billing_reminder import BillingReminderService
+from benchmarks.bench_xlsx_reader import build_sheet
+
+
+def timed(label: str, service: BillingReminderService, path: Path):
+    started = time.perf_counter()
+    records = service._load_records(path)
+    eligible = records.due_in(date(2025, 11, 10), [3, 1])
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<28} {elapsed:8.3f}s  {len(records)} registros, "
+        f"{len(eligible)} elegiveis"
+    )
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "contas.xlsx"
+        print(f"gerando {args.rows} linhas...")
+        build_sheet(path, args.rows)
+        service = BillingReminderService(
+            default_sheet_path=str(path), reminder_days=[3, 1], waha_client=None
+        )
+
+        parsed = timed("parse + gravacao do snapshot", service, path)
+        mapped = timed("snapshot mapeado", service, path)
+        os.utime(path)
+        timed("mtime alterado (hash)", service, path)
+        timed("snapshot mapeado", service, path)
+
+    print(f"ganho: {parsed / mapped:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
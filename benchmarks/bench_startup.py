@@ -0,0 +1,79 @@
+"""Mede o custo de importar ``app.main`` (boot de cada worker) com ``-X importtime``.
+
+Falha (exit 1) se o tempo passar do orcamento ou se um modulo pesado que deveria
+ser carregado sob demanda aparecer no import.
+
+Uso: python -m benchmarks.bench_startup [--runs 5] [--budget-ms 1200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Loaded on demand only (openpyxl fallback, SMTP, multi-file ingest).
+LAZY_MODULES = (
+    "openpyxl",
+    "smtplib",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "httpx",
+    "sqlalchemy",
+)
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_once(target: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """Import ``target`` in a fresh interpreter; return total us and per-module costs."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, _indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+    return modules[target][1], modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1200.0)
+    parser.add_argument("--target", default="app.main")
+    args = parser.parse_args()
+
+    totals: List[int] = []
+    modules: Dict[str, Tuple[int, int]] = {}
+    for _ in range(args.runs):
+        total, modules = measure_once(args.target)
+        totals.append(total)
+
+    best_ms = min(totals) / 1000
+    print(f"import {args.target}: melhor {best_ms:.0f} ms, pior {max(totals) / 1000:.0f} ms")
+    print("maiores custos proprios:")
+    for name, (self_us, _) in sorted(modules.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    failures = []
+    if best_ms > args.budget_ms:
+        failures.append(f"{best_ms:.0f} ms acima do orcamento de {args.budget_ms:.0f} ms")
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        failures.append(f"modulos que deveriam ser lazy foram importados: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FALHA: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compara o leitor XLSX em streaming com o caminho openpyxl.
+
+Gera uma planilha com colunas extras (como as exportacoes reais), confere que
+os dois caminhos produzem os mesmos BillingRecords e mede o tempo de cada um.
+
+Uso: python -m benchmarks.bench_xlsx_reader [--rows 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from app.services.billing_reminder import BillingReminderService
+
+EXTRA_COLUMNS = ("cpf", "logradouro", "bairro", "descmuni", "uf", "statusdoc", "nfnum", "codmov")
+
+
+def build_sheet(path: Path, rows: int, first: int = 0) -> None:
+    """Grava ``rows`` titulos numerados a partir de ``first``."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Contas")
+    sheet.append(["Cliente", *EXTRA_COLUMNS[:4], "Telefone", "Email", "Vencimento", *EXTRA_COLUMNS[4:]])
+    start = date(2025, 11, 1)
+    for idx in range(first, first + rows):
+        due = start + timedelta(days=idx % 45)
+        sheet.append(
+            [
+                f"CLIENTE {idx}",
+                f"{idx:011d}",
+                f"RUA {idx % 300}",
+                "CENTRO",
+                "Porto Velho",
+                f"699{idx:08d}",
+                f"cliente{idx}@example.com" if idx % 4 else None,
+                due if idx % 2 else due.strftime("%d/%m/%Y"),
+                "RO",
+                "0-ABERTO",
+                str(idx),
+                idx * 7,
+            ]
+        )
+    workbook.save(path)
+
+
+def timed(label: str, service: BillingReminderService, path: Path):
+    started = time.perf_counter()
+    records = service._load_records(path)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<10} {elapsed:8.3f}s  {len(records)} registros")
+    return elapsed, records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "contas.xlsx"
+        build_sheet(path, args.rows)
+
+        # Sem snapshot: o segundo servico leria o .snap gravado pelo primeiro.
+        kwargs = {
+            "default_sheet_path": str(path),
+            "reminder_days": [3, 1],
+            "waha_client": None,
+            "snapshot_cache": False,
+        }
+        openpyxl_time, expected = timed(
+            "openpyxl", BillingReminderService(fast_xlsx_reader=False, **kwargs), path
+        )
+        fast_time, records = timed(
+            "streaming", BillingReminderService(fast_xlsx_reader=True, **kwargs), path
+        )
+
+    assert list(records) == list(expected), "leitores divergiram"
+    print(f"ganho: {openpyxl_time / fast_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+-- Tabelas de resumo para dashboards financeiros
+-- Atualizadas incrementalmente pela API depois de cada execucao/upload ou por
+-- POST /api/receivables/aggregates/refresh (dias marcados pelo script 06).
+
+USE contas_receber;
+
+-- Permite localizar rapidamente os titulos alterados desde a ultima atualizacao
+ALTER TABLE contas_receber ADD INDEX idx_updated_at (updated_at);
+ALTER TABLE historico_envios ADD INDEX idx_created_at (created_at);
+
+-- Totais de valordocumento por dia de vencimento e dimensoes do dashboard
+CREATE TABLE IF NOT EXISTS resumo_recebiveis (
+    datavencimento DATE NOT NULL,
+    uf CHAR(2) NOT NULL DEFAULT '',
+    descmuni VARCHAR(100) NOT NULL DEFAULT '',
+    descricaoformapagto VARCHAR(100) NOT NULL DEFAULT '',
+    statusdoc VARCHAR(50) NOT NULL DEFAULT '',
+    quantidade INT NOT NULL,
+    valor_total DECIMAL(17,2) NOT NULL,
+    PRIMARY KEY (datavencimento, uf, descmuni, descricaoformapagto, statusdoc)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Resumo diario de contas a receber (materializado)';
+
+-- Conversao dos lembretes: titulos lembrados por dia/canal e quantos ja foram baixados
+CREATE TABLE IF NOT EXISTS resumo_conversao_lembretes (
+    data_envio DATE NOT NULL,
+    tipo_envio ENUM('email', 'whatsapp') NOT NULL,
+    enviados INT NOT NULL,
+    liquidados INT NOT NULL,
+    PRIMARY KEY (data_envio, tipo_envio)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Resumo diario de conversao dos lembretes (materializado)';
+
+INSERT INTO configuracao_sistema (chave, valor, descricao) VALUES
+    ('versao_importacao', '0', 'Incrementada a cada atualizacao dos resumos'),
+    ('resumos_atualizados_em', NULL, 'Marca d''agua da ultima atualizacao incremental')
+ON DUPLICATE KEY UPDATE valor=valor;
@@ -0,0 +1,6 @@
+-- Versao da configuracao de lembretes. Cada worker le apenas esta linha
+-- (busca pela chave unica) a cada API_RUNTIME_CONFIG_TTL_SECONDS e so recarrega
+-- as demais chaves quando o valor muda. PUT /api/system/config incrementa.
+INSERT INTO configuracao_sistema (chave, valor, descricao) VALUES
+    ('versao_configuracao', '0', 'Incrementada a cada alteracao da configuracao de lembretes')
+ON DUPLICATE KEY UPDATE valor=valor;
@@ -0,0 +1,13 @@
+-- Tabelas de arquivo para titulos baixados antigos e historico de envios antigo.
+-- Preenchidas em lotes pelo job de retencao (POST /api/receivables/archive);
+-- as tabelas principais ficam apenas com os dados recentes.
+--
+-- Particionar as tabelas principais por mes nao e possivel no InnoDB enquanto
+-- historico_envios tiver FOREIGN KEY para contas_receber, por isso o arquivo.
+
+USE contas_receber;
+
+-- Mesma estrutura e indices das tabelas principais (LIKE nao copia a FOREIGN KEY)
+CREATE TABLE IF NOT EXISTS contas_receber_arquivo LIKE contas_receber;
+CREATE TABLE IF NOT EXISTS historico_envios_arquivo LIKE historico_envios;
+
@@ -0,0 +1,27 @@
+-- Status de entrega dos WhatsApp informado pelo WAHA (webhook message.ack).
+-- O job de lembretes grava cada envio com o mensagem_id devolvido pelo WAHA;
+-- os eventos de POST /api/webhooks/waha so atualizam a linha com o mesmo
+-- mensagem_id (chave unica). Mensagens enviadas fora de uma conta do banco
+-- (planilha/XML) ficam com conta_receber_id NULL.
+
+USE contas_receber;
+
+ALTER TABLE historico_envios
+    MODIFY conta_receber_id BIGINT NULL,
+    ADD COLUMN mensagem_id VARCHAR(128) NULL AFTER destinatario,
+    ADD COLUMN status_entrega ENUM('erro', 'pendente', 'servidor', 'entregue', 'lido', 'reproduzido') NULL
+        COMMENT 'Ultimo ack do WAHA; nunca volta para um status anterior' AFTER status,
+    ADD COLUMN data_status_entrega DATETIME NULL AFTER status_entrega,
+    ADD UNIQUE INDEX uq_mensagem_id (mensagem_id),
+    ADD INDEX idx_status_entrega (status_entrega);
+
+-- O arquivo precisa das mesmas colunas (copiadas pelo nome no job de retencao,
+-- HISTORY_COLUMNS em app/services/receivables_archive.py)
+ALTER TABLE historico_envios_arquivo
+    MODIFY conta_receber_id BIGINT NULL,
+    ADD COLUMN mensagem_id VARCHAR(128) NULL AFTER destinatario,
+    ADD COLUMN status_entrega ENUM('erro', 'pendente', 'servidor', 'entregue', 'lido', 'reproduzido') NULL
+        COMMENT 'Ultimo ack do WAHA; nunca volta para um status anterior' AFTER status,
+    ADD COLUMN data_status_entrega DATETIME NULL AFTER status_entrega,
+    ADD UNIQUE INDEX uq_mensagem_id (mensagem_id),
+    ADD INDEX idx_status_entrega (status_entrega);
@@ -0,0 +1,94 @@
+-- Dias cujos resumos precisam ser recalculados (02_receivables_aggregates.sql).
+-- Gatilhos marcam o dia antigo e o novo de cada titulo/envio inserido,
+-- alterado ou removido; POST /api/receivables/aggregates/refresh (e a
+-- atualizacao automatica depois de cada execucao) recalcula so esses dias e
+-- limpa as marcas. Assim um vencimento movido ou um titulo excluido tambem
+-- corrige o total do dia de onde saiu.
+
+USE contas_receber;
+
+CREATE TABLE IF NOT EXISTS resumos_dias_pendentes (
+    tipo ENUM('vencimento', 'envio') NOT NULL,
+    dia DATE NOT NULL,
+    PRIMARY KEY (tipo, dia)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Dias alterados desde a ultima atualizacao dos resumos';
+
+DELIMITER $$
+
+CREATE TRIGGER trg_contas_receber_resumo_ins AFTER INSERT ON contas_receber
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+    VALUES ('vencimento', NEW.datavencimento);
+END$$
+
+CREATE TRIGGER trg_contas_receber_resumo_upd AFTER UPDATE ON contas_receber
+FOR EACH ROW
+BEGIN
+    -- So as colunas lidas pelos resumos (flags de envio etc. sao ignoradas)
+    IF NOT (OLD.datavencimento <=> NEW.datavencimento AND OLD.uf <=> NEW.uf
+            AND OLD.descmuni <=> NEW.descmuni
+            AND OLD.descricaoformapagto <=> NEW.descricaoformapagto
+            AND OLD.statusdoc <=> NEW.statusdoc
+            AND OLD.valordocumento <=> NEW.valordocumento) THEN
+        INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+        VALUES ('vencimento', OLD.datavencimento), ('vencimento', NEW.datavencimento);
+    END IF;
+    -- A baixa do titulo muda a conversao dos dias em que ele foi lembrado
+    IF NOT (OLD.statusdoc <=> NEW.statusdoc) THEN
+        INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+        SELECT DISTINCT 'envio', DATE(data_envio) FROM historico_envios
+        WHERE conta_receber_id = NEW.id AND data_envio IS NOT NULL;
+    END IF;
+END$$
+
+-- BEFORE: o ON DELETE CASCADE do historico nao dispara gatilhos, entao os
+-- dias de envio do titulo sao marcados enquanto o historico ainda existe.
+CREATE TRIGGER trg_contas_receber_resumo_del BEFORE DELETE ON contas_receber
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+    VALUES ('vencimento', OLD.datavencimento);
+    INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+    SELECT DISTINCT 'envio', DATE(data_envio) FROM historico_envios
+    WHERE conta_receber_id = OLD.id AND data_envio IS NOT NULL;
+END$$
+
+CREATE TRIGGER trg_historico_envios_resumo_ins AFTER INSERT ON historico_envios
+FOR EACH ROW
+BEGIN
+    IF NEW.data_envio IS NOT NULL THEN
+        INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+        VALUES ('envio', DATE(NEW.data_envio));
+    END IF;
+END$$
+
+-- Acks de entrega (status_entrega) nao mudam a conversao e sao ignorados
+CREATE TRIGGER trg_historico_envios_resumo_upd AFTER UPDATE ON historico_envios
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.data_envio <=> NEW.data_envio AND OLD.status <=> NEW.status
+            AND OLD.tipo_envio <=> NEW.tipo_envio
+            AND OLD.conta_receber_id <=> NEW.conta_receber_id) THEN
+        IF OLD.data_envio IS NOT NULL THEN
+            INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+            VALUES ('envio', DATE(OLD.data_envio));
+        END IF;
+        IF NEW.data_envio IS NOT NULL THEN
+            INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+            VALUES ('envio', DATE(NEW.data_envio));
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER trg_historico_envios_resumo_del AFTER DELETE ON historico_envios
+FOR EACH ROW
+BEGIN
+    IF OLD.data_envio IS NOT NULL THEN
+        INSERT IGNORE INTO resumos_dias_pendentes (tipo, dia)
+        VALUES ('envio', DATE(OLD.data_envio));
+    END IF;
+END$$
+
+DELIMITER ;
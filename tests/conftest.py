@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import pytest
+from openpyxl import Workbook
+
+REFERENCE_DATE = date(2025, 10, 30)
+
+
+class StubWahaClient:
+    """In-memory stand-in for :class:`WahaClient` that records every send."""
+
+    def __init__(
+        self,
+        on_send: Optional[Callable[[str], None]] = None,
+        known_numbers: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self.sent: List[str] = []
+        self.checked: List[str] = []
+        self.on_send = on_send
+        self.known_numbers = known_numbers or {}
+        self._lock = Lock()
+
+    def ensure_available(self) -> None:
+        pass
+
+    def send_text_message(
+        self, recipient: str, message: str, sender: Optional[str] = None
+    ) -> dict:
+        if self.on_send is not None:
+            self.on_send(recipient)
+        with self._lock:
+            self.sent.append(recipient)
+            count = len(self.sent)
+        return {"id": f"msg-{count}", "message": "Mensagem registrada no WAHA."}
+
+    def check_numbers_exist(
+        self, phones: Iterable[str], max_workers: int = 8
+    ) -> Dict[str, bool]:
+        phones = list(phones)
+        self.checked.extend(phones)
+        return {phone: self.known_numbers.get(phone, True) for phone in phones}
+
+    def close(self) -> None:
+        pass
+
+
+class StubEmailClient:
+    """In-memory stand-in for :class:`EmailClient` that records every send."""
+
+    def __init__(self, on_send: Optional[Callable[[str], None]] = None) -> None:
+        self.sent: List[str] = []
+        self.on_send = on_send
+        self._lock = Lock()
+
+    def ensure_available(self) -> None:
+        pass
+
+    def send_email(self, to_email: str, subject: str, html_content: str, text_content: str) -> dict:
+        if self.on_send is not None:
+            self.on_send(to_email)
+        with self._lock:
+            self.sent.append(to_email)
+        return {"message": "Email enviado com sucesso."}
+
+
+def write_sheet(path: Path, rows: Sequence[tuple]) -> Path:
+    """Billing sheet with (client, phone, email, due date, amount) rows."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Cliente", "Telefone", "Email", "Vencimento", "Valor"])
+    for row in rows:
+        sheet.append(list(row))
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture
+def billing_sheet(tmp_path: Path) -> Path:
+    """Twelve titles due in 1 or 3 days for six clients (two titles each)."""
+    rows = []
+    for client in range(6):
+        for offset, days in enumerate((1, 3)):
+            due = REFERENCE_DATE + timedelta(days=days)
+            rows.append(
+                (
+                    f"Cliente {client}",
+                    f"+55 69 99900-00{client:02d}",
+                    f"cliente{client}@example.com",
+                    due.strftime("%d/%m/%Y"),
+                    100.0 + offset,
+                )
+            )
+    return write_sheet(tmp_path / "boletos.xlsx", rows)
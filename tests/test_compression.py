@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, accepted_encodings
+
+BODY = "linha de teste\n" * 400
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/large")
+    def large() -> PlainTextResponse:
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    def small() -> PlainTextResponse:
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    @app.get("/encoded")
+    def encoded() -> Response:
+        return Response(
+            gzip.compress(BODY.encode()),
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+def test_large_response_is_gzipped(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.text == BODY
+
+
+def test_small_or_unaccepted_responses_pass_through(client):
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    refused = client.get("/large", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert "content-encoding" not in small.headers and small.text == "ok"
+    assert "content-encoding" not in refused.headers and refused.text == BODY
+
+
+def test_streamed_response_is_compressed_chunk_by_chunk(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BODY * 2
+
+
+def test_already_encoded_response_is_left_alone(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert response.text == BODY
+
+
+def test_accepted_encodings_honours_quality():
+    assert accepted_encodings("br;q=0, GZIP;q=0.5, deflate") == {"gzip", "deflate"}
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.models.reminder import BillingReminderRequest, ReminderStatus
+from app.services.billing_reminder import BillingReminderService
+from app.services.dispatch_pipeline import ChannelStage, run_stages
+from tests.conftest import REFERENCE_DATE, StubEmailClient, StubWahaClient
+
+WAIT_SECONDS = 5
+
+
+def test_blocked_stage_does_not_stall_the_other():
+    whatsapp_done = threading.Event()
+    handled = {"whatsapp": [], "email": []}
+
+    def send_whatsapp(item: int) -> None:
+        handled["whatsapp"].append(item)
+        if len(handled["whatsapp"]) == 20:
+            whatsapp_done.set()
+
+    def send_email(item: int) -> None:
+        # Held until WhatsApp drained everything: only possible if the
+        # stages share no queue or worker.
+        assert whatsapp_done.wait(WAIT_SECONDS)
+        handled["email"].append(item)
+
+    run_stages(
+        [
+            (ChannelStage("whatsapp", send_whatsapp, queue_depth=1), range(20)),
+            (ChannelStage("email", send_email, queue_depth=1), range(20)),
+        ]
+    )
+
+    assert handled["whatsapp"] == list(range(20))
+    assert handled["email"] == list(range(20))
+
+
+def test_failing_stage_stops_only_itself():
+    handled = []
+
+    def send_whatsapp(item: int) -> None:
+        handled.append(item)
+
+    def send_email(item: int) -> None:
+        raise RuntimeError("smtp fora")
+
+    with pytest.raises(RuntimeError, match="smtp fora"):
+        run_stages(
+            [
+                (ChannelStage("whatsapp", send_whatsapp, queue_depth=2), range(50)),
+                (ChannelStage("email", send_email, queue_depth=2), range(50)),
+            ]
+        )
+    assert handled == list(range(50))
+
+
+def test_stage_workers_handle_every_item_once():
+    handled = []
+    lock = threading.Lock()
+
+    def handler(item: int) -> None:
+        with lock:
+            handled.append(item)
+
+    stage = ChannelStage("whatsapp", handler, workers=4, queue_depth=3)
+    stage.start(range(200))
+    stage.join()
+
+    assert sorted(handled) == list(range(200))
+
+
+def test_slow_email_does_not_hold_whatsapp_in_a_run(billing_sheet):
+    waha = StubWahaClient()
+    whatsapp_done = threading.Event()
+
+    def on_whatsapp(recipient: str) -> None:
+        if len(waha.sent) == 5:  # this is the sixth and last client
+            whatsapp_done.set()
+
+    def on_email(recipient: str) -> None:
+        assert whatsapp_done.wait(WAIT_SECONDS)
+
+    waha.on_send = on_whatsapp
+    email = StubEmailClient(on_send=on_email)
+    service = BillingReminderService(
+        default_sheet_path=str(billing_sheet),
+        reminder_days=[1, 3],
+        waha_client=waha,
+        email_client=email,
+        email_enabled=True,
+        snapshot_cache=False,
+        stage_queue_depth=1,
+    )
+
+    response = service.run(BillingReminderRequest(reference_date=REFERENCE_DATE))
+
+    assert len(waha.sent) == 6 and len(email.sent) == 6
+    assert all(result.status == ReminderStatus.SENT for result in response.results)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from app.services.billing_reminder import BillingReminderService
+from tests.conftest import REFERENCE_DATE, StubWahaClient, write_sheet
+
+DUE = (REFERENCE_DATE + timedelta(days=1)).strftime("%d/%m/%Y")
+TITLE = ("Cliente 1", "+55 69 99900-0001", "cliente1@example.com", DUE, 100.0)
+OTHER = ("Cliente 2", "+55 69 99900-0002", "cliente2@example.com", DUE, 50.0)
+
+
+def make_service(sheet_path) -> BillingReminderService:
+    return BillingReminderService(
+        default_sheet_path=str(sheet_path),
+        reminder_days=[1],
+        waha_client=StubWahaClient(),
+        ingest_workers=2,
+        snapshot_cache=False,
+    )
+
+
+def test_identical_rows_of_one_sheet_are_separate_titles(tmp_path):
+    sheet = write_sheet(tmp_path / "boletos.xlsx", [TITLE, TITLE, OTHER])
+
+    assert make_service(sheet).preload(sheet) == 3
+
+
+def test_rows_repeated_across_files_are_merged(tmp_path):
+    write_sheet(tmp_path / "a_janeiro.xlsx", [TITLE, TITLE])
+    write_sheet(tmp_path / "b_fevereiro.xlsx", [TITLE, OTHER])
+
+    # Both copies from the first file stay; the second file adds only OTHER.
+    assert make_service(tmp_path).preload(tmp_path) == 3
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import DatabaseNotInitializedError
+from app.models.aggregates import AggregatesRefreshResult
+from app.services import receivables_aggregates
+from app.services.receivables_aggregates import AggregatesCache, AggregatesRefresher
+
+WAIT_SECONDS = 5
+
+
+class ImportVersion:
+    """Stands in for ``read_import_version``; counts the lookups."""
+
+    def __init__(self) -> None:
+        self.value = 1
+        self.reads = 0
+
+    def __call__(self, session) -> int:
+        self.reads += 1
+        return self.value
+
+
+@pytest.fixture
+def version(monkeypatch) -> ImportVersion:
+    version = ImportVersion()
+    monkeypatch.setattr(receivables_aggregates, "read_import_version", version)
+    return version
+
+
+def loader(loads: list):
+    def load(version: int):
+        loads.append(version)
+        return f"totais v{version} #{len(loads)}"
+
+    return load
+
+
+def test_cache_serves_entries_until_the_version_moves(version):
+    cache = AggregatesCache(version_check_seconds=60)
+    loads = []
+
+    first = cache.get(None, ("uf",), loader(loads))
+    version.value = 2
+    # Within the check interval the version is not even read.
+    assert cache.get(None, ("uf",), loader(loads)) == first
+    assert (version.reads, loads) == (1, [1])
+
+    cache.get(None, ("due_date",), loader(loads))
+    assert loads == [1, 1]
+
+
+def test_cache_reloads_after_the_check_interval_when_the_version_moved(version):
+    cache = AggregatesCache(version_check_seconds=0)
+    loads = []
+
+    cache.get(None, ("uf",), loader(loads))
+    cache.get(None, ("uf",), loader(loads))
+    version.value = 2
+    cache.get(None, ("uf",), loader(loads))
+
+    assert loads == [1, 2]
+    assert version.reads == 3
+
+
+def test_invalidate_drops_entries_and_rereads_the_version(version):
+    cache = AggregatesCache(version_check_seconds=60)
+    loads = []
+    cache.get(None, ("uf",), loader(loads))
+
+    cache.invalidate()
+    cache.get(None, ("uf",), loader(loads))
+
+    assert (version.reads, loads) == (2, [1, 1])
+
+
+class FakeAggregator:
+    """Replaces ``ReceivablesAggregator``; ``refresh`` may be made to fail."""
+
+    calls = 0
+    error: Exception | None = None
+
+    def __init__(self, session) -> None:
+        pass
+
+    def refresh(self, full: bool = False) -> AggregatesRefreshResult:
+        type(self).calls += 1
+        if self.error is not None:
+            raise self.error
+        return AggregatesRefreshResult(
+            version=2, due_days_refreshed=1, send_days_refreshed=0, full=full
+        )
+
+
+class Session:
+    def close(self) -> None:
+        pass
+
+
+class RecordingCache:
+    def __init__(self) -> None:
+        self.invalidated = threading.Event()
+
+    def invalidate(self) -> None:
+        self.invalidated.set()
+
+
+@pytest.fixture
+def aggregator(monkeypatch):
+    monkeypatch.setattr(receivables_aggregates, "ReceivablesAggregator", FakeAggregator)
+    FakeAggregator.calls = 0
+    FakeAggregator.error = None
+    return FakeAggregator
+
+
+def test_requests_while_scheduled_fold_into_one_refresh(aggregator):
+    cache = RecordingCache()
+    refresher = AggregatesRefresher(Session, cache, delay_seconds=0.1)
+
+    for _ in range(5):
+        refresher.request()
+
+    assert cache.invalidated.wait(WAIT_SECONDS)
+    time.sleep(0.2)
+    assert aggregator.calls == 1
+
+    # Once it ran, a new request schedules another refresh.
+    cache.invalidated.clear()
+    refresher.request()
+    assert cache.invalidated.wait(WAIT_SECONDS)
+    assert aggregator.calls == 2
+
+
+def test_close_cancels_a_scheduled_refresh(aggregator):
+    refresher = AggregatesRefresher(Session, RecordingCache(), delay_seconds=0.1)
+
+    refresher.request()
+    refresher.close()
+    time.sleep(0.3)
+
+    assert aggregator.calls == 0
+
+
+def test_failed_refresh_keeps_the_cache(aggregator):
+    cache = RecordingCache()
+    aggregator.error = OperationalError("SELECT 1", {}, Exception("timeout"))
+
+    AggregatesRefresher(Session, cache)._run()
+
+    assert aggregator.calls == 1
+    assert not cache.invalidated.is_set()
+
+
+def test_refresh_before_the_database_is_ready_is_skipped(aggregator):
+    cache = RecordingCache()
+
+    def session_factory():
+        raise DatabaseNotInitializedError("sem banco")
+
+    AggregatesRefresher(session_factory, cache)._run()
+
+    assert aggregator.calls == 0
+    assert not cache.invalidated.is_set()
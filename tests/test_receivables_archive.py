@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services import receivables_archive
+from app.services.receivables_archive import (
+    HISTORY_COLUMNS,
+    TITLE_COLUMNS,
+    ArchiveScheduler,
+    ReceivablesArchiver,
+)
+
+
+@pytest.fixture
+def session_factory(monkeypatch, tmp_path):
+    # SQLite has no row locks; the batches are otherwise the MySQL ones.
+    for name in ("_SETTLED_BATCH", "_HISTORY_BATCH"):
+        query = getattr(receivables_archive, name).replace("FOR UPDATE SKIP LOCKED", "")
+        monkeypatch.setattr(receivables_archive, name, query)
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'receivables.db'}", connect_args={"check_same_thread": False}
+    )
+    with engine.begin() as connection:
+        for table, columns in (
+            ("contas_receber", TITLE_COLUMNS),
+            ("historico_envios", HISTORY_COLUMNS),
+        ):
+            connection.execute(text(f"CREATE TABLE {table} ({', '.join(columns)})"))
+            # Archive columns in another order: copies must go by name.
+            reordered = ", ".join(reversed(columns))
+            connection.execute(text(f"CREATE TABLE {table}_arquivo ({reordered})"))
+        for idx in range(1, 11):
+            due = "2024-01-10" if idx <= 6 else "2026-01-10"
+            connection.execute(
+                text(
+                    "INSERT INTO contas_receber (id, nome, datavencimento, statusdoc) "
+                    "VALUES (:id, :nome, :due, :status)"
+                ),
+                {"id": idx, "nome": f"Cliente {idx}", "due": due, "status": "1-PAGO"},
+            )
+            # Odd rows have no send date and age by created_at; even rows
+            # were inserted late (or backfilled) and age by data_envio.
+            sent = due if idx % 2 == 0 else None
+            created = due if sent is None else ("2026-06-01" if idx <= 6 else "2020-01-01")
+            connection.execute(
+                text(
+                    "INSERT INTO historico_envios "
+                    "(id, conta_receber_id, destinatario, mensagem_id, data_envio, created_at) "
+                    "VALUES (:id, :id, :to, :msg, :sent, :created)"
+                ),
+                {
+                    "id": idx,
+                    "to": f"5569999{idx:04d}",
+                    "msg": f"msg-{idx}",
+                    "sent": sent,
+                    "created": created,
+                },
+            )
+    return sessionmaker(bind=engine)
+
+
+def count(session_factory, table: str) -> int:
+    with session_factory() as session:
+        return session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar_one()
+
+
+def test_archive_moves_rows_by_column_name(session_factory):
+    with session_factory() as session:
+        result = ReceivablesArchiver(session, batch_size=4).run(
+            settled_before=date(2025, 1, 1), history_before=date(2025, 1, 1)
+        )
+
+    assert (result.titles_archived, result.history_archived, result.complete) == (6, 6, True)
+    assert count(session_factory, "contas_receber") == 4
+    assert count(session_factory, "historico_envios") == 4
+    with session_factory() as session:
+        archived = session.execute(
+            text("SELECT nome, statusdoc FROM contas_receber_arquivo WHERE id = 1")
+        ).one()
+        message = session.execute(
+            text("SELECT mensagem_id FROM historico_envios_arquivo WHERE id = 1")
+        ).scalar_one()
+    assert tuple(archived) == ("Cliente 1", "1-PAGO")
+    assert message == "msg-1"
+
+
+def test_history_ages_by_send_date(session_factory):
+    cutoffs = {"settled_before": date(2000, 1, 1), "history_before": date(2025, 1, 1)}
+    with session_factory() as session:
+        counted = ReceivablesArchiver(session).run(**cutoffs, dry_run=True)
+        result = ReceivablesArchiver(session).run(**cutoffs)
+        remaining = session.execute(
+            text("SELECT id FROM historico_envios ORDER BY id")
+        ).scalars().all()
+
+    assert counted.history_archived == result.history_archived == 6
+    assert remaining == [7, 8, 9, 10]
+
+
+def test_archive_stops_after_max_batches(session_factory):
+    with session_factory() as session:
+        result = ReceivablesArchiver(session, batch_size=2, max_batches=2).run(
+            settled_before=date(2025, 1, 1), history_before=date(2025, 1, 1)
+        )
+
+    assert (result.titles_archived, result.batches, result.complete) == (4, 2, False)
+
+
+def test_scheduler_runs_until_closed(session_factory):
+    scheduler = ArchiveScheduler(
+        session_factory,
+        interval_seconds=0.05,
+        settled_after_days=30,
+        history_after_days=30,
+    )
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while count(session_factory, "contas_receber_arquivo") < 6:
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+    finally:
+        scheduler.close()
+
+    assert count(session_factory, "contas_receber") <= 4
+    assert count(session_factory, "historico_envios") <= 4
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.mark.parametrize("path", ["/api/receivables", "/api/receivables/"])
+def test_list_answers_with_and_without_trailing_slash(path):
+    # uf alone is rejected before any query, so no database is needed.
+    response = TestClient(app).get(path, params={"uf": "RO"}, follow_redirects=False)
+
+    assert response.status_code == 400
+    assert "uf" in response.json()["detail"]
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from app.models.reminder import BillingReminderRequest, ReminderStatus
+from app.services.billing_reminder import BillingReminderService
+from app.services.run_checkpoint import RunCheckpoint
+from app.services.waha_client import WahaCircuitOpenError
+from tests.conftest import REFERENCE_DATE, StubEmailClient, StubWahaClient
+
+
+class WorkerKilled(BaseException):
+    """Stands in for the worker dying (timeout, deploy, OOM) mid-run."""
+
+
+def make_service(
+    sheet: Path, checkpoint_dir: Optional[Path], waha, email
+) -> BillingReminderService:
+    return BillingReminderService(
+        default_sheet_path=str(sheet),
+        reminder_days=[1, 3],
+        waha_client=waha,
+        email_client=email,
+        email_enabled=True,
+        snapshot_cache=False,
+        checkpoint_dir=str(checkpoint_dir) if checkpoint_dir else None,
+        checkpoint_sync_every=2,
+    )
+
+
+def crash_after(sends: int):
+    count = {"n": 0}
+
+    def on_send(recipient: str) -> None:
+        count["n"] += 1
+        if count["n"] > sends:
+            raise WorkerKilled()
+
+    return on_send
+
+
+def test_resume_after_crash_mid_run_does_not_resend(billing_sheet, tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    request = BillingReminderRequest(reference_date=REFERENCE_DATE)
+    waha = StubWahaClient(on_send=crash_after(2))
+    email = StubEmailClient()
+
+    with pytest.raises(WorkerKilled):
+        make_service(billing_sheet, checkpoints, waha, email).run(request)
+    assert len(waha.sent) == 2
+
+    waha.on_send = None
+    response = make_service(billing_sheet, checkpoints, waha, email).run(
+        request.model_copy(update={"resume": True})
+    )
+
+    # One consolidated WhatsApp and one email per client, across both runs.
+    assert sorted(waha.sent) == sorted(set(waha.sent))
+    assert len(waha.sent) == 6
+    assert sorted(email.sent) == sorted(set(email.sent))
+    assert len(email.sent) == 6
+    assert response.resumed
+    assert response.dispatched == response.eligible_rows == 12
+    assert all(result.status == ReminderStatus.SENT for result in response.results)
+
+
+def test_resume_of_finished_run_sends_nothing(billing_sheet, tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    request = BillingReminderRequest(reference_date=REFERENCE_DATE)
+    waha, email = StubWahaClient(), StubEmailClient()
+    make_service(billing_sheet, checkpoints, waha, email).run(request)
+
+    again_waha, again_email = StubWahaClient(), StubEmailClient()
+    response = make_service(billing_sheet, checkpoints, again_waha, again_email).run(
+        request.model_copy(update={"resume": True})
+    )
+
+    assert again_waha.sent == [] and again_email.sent == []
+    assert response.resumed and response.dispatched == 12
+
+
+def test_run_without_resume_starts_over(billing_sheet, tmp_path):
+    checkpoints = tmp_path / "checkpoints"
+    request = BillingReminderRequest(reference_date=REFERENCE_DATE)
+    waha, email = StubWahaClient(), StubEmailClient()
+    service = make_service(billing_sheet, checkpoints, waha, email)
+    service.run(request)
+    service.run(request)
+
+    assert len(waha.sent) == 12
+
+
+class OpenCircuitWaha(StubWahaClient):
+    def ensure_available(self) -> None:
+        raise WahaCircuitOpenError("WAHA", 30.0)
+
+
+@pytest.mark.parametrize("with_checkpoint", [True, False])
+def test_deferred_sends_are_failed_when_no_resume_can_pick_them_up(
+    billing_sheet, tmp_path, with_checkpoint
+):
+    checkpoints = tmp_path / "checkpoints" if with_checkpoint else None
+    service = make_service(billing_sheet, checkpoints, OpenCircuitWaha(), None)
+
+    response = service.run(BillingReminderRequest(reference_date=REFERENCE_DATE))
+
+    expected = ReminderStatus.DEFERRED if with_checkpoint else ReminderStatus.FAILED
+    assert {result.status for result in response.results} == {expected}
+    assert response.deadline.critical_pending == 6
+
+
+def test_load_drops_torn_last_line(tmp_path):
+    path = tmp_path / "run.jsonl"
+    checkpoint = RunCheckpoint(path)
+    checkpoint.start({"reference_date": "2025-10-30"})
+    checkpoint.record("whatsapp", 0, "sent", None)
+    checkpoint.close()
+    with path.open("ab") as handle:
+        handle.write(b'{"channel": "whatsapp", "gro')
+
+    resumed = RunCheckpoint(path)
+    assert resumed.load()
+    assert resumed.get("whatsapp", 0) == ("sent", None)
+    assert resumed.get("whatsapp", 1) is None
+    resumed.resume()
+    resumed.record("whatsapp", 1, "sent", None)
+    resumed.close()
+
+    reloaded = RunCheckpoint(path)
+    assert reloaded.load()
+    assert reloaded.get("whatsapp", 1) == ("sent", None)
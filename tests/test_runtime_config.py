@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services import runtime_config
+from app.services.runtime_config import ReminderConfig, RuntimeConfig
+
+DEFAULTS = ReminderConfig(reminder_days=(2,), email_enabled=False)
+
+
+@pytest.fixture
+def session_factory(monkeypatch, tmp_path):
+    # SQLite spelling of the MySQL upserts; the reads are the same.
+    monkeypatch.setattr(
+        runtime_config,
+        "_UPSERT",
+        "INSERT INTO configuracao_sistema (chave, valor) VALUES (:key, :value) "
+        "ON CONFLICT (chave) DO UPDATE SET valor = excluded.valor",
+    )
+    monkeypatch.setattr(
+        runtime_config,
+        "_BUMP_VERSION",
+        "INSERT INTO configuracao_sistema (chave, valor) VALUES (:key, '1') "
+        "ON CONFLICT (chave) DO UPDATE SET valor = CAST(valor AS INTEGER) + 1",
+    )
+    monkeypatch.setattr(runtime_config, "_LOCK_VERSION", runtime_config._SELECT_VERSION)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'config.db'}")
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE TABLE configuracao_sistema (chave TEXT PRIMARY KEY, valor TEXT)")
+        )
+        # The rows seeded by mysql/init.
+        connection.execute(
+            text(
+                "INSERT INTO configuracao_sistema VALUES "
+                "('dias_antes_vencimento', '3,1'), ('email_habilitado', 'true'), "
+                "('whatsapp_habilitado', 'true'), ('versao_configuracao', '0')"
+            )
+        )
+    return sessionmaker(bind=engine)
+
+
+class CountingFactory:
+    def __init__(self, factory) -> None:
+        self.factory = factory
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.factory()
+
+
+def set_value(session_factory, key: str, value: str) -> None:
+    with session_factory.begin() as session:
+        session.execute(
+            text("UPDATE configuracao_sistema SET valor = :value WHERE chave = :key"),
+            {"key": key, "value": value},
+        )
+
+
+def test_seeded_rows_are_ignored_until_the_first_save(session_factory):
+    config = RuntimeConfig(session_factory, DEFAULTS, ttl_seconds=0)
+
+    assert config.current() == DEFAULTS
+
+    saved = config.update({"whatsapp_habilitado": "false"})
+
+    # Keys not in the request keep the values in use, not the seeded ones.
+    assert (saved.reminder_days, saved.email_enabled, saved.whatsapp_enabled) == (
+        (2,),
+        False,
+        False,
+    )
+    assert (saved.version, saved.source) == (1, "db")
+
+
+def test_values_are_cached_for_the_ttl_and_reloaded_on_version_bump(session_factory):
+    factory = CountingFactory(session_factory)
+    config = RuntimeConfig(factory, DEFAULTS, ttl_seconds=60)
+    config.update({"dias_antes_vencimento": "5"})
+    calls = factory.calls
+
+    set_value(session_factory, "dias_antes_vencimento", "7")
+    assert config.current().reminder_days == (5,)
+    assert factory.calls == calls  # within the TTL
+
+    config.invalidate()
+    assert config.current().reminder_days == (5,)  # same version: keys not reloaded
+
+    set_value(session_factory, "versao_configuracao", "2")
+    config.invalidate()
+    assert config.current().reminder_days == (7,)
+    assert config.current().version == 2
+
+
+def test_unavailable_database_keeps_the_last_values_and_backs_off(session_factory, tmp_path):
+    unreachable = sessionmaker(bind=create_engine(f"sqlite:///{tmp_path / 'missing' / 'x.db'}"))
+    factory = CountingFactory(session_factory)
+    config = RuntimeConfig(factory, DEFAULTS, ttl_seconds=0)
+    stored = config.update({"dias_antes_vencimento": "4"})
+
+    factory.factory = unreachable
+    config.invalidate()
+    assert config.current() == stored
+    failed = factory.calls
+    assert config.current() == stored
+    assert factory.calls == failed  # backed off instead of retrying at once
+
+
+def test_other_threads_get_cached_values_while_one_reloads(session_factory):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_factory():
+        entered.set()
+        release.wait(5)
+        return session_factory()
+
+    config = RuntimeConfig(slow_factory, DEFAULTS, ttl_seconds=60)
+    reloading = threading.Thread(target=config.current)
+    reloading.start()
+    try:
+        assert entered.wait(5)
+        assert config.current() == DEFAULTS  # does not wait for the database
+    finally:
+        release.set()
+        reloading.join()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import Any, List
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.api.dependencies import get_service_manager
+from app.main import app
+from app.models.service import BulkItem, BulkItemStatus, ServiceBulkUpdate, ServiceCreate
+from app.services.service_manager import ServiceManager
+
+CREATE = TypeAdapter(List[BulkItem[ServiceCreate]])
+UPDATE = TypeAdapter(List[BulkItem[ServiceBulkUpdate]])
+DELETE = TypeAdapter(List[BulkItem[UUID]])
+
+
+def service(name: str) -> dict:
+    return {"name": name, "endpoint_url": f"https://{name}.example.com"}
+
+
+def statuses(results) -> List[BulkItemStatus]:
+    return [result.status for result in results]
+
+
+@pytest.fixture
+def manager() -> ServiceManager:
+    return ServiceManager()
+
+
+def seed(manager: ServiceManager, *names: str) -> List[UUID]:
+    results = manager.bulk_create(CREATE.validate_python([service(name) for name in names]))
+    return [result.id for result in results]
+
+
+def test_partial_create_keeps_valid_items(manager):
+    items: List[Any] = [service("alpha"), {"name": "x"}, 42, service("beta")]
+
+    results = manager.bulk_create(CREATE.validate_python(items))
+
+    assert statuses(results) == [
+        BulkItemStatus.CREATED,
+        BulkItemStatus.INVALID,
+        BulkItemStatus.INVALID,
+        BulkItemStatus.CREATED,
+    ]
+    assert results[1].detail == (
+        "name: String should have at least 3 characters; endpoint_url: Field required"
+    )
+    assert [svc.name for svc in manager.list_services()] == ["alpha", "beta"]
+
+
+def test_atomic_create_stores_nothing_when_an_item_fails(manager):
+    items = [service("alpha"), {"name": "x"}]
+
+    results = manager.bulk_create(CREATE.validate_python(items), atomic=True)
+
+    assert statuses(results) == [BulkItemStatus.NOT_APPLIED, BulkItemStatus.INVALID]
+    assert list(manager.list_services()) == []
+
+
+def test_partial_update_applies_items_in_order(manager):
+    alpha, beta = seed(manager, "alpha", "beta")
+    items = [
+        {"id": str(alpha), "name": "alpha-2"},
+        {"id": str(alpha), "description": "segunda"},
+        {"id": str(uuid4()), "name": "ghost"},
+        {"id": str(beta), "name": "b"},
+    ]
+
+    results = manager.bulk_update(UPDATE.validate_python(items))
+
+    assert statuses(results) == [
+        BulkItemStatus.UPDATED,
+        BulkItemStatus.UPDATED,
+        BulkItemStatus.NOT_FOUND,
+        BulkItemStatus.INVALID,
+    ]
+    updated = manager.get_service(alpha)
+    assert (updated.name, updated.description) == ("alpha-2", "segunda")
+    assert updated.updated_at.tzinfo is not None
+    assert manager.get_service(beta).name == "beta"
+
+
+def test_atomic_update_rolls_back_every_item(manager):
+    (alpha,) = seed(manager, "alpha")
+    items = [{"id": str(alpha), "name": "alpha-2"}, {"id": "not-a-uuid", "name": "other"}]
+
+    results = manager.bulk_update(UPDATE.validate_python(items), atomic=True)
+
+    assert statuses(results) == [BulkItemStatus.NOT_APPLIED, BulkItemStatus.INVALID]
+    assert manager.get_service(alpha).name == "alpha"
+
+
+def test_partial_and_atomic_delete(manager):
+    alpha, beta = seed(manager, "alpha", "beta")
+
+    atomic = manager.bulk_delete(DELETE.validate_python([alpha, uuid4()]), atomic=True)
+    assert statuses(atomic) == [BulkItemStatus.NOT_APPLIED, BulkItemStatus.NOT_FOUND]
+    assert len(list(manager.list_services())) == 2
+
+    partial = manager.bulk_delete(DELETE.validate_python([alpha, "x", alpha]))
+    assert statuses(partial) == [
+        BulkItemStatus.DELETED,
+        BulkItemStatus.INVALID,
+        BulkItemStatus.NOT_FOUND,
+    ]
+    assert [svc.id for svc in manager.list_services()] == [beta]
+
+
+def test_bulk_route_reports_invalid_items_individually(manager):
+    app.dependency_overrides[get_service_manager] = lambda: manager
+    try:
+        client = TestClient(app)
+        created = client.post("/api/services/bulk", json=[service("alpha"), {"name": "x"}])
+        rejected = client.post("/api/services/bulk", json={"name": "alpha"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert created.status_code == 200
+    body = created.json()
+    assert (body["applied"], body["failed"]) == (1, 1)
+    assert [result["status"] for result in body["results"]] == ["created", "invalid"]
+    # Only the body as a whole must be a list.
+    assert rejected.status_code == 422
+
+
+def test_single_item_endpoints_serialize_timestamps_as_utc(manager):
+    app.dependency_overrides[get_service_manager] = lambda: manager
+    try:
+        client = TestClient(app)
+        created = client.post("/api/services/", json=service("alpha")).json()
+        fetched = client.get(f"/api/services/{created['id']}").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert created["created_at"].endswith("Z")
+    assert fetched["updated_at"].endswith("Z")
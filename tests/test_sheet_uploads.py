@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import (
+    get_aggregates_refresher,
+    get_billing_reminder_service,
+    get_sheet_upload_store,
+)
+from app.main import app
+from app.services.billing_reminder import BillingReminderService
+from app.services.sheet_uploads import SheetUploadStore
+from app.services.xml_export import read_export_rows
+from tests.conftest import StubWahaClient
+
+BOUNDARY = "limite"
+
+
+def export(records: int) -> bytes:
+    rows = "".join(
+        f"<registro_cr><Cliente>Cliente {idx}</Cliente><Telefone>556999900{idx:04d}</Telefone>"
+        f"<Vencimento>31/10/2025</Vencimento><Valor>10.00</Valor></registro_cr>"
+        for idx in range(records)
+    )
+    return f'<?xml version="1.0"?><DocumentElement>{rows}</DocumentElement>'.encode()
+
+
+def multipart(filename: str, content: bytes) -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def chunks(body: bytes, size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+def save(store: SheetUploadStore, body: bytes):
+    content_type = f"multipart/form-data; boundary={BOUNDARY}"
+    return asyncio.run(store.save(content_type, chunks(body, 97)))
+
+
+def test_xml_is_parsed_while_it_is_received(tmp_path):
+    store = SheetUploadStore(tmp_path, max_bytes=1 << 20)
+
+    stored = save(store, multipart("contas.xml", export(50)))
+
+    assert stored.rows == read_export_rows(stored.path)
+    assert len(stored.rows) == 51
+
+
+def test_broken_xml_is_stored_without_rows(tmp_path):
+    store = SheetUploadStore(tmp_path, max_bytes=1 << 20)
+
+    stored = save(store, multipart("contas.xml", export(3)[:-20]))
+
+    assert stored.rows is None and stored.path.exists()
+
+
+@pytest.mark.parametrize(
+    ("content", "status_code"),
+    [(export(4), 201), (export(4)[:-20], 400)],
+    ids=["valid", "broken"],
+)
+def test_upload_route_counts_rows_of_the_parsed_xml(tmp_path, content, status_code):
+    service = BillingReminderService(
+        default_sheet_path=str(tmp_path), reminder_days=[1], waha_client=StubWahaClient()
+    )
+    app.dependency_overrides.update(
+        {
+            get_sheet_upload_store: lambda: SheetUploadStore(tmp_path, max_bytes=1 << 20),
+            get_billing_reminder_service: lambda: service,
+            get_aggregates_refresher: lambda: None,
+        }
+    )
+    try:
+        response = TestClient(app).post(
+            "/api/reminders/uploads",
+            content=multipart("contas.xml", content),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == status_code
+    if status_code == 201:
+        assert response.json()["total_rows"] == 4
+    stored = list(tmp_path.glob("*.xml"))
+    assert len(stored) == (1 if status_code == 201 else 0)
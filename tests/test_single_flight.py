@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import fcntl
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.single_flight import (
+    FlightAbortedError,
+    IdempotencyKeyReusedError,
+    SingleFlight,
+)
+
+WAIT_SECONDS = 10
+
+_fork = multiprocessing.get_context("fork")
+
+
+def _wait_for(path: Path) -> None:
+    deadline = time.monotonic() + WAIT_SECONDS
+    while not path.exists():
+        assert time.monotonic() < deadline, f"{path} never appeared"
+        time.sleep(0.01)
+
+
+def _counted_run(directory: str, barrier, results) -> None:
+    def call():
+        with open(Path(directory) / "calls", "a") as handle:
+            handle.write("x")
+        time.sleep(0.5)
+        return 200, b'{"ok": true}'
+
+    barrier.wait(WAIT_SECONDS)
+    result = SingleFlight(directory).run("run", "fingerprint", call)
+    results.put((result.status_code, result.body, result.shared))
+
+
+def _dying_run(directory: str, started: str) -> None:
+    def call():
+        Path(started).touch()
+        time.sleep(WAIT_SECONDS * 3)  # killed long before this
+        return 200, b"{}"
+
+    SingleFlight(directory).run("run", "fingerprint", call)
+
+
+def test_identical_runs_in_other_processes_share_one_call(tmp_path):
+    directory = tmp_path / "flights"
+    directory.mkdir()
+    barrier, results = _fork.Barrier(3), _fork.Queue()
+    workers = [
+        _fork.Process(target=_counted_run, args=(str(directory), barrier, results))
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(WAIT_SECONDS)
+
+    outcomes = sorted(results.get(timeout=WAIT_SECONDS) for _ in workers)
+    assert (directory / "calls").read_text() == "x"
+    assert [shared for _, _, shared in outcomes] == [False, True, True]
+    assert {(status, body) for status, body, _ in outcomes} == {(200, b'{"ok": true}')}
+
+
+def test_waiter_is_aborted_when_the_holder_dies(tmp_path):
+    directory = tmp_path / "flights"
+    started = tmp_path / "started"
+    holder = _fork.Process(target=_dying_run, args=(str(directory), str(started)))
+    holder.start()
+    _wait_for(started)
+
+    outcome = {}
+    calls = []
+
+    def wait() -> None:
+        try:
+            SingleFlight(directory).run(
+                "run", "fingerprint", lambda: calls.append(1) or (200, b"{}")
+            )
+        except Exception as exc:
+            outcome["error"] = exc
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    time.sleep(0.2)  # let the waiter block on the lock
+    os.kill(holder.pid, signal.SIGKILL)
+    holder.join(WAIT_SECONDS)
+    waiter.join(WAIT_SECONDS)
+
+    # The lock died with the holder; the waiter must not run the job itself.
+    assert isinstance(outcome.get("error"), FlightAbortedError)
+    assert calls == []
+
+    result = SingleFlight(directory).run("run", "fingerprint", lambda: (200, b'{"again": 1}'))
+    assert (result.status_code, result.body, result.shared) == (200, b'{"again": 1}', False)
+
+
+def test_different_fingerprint_runs_after_the_holder(tmp_path):
+    flights = SingleFlight(tmp_path)
+    order = []
+    first_started = threading.Event()
+
+    def first():
+        order.append("first-start")
+        first_started.set()
+        time.sleep(0.3)
+        order.append("first-end")
+        return 200, b"1"
+
+    holder = threading.Thread(target=flights.run, args=("run", "a", first))
+    holder.start()
+    first_started.wait(WAIT_SECONDS)
+    result = flights.run("run", "b", lambda: order.append("second") or (200, b"2"))
+    holder.join(WAIT_SECONDS)
+
+    assert order == ["first-start", "first-end", "second"]
+    assert (result.body, result.shared) == (b"2", False)
+
+
+def test_idempotency_key_replays_and_rejects_other_requests(tmp_path):
+    flights = SingleFlight(tmp_path)
+    calls = []
+
+    def call():
+        calls.append(1)
+        return 200, b'{"sent": 3}'
+
+    first = flights.run("run", "a", call, idempotency_key="retry-1")
+    replay = flights.run("run", "a", call, idempotency_key="retry-1")
+
+    assert calls == [1]
+    assert not first.shared and replay.shared and replay.body == first.body
+    with pytest.raises(IdempotencyKeyReusedError):
+        flights.run("other", "b", call, idempotency_key="retry-1")
+
+
+def test_failed_call_is_shared_as_an_error(tmp_path):
+    def boom():
+        raise RuntimeError("waha fora")
+
+    result = SingleFlight(tmp_path).run("run", "a", boom)
+
+    assert result.status_code == 500
+
+
+def _age(path: Path) -> None:
+    old = time.time() - 30 * 24 * 3600
+    os.utime(path, (old, old))
+
+
+def test_prune_keeps_the_lock_of_a_run_in_progress(tmp_path):
+    flights = SingleFlight(tmp_path)
+    flights.run("run", "a", lambda: (200, b"1"))
+    flights.run("idle", "a", lambda: (200, b"1"))
+    for name in ("run.json", "idle.json"):
+        _age(tmp_path / name)
+
+    def call():
+        flights._prune()  # as another run's result write would
+        return 200, b"2"
+
+    flights.run("run", "b", call)
+
+    assert (tmp_path / "run.lock").exists()
+    assert not (tmp_path / "idle.lock").exists() and not (tmp_path / "idle.json").exists()
+
+
+def test_run_waiting_on_a_pruned_lock_takes_the_new_one(tmp_path):
+    flights = SingleFlight(tmp_path)
+    lock_path = tmp_path / "run.lock"
+    running, release = threading.Event(), threading.Event()
+
+    def call():
+        running.set()
+        release.wait(WAIT_SECONDS)
+        return 200, b"{}"
+
+    # Stands in for _prune: holds the old file, then removes it.
+    pruner = lock_path.open("a+b")
+    fcntl.flock(pruner, fcntl.LOCK_EX)
+    waiter = threading.Thread(target=flights.run, args=("run", "a", call))
+    waiter.start()
+    time.sleep(SingleFlight.POLL_SECONDS * 3)
+    lock_path.unlink()
+    pruner.close()
+    try:
+        assert running.wait(WAIT_SECONDS)
+        # A newcomer opening the path now must see the waiter's lock.
+        with lock_path.open("a+b") as newcomer:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(newcomer, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        release.set()
+        waiter.join(WAIT_SECONDS)
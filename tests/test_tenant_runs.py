@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api.dependencies import (
+    get_aggregates_refresher,
+    get_single_flight,
+    get_tenant_registry,
+)
+from app.main import app
+from app.models.tenant import TenantConfig
+from app.services.billing_reminder import BillingReminderService
+from app.services.single_flight import SingleFlight
+from app.services.tenants import TenantRegistry
+from tests.conftest import REFERENCE_DATE, StubWahaClient
+
+TENANTS = ("11915754000198", "22915754000198")
+
+
+def test_concurrent_tenant_runs_dispatch_each_tenant_once(billing_sheet, tmp_path):
+    clients = {
+        tenant_id: StubWahaClient(on_send=lambda _: time.sleep(0.05)) for tenant_id in TENANTS
+    }
+
+    def build(tenant: TenantConfig) -> BillingReminderService:
+        return BillingReminderService(
+            default_sheet_path=str(billing_sheet),
+            reminder_days=[1, 3],
+            waha_client=clients[tenant.tenant_id],
+            snapshot_cache=False,
+        )
+
+    # Slots alone would let every request through: only the flight lock
+    # keeps a tenant from running twice, as across gunicorn workers.
+    registry = TenantRegistry(
+        [TenantConfig(tenant_id=tenant_id, max_concurrent_runs=3) for tenant_id in TENANTS],
+        factory=build,
+    )
+    app.dependency_overrides.update(
+        {
+            get_tenant_registry: lambda: registry,
+            get_single_flight: lambda: SingleFlight(tmp_path / "flights"),
+            get_aggregates_refresher: lambda: None,
+        }
+    )
+    responses = []
+
+    def post() -> None:
+        responses.append(
+            TestClient(app).post(
+                "/api/reminders/tenants/run",
+                json={"reference_date": REFERENCE_DATE.isoformat()},
+            )
+        )
+
+    try:
+        threads = [threading.Thread(target=post) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [response.status_code for response in responses] == [200, 200, 200]
+    for response in responses:
+        results = response.json()["results"]
+        assert [result["status"] for result in results] == ["completed", "completed"]
+        assert [result["response"]["dispatched"] for result in results] == [12, 12]
+    for client in clients.values():
+        assert len(client.sent) == 6
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import List
+
+import httpx
+import pytest
+
+from app.models.reminder import BillingReminderRequest, ReminderStatus
+from app.services.billing_reminder import BillingReminderService
+from app.services.number_cache import WhatsAppNumberCache
+from app.services.waha_client import WahaClient
+from tests.conftest import REFERENCE_DATE
+
+WITHOUT_WHATSAPP = "5569999000000"
+UNREACHABLE = "5569999000001"
+
+
+class StubWaha:
+    """WAHA over ``httpx.MockTransport``: records requests, answers number checks."""
+
+    def __init__(self) -> None:
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/api/contacts/check-exists":
+            phone = request.url.params["phone"]
+            if phone == UNREACHABLE:
+                return httpx.Response(500, text="erro interno")
+            return httpx.Response(200, json={"numberExists": phone != WITHOUT_WHATSAPP})
+        return httpx.Response(200, json={"id": f"msg-{len(self.requests)}"})
+
+    def paths(self, path: str) -> List[httpx.Request]:
+        return [request for request in self.requests if request.url.path == path]
+
+
+@pytest.fixture
+def waha() -> StubWaha:
+    return StubWaha()
+
+
+def make_client(waha: StubWaha) -> WahaClient:
+    client = WahaClient(
+        base_url="http://waha.test",
+        default_sender="5547999999999",
+        session="empresa_a",
+    )
+    client._http = httpx.Client(transport=httpx.MockTransport(waha))
+    return client
+
+
+def test_number_check_uses_the_session_not_the_sender(waha):
+    client = make_client(waha)
+
+    checked = client.check_numbers_exist(["+55 69 99900-0000", UNREACHABLE, "5569999000002"])
+
+    # Failed checks are left out so they are tried again next time.
+    assert checked == {"+55 69 99900-0000": False, "5569999000002": True}
+    checks = waha.paths("/api/contacts/check-exists")
+    assert {request.url.params["session"] for request in checks} == {"empresa_a"}
+
+
+def test_run_skips_numbers_without_whatsapp_and_caches_checks(waha, billing_sheet, tmp_path):
+    service = BillingReminderService(
+        default_sheet_path=str(billing_sheet),
+        reminder_days=[1, 3],
+        waha_client=make_client(waha),
+        number_cache=WhatsAppNumberCache(str(tmp_path / "numbers.sqlite3"), ttl_seconds=3600),
+        snapshot_cache=False,
+    )
+    request = BillingReminderRequest(reference_date=REFERENCE_DATE)
+
+    first = service.run(request)
+    checks = len(waha.paths("/api/contacts/check-exists"))
+    second = service.run(request)
+
+    invalid = [
+        result.client_name
+        for result in first.results
+        if result.status == ReminderStatus.INVALID_NUMBER
+    ]
+    assert invalid == ["Cliente 0", "Cliente 0"]
+    sends = waha.paths("/api/sendText")
+    assert len(sends) == 2 * 5
+    assert all(b'"sender":"5547999999999"' in request.content for request in sends)
+    # Six numbers, checked once; the second run is answered by the cache,
+    # except the number whose check failed.
+    assert checks == 6
+    assert len(waha.paths("/api/contacts/check-exists")) == checks + 1
+    assert second.dispatched == first.dispatched